@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+"""Microbenchmark of the per-flow CPU cost of ApiCapture on the proxy thread.
+
+Feeds synthetic mitmproxy flows through `ApiCapture.response()` and reports the
+CPU time (time.process_time) spent per flow for:
+
+  - flows rejected by the URL filter (images, scripts, other API calls)
+  - matching flows stored raw (parse=False)
+  - matching flows parsed first (parse=True), with orjson and with json
+
+The sink is replaced by a counter so that only the proxy thread's work is measured.
+
+    python3 mitmproxy_files/bench_api_capture.py --flows 2000 --events 300
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+from mitmproxy.test import tflow
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sofascore_common
+import intercept_firefox_mitmproxy_sel as intercept
+
+
+TARGET = "/api/v1/sport/football/scheduled-events/2025-04-21"
+
+
+class CountingSink:
+    """Stand-in for JsonlSink that only counts what it is given"""
+
+    def __init__(self):
+        self.records = 0
+        self.bytes = 0
+
+    def write(self, record, url=None):
+        self.records += 1
+        if isinstance(record, bytes):
+            self.bytes += len(record)
+
+
+def scheduled_events_body(events):
+    """A scheduled-events payload of roughly the real shape"""
+    return json.dumps({"events": [{
+        "id": 13000000 + i,
+        "customId": f"abc{i}",
+        "startTimestamp": 1745240400 + i * 60,
+        "tournament": {"name": "Premier League", "category": {"name": "England"},
+                       "uniqueTournament": {"id": 17, "name": "Premier League"}},
+        "homeTeam": {"id": 100 + i, "name": f"Home {i}", "shortName": f"H{i}"},
+        "awayTeam": {"id": 200 + i, "name": f"Away {i}", "shortName": f"A{i}"},
+        "homeScore": {"current": 1, "period1": 0}, "awayScore": {"current": 2, "period1": 1},
+        "status": {"code": 100, "type": "finished", "description": "Ended"},
+        "winnerCode": 2,
+    } for i in range(events)]}, indent=2).encode("utf-8")
+
+
+def make_flow(path, content, content_type):
+    flow = tflow.tflow(resp=True)
+    flow.request.host = "www.sofascore.com"
+    flow.request.path = path
+    flow.response.headers["content-type"] = content_type
+    flow.response.content = content
+    return flow
+
+
+def per_flow_us(capture, flows, rounds):
+    start = time.process_time()
+    for _ in range(rounds):
+        for flow in flows:
+            capture.response(flow)
+    return (time.process_time() - start) / (rounds * len(flows)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-flow CPU cost of ApiCapture.response()")
+    parser.add_argument("--flows", type=int, default=1000, help="flows per case")
+    parser.add_argument("--events", type=int, default=300, help="events in the scheduled-events body")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    # Measure the capture itself, not the debug log file
+    intercept.logger.setLevel(logging.INFO)
+
+    body = scheduled_events_body(args.events)
+    other = [make_flow(f"/static/images/team-{i}.png", b"\x89PNG" * 256, "image/png") for i in range(args.flows // 2)]
+    other += [make_flow(f"/api/v1/event/{i}/odds", b'{"markets": []}', "application/json")
+              for i in range(args.flows - len(other))]
+    matching = [make_flow(TARGET, body, "application/json") for _ in range(args.flows)]
+
+    print(f"Body: {len(body) / 1024:.1f} kB, orjson {'available' if sofascore_common.orjson else 'missing'}")
+
+    results = [("filtered out", per_flow_us(intercept.ApiCapture(CountingSink(), TARGET), other, args.rounds))]
+    results.append(("raw (parse=False)",
+                    per_flow_us(intercept.ApiCapture(CountingSink(), TARGET), matching, args.rounds)))
+
+    backend = sofascore_common.orjson
+    if backend is not None:
+        results.append(("parsed, orjson",
+                        per_flow_us(intercept.ApiCapture(CountingSink(), TARGET, parse=True), matching, args.rounds)))
+    sofascore_common.orjson = None
+    try:
+        results.append(("parsed, json",
+                        per_flow_us(intercept.ApiCapture(CountingSink(), TARGET, parse=True), matching, args.rounds)))
+    finally:
+        sofascore_common.orjson = backend
+
+    for name, cost in results:
+        print(f"{name:<20} {cost:10.1f} µs CPU per flow")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 
 import json
 import os
+import sys
 import time
 
 import asyncio
@@ -23,6 +24,14 @@ from mitmproxy import http
 from mitmproxy.options import Options
 from mitmproxy.tools.dump import DumpMaster
 
+# The shared helpers live in the repository root.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sofascore_common import json_loads
+from sofascore_response_cache import ResponseCache
+from sofascore_jsonl_sink import JsonlSink, json_document, raw_jsonl_line, read_records
+from sofascore_flow_archive import FlowArchive
+
 
 # Configure logging
 
@@ -90,38 +99,113 @@ club_leagues = ["Premier League","LaLiga","Serie A","Bundesliga","Ligue 1",
 
 
 
+## Both hooks run on the proxy thread for every flow the browser makes, so they
+## reject flows on the request path (a plain attribute) before touching the body,
+## and only decode JSON when something actually needs the parsed data.
+
+def api_path_of(flow):
+    """Path of the request without its query string"""
+    return flow.request.path.split("?", 1)[0]
+
+
+def preview(data, limit=200):
+    """Indented JSON of `data`, cut to `limit` characters"""
+    text = json.dumps(data, indent=2)
+    return text[:limit] + "..." if len(text) > limit else text
+
+
 # Class to handle mitmproxy events
 class ApiCapture:
-    def __init__(self, target_url=None):
-        """Initialize with an optional target URL filter"""
+    def __init__(self, sink, target_url=None, cache=None, parse=False, archive=None):
+        """Initialize with the JSONL sink, an optional target filter and response cache
+
+        `target_url` is matched against the request path when it starts with "/",
+        otherwise against the full URL. With `parse=False` responses are stored
+        as raw bytes, only checked to be complete JSON. Every JSON
+        response under /api/v1/, targeted or not, is recorded in `archive`
+        (a FlowArchive) if given.
+        """
+        self.sink = sink
         self.target_url = target_url
-        self.captured_responses = []
+        self.cache = cache
+        self.parse = parse
+        self.archive = archive
+        self.captured_count = 0
+
+    def wants(self, flow: http.HTTPFlow) -> bool:
+        """Cheap URL filter, run before anything looks at the response body"""
+        if not self.target_url:
+            return True
+        if self.target_url.startswith("/"):
+            return self.target_url in flow.request.path
+        return self.target_url in flow.request.url
+
+    def request(self, flow: http.HTTPFlow) -> None:
+        """Answer API requests from the cache without contacting the server"""
+        if self.cache is None:
+            return
+
+        api_path = api_path_of(flow)
+        if not api_path.startswith("/api/v1/"):
+            return
+
+        body = self.cache.get(api_path)
+        if body is not None:
+            flow.response = http.Response.make(200, body, {"Content-Type": "application/json"})
+            flow.metadata["from_cache"] = True
+            logger.debug("📦 Served %s from the cache", api_path)
 
     def response(self, flow: http.HTTPFlow) -> None:
         """Process responses and capture JSON data"""
-        # Check if this is a response we want to capture
-        if self.target_url and self.target_url not in flow.request.url:
+        # Check if this is a response we want to archive or capture
+        archived = self.archive is not None and flow.request.path.startswith("/api/v1/")
+        if not archived and not self.wants(flow):
             return
 
         # Check for JSON content
-        if flow.response.headers.get("content-type", "").startswith("application/json"):
-            try:
-                # Decode the response content
-                json_data = json.loads(flow.response.content.decode('utf-8'))
-
-                # Store the captured data
-                self.captured_responses.append({
-                    "url": flow.request.url,
+        if not flow.response.headers.get("content-type", "").startswith("application/json"):
+            return
+
+        if archived:
+            self.archive.write(flow.request.url, flow.response.status_code, flow.response.headers,
+                               flow.response.content)
+            if not self.wants(flow):
+                return
+
+        url = flow.request.url
+        try:
+            content = flow.response.content
+            json_data = None
+
+            if self.parse:
+                json_data = json_loads(content)
+                valid = True
+            else:
+                valid = json_document(content)
+
+            if valid and self.cache is not None and not flow.metadata.get("from_cache"):
+                # A raw body is not scanned for finished events (that would decode it all over again),
+                # so it's kept for its path's TTL; a parsed one gives them for free.
+                self.cache.put(api_path_of(flow), content, json_data, finished=None if self.parse else ())
+
+            # Stream the captured data to disk
+            if json_data is not None:
+                self.sink.write({
+                    "url": url,
                     "method": flow.request.method,
                     "status_code": flow.response.status_code,
                     "data": json_data
                 })
+            else:
+                self.sink.write(raw_jsonl_line(url, flow.request.method, flow.response.status_code, content, valid),
+                                url=url)
+            self.captured_count += 1
 
-                logger.debug(f"📍✅  Captured JSON from {flow.request.url}")
-            except json.JSONDecodeError:
-                logger.error(f"❌ Failed to decode JSON from {flow.request.url}")
-            except Exception as e:
-                logger.error(f"❌ Error processing response:\n{e}", exc_info=True)
+            logger.debug("📍✅  Captured JSON from %s", url)
+        except ValueError:
+            logger.error("❌ Failed to decode JSON from %s", url)
+        except Exception as e:
+            logger.error("❌ Error processing response:\n%s", e, exc_info=True)
 
 
 async def start_mitmproxy(host, port, api_capture):
@@ -220,14 +304,24 @@ def main():
 
     logger.info("Started!😄🙌😃 ")
     TARGET_WEBSITE = f"https://www.sofascore.com/football/{DATE_TODAY}"
-    logger.info(f"▶️   Visiting: {TARGET_WEBSITE}")
+    logger.info("▶️   Visiting: %s", TARGET_WEBSITE)
 
     SCHEDULED_DATE_API_URL = "/api/v1/sport/football/scheduled-events/" + DATE_TODAY
 
 
 
+    # Captured responses are streamed to an append-only JSONL file (plus a small index by URL)
+    CAPTURE_FILE = 'captured_api_data.jsonl'
+    session_offset = os.path.getsize(CAPTURE_FILE) if os.path.exists(CAPTURE_FILE) else 0
+    sink = JsonlSink(CAPTURE_FILE).start()
+
+    # Every API flow is also recorded for offline re-processing (sofascore_replay.py)
+    ARCHIVE_FILE = 'captured_api_flows.flows.gz'
+    archive = FlowArchive(ARCHIVE_FILE).start()
+
     # Create our API capture addon
-    api_capture = ApiCapture(target_url=SCHEDULED_DATE_API_URL)
+    api_capture = ApiCapture(sink, target_url=SCHEDULED_DATE_API_URL,
+                             cache=ResponseCache(), archive=archive)
 
 
     # Start mitmproxy in a separate thread
@@ -239,7 +333,7 @@ def main():
     proxy_thread.start()
 
 
-    logger.debug(f"Starting mitmproxy on {PROXY_HOST}:{PROXY_PORT}")
+    logger.debug("Starting mitmproxy on %s:%s", PROXY_HOST, PROXY_PORT)
 
 
     try:
@@ -252,7 +346,7 @@ def main():
 
 
         # Navigate to the target site
-        logger.debug(f"Navigating to {TARGET_WEBSITE}")
+        logger.debug("Navigating to %s", TARGET_WEBSITE)
 
         driver.get(TARGET_WEBSITE)
 
@@ -263,27 +357,27 @@ def main():
 
 
         # Output captured API responses
-        logger.debug("\nCaptured API Responses:")
-        for i, response in enumerate(api_capture.captured_responses):
-            logger.debug(f"\n--- Response {i+1} ---")
-            logger.debug(f"URL: {response['url']}")
-            logger.debug(f"Method: {response['method']}")
-            logger.debug(f"Status: {response['status_code']}")
-            logger.debug("Data:", json.dumps(response['data'], indent=2)[:200] + "..."
-                  if len(json.dumps(response['data'], indent=2)) > 200 else json.dumps(response['data'], indent=2))
+        sink.close()
+        ## Reading the records back and rendering previews is only worth it when DEBUG is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("\nCaptured API Responses:")
+            for i, response in enumerate(read_records(CAPTURE_FILE, session_offset)):
+                logger.debug("\n--- Response %d ---", i + 1)
+                logger.debug("URL: %s", response['url'])
+                logger.debug("Method: %s", response['method'])
+                logger.debug("Status: %s", response['status_code'])
+                logger.debug("Data: %s", preview(response['data']))
 
 
-        # Save to file (optional)
-        if api_capture.captured_responses:
-            with open('captured_api_data.json', 'w') as f:
-                json.dump(api_capture.captured_responses, f, indent=2)
-            logger.debug(f"\nSaved {len(api_capture.captured_responses)} responses to captured_api_data.json")
+        logger.debug("\nSaved %d responses to %s", api_capture.captured_count, CAPTURE_FILE)
 
 
     except Exception as e:
         print(f"Error occurred: {e}")
     finally:
         # Clean up
+        sink.close()
+        archive.close()
         if 'driver' in locals():
             driver.quit()
         logger.debug("\nTest completed")
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+
+"""Fetch the SofaScore API endpoints directly with asyncio, no browser in the loop.
+
+The same JSON endpoints the Selenium scripts pick out of the network logs are
+requested over one pooled keep-alive session, and every match of the day is
+processed concurrently.
+
+    python3 sofascore_api_client.py --date 2025-04-21
+    python3 sofascore_api_client.py --date 2025-04-21 --base-url http://127.0.0.1:8765
+    python3 sofascore_api_client.py --from 2024-08-16 --to 2025-05-25
+"""
+
+import argparse
+import asyncio
+import logging
+
+import aiohttp
+
+from sofascore_common import (
+    SOFASCORE_BASE_URL,
+    scheduled_events_api,
+    event_api,
+    pregame_form_api,
+    team_performance_api,
+    standings_api,
+    select_scheduled_games,
+    parse_performance,
+    previous_records,
+    apply_ranks,
+    add_date_arguments,
+    add_scraper_arguments,
+    scraper_dates_from_args,
+    ScraperStores,
+    json_loads,
+    setup_logging,
+)
+from sofascore_fixture_memo import FixtureMemo, historic_fixture
+from sofascore_standings import season_key
+from sofascore_records import Match
+from sofascore_metrics import metrics, add_metrics_arguments, exported_metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+# SofaScore refuses requests without a browser-like User-Agent.
+DEFAULT_HEADERS = {
+    "User-Agent": ("Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+                   "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"),
+    "Accept": "application/json",
+    "Referer": SOFASCORE_BASE_URL + "/",
+}
+
+
+class SofascoreApiClient:
+    """Async JSON client over a single keep-alive connection pool."""
+
+    def __init__(self, base_url=SOFASCORE_BASE_URL, concurrency=8, timeout=30, cache=None,
+                 fixture_memo=None, archive=None, standings=None):
+        """Responses are read from and written to `cache` (a ResponseCache) if given.
+
+        Resolved previous fixtures are shared through `fixture_memo` (a FixtureMemo).
+        Every response is recorded in `archive` (a FlowArchive) if given.
+        With `standings` (a StandingsResolver) the ranks of previous fixtures
+        come from league standings, falling back to their pregame-form.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.cache = cache
+        self.archive = archive
+        self.fixture_memo = fixture_memo if fixture_memo is not None else FixtureMemo(path=None)
+        self._fixture_tasks = {}  # event ID -> task resolving it in this run
+        self.standings = standings
+        self._standings_tasks = {}  # season -> task loading its standings in this run
+        self._performance_tasks = {}  # team ID -> task loading its history for the current matchday
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.session = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=60)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers=DEFAULT_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+
+    async def get_json(self, api_path, parse=None):
+        """GET an API path such as `/api/v1/event/{id}` and decode the JSON body.
+
+        `parse(body, finished=None)` replaces the plain JSON decoding, e.g. to
+        filter a large payload as it is decoded. It appends the IDs of the
+        finished events it sees to the list `finished`, which the response
+        cache takes instead of decoding the body a second time.
+        """
+        if self.cache is not None:
+            body = self.cache.get(api_path)
+            if body is not None:
+                if self.archive is not None:
+                    self.archive.write(self.base_url + api_path, 200, {"x-from-cache": "1"}, body)
+                with metrics.span("json_parse"):
+                    return (parse or json_loads)(body)
+
+        with metrics.span("request"):
+            async with self.session.get(self.base_url + api_path) as response:
+                response.raise_for_status()
+                body = await response.read()
+                if self.archive is not None:
+                    self.archive.write(str(response.url), response.status, response.headers, body)
+
+        finished = None
+        with metrics.span("json_parse"):
+            if parse is None:
+                data = json_loads(body)
+            else:
+                finished = []
+                data = parse(body, finished)
+        if self.cache is not None:
+            # The finished events come from `data`, or from the parse hook when `data` is filtered.
+            self.cache.put(api_path, body, None if parse else data, finished)
+        return data
+
+
+    def prefetch_team_performance(self, team_ids):
+        """Start requesting the `/team/{id}/performance` of every team at once, replacing the previous matchday's."""
+        self._performance_tasks = {team_id: asyncio.ensure_future(self._load_performance(team_id))
+                                   for team_id in set(team_ids)}
+        for task in self._performance_tasks.values():
+            # A failure is raised to the match awaiting it; don't also report it when no match does.
+            task.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+    async def team_performance(self, team_id):
+        """HistoricFixtures of a team's `/team/{id}/performance`, taken from the prefetch when it's part of it."""
+        task = self._performance_tasks.get(team_id)
+        if task is None:
+            task = self._performance_tasks[team_id] = asyncio.ensure_future(self._load_performance(team_id))
+        return await task
+
+    async def _load_performance(self, team_id):
+        # Only the compact fixtures are kept for the matchday, not the decoded payload.
+        return await self.get_json(team_performance_api(team_id), parse=parse_performance)
+
+    async def resolve_fixture(self, record):
+        """Ranked HistoricFixture of a previous match, fetching its pregame-form at most once."""
+        fixture = self.fixture_memo.lookup(record.event_id)
+        if fixture is not None:
+            return fixture
+
+        # Matches sharing a previous fixture await the same request.
+        task = self._fixture_tasks.get(record.event_id)
+        if task is None:
+            self.fixture_memo.record_miss()
+            task = self._fixture_tasks[record.event_id] = asyncio.ensure_future(self._load_fixture(record))
+        return await task
+
+    async def _load_fixture(self, record):
+        try:
+            fixture = historic_fixture(record, await self.get_json(pregame_form_api(record.event_id)))
+        except BaseException:
+            # The matches awaiting it get the error; a later one requests the fixture again.
+            self._fixture_tasks.pop(record.event_id, None)
+            raise
+        self.fixture_memo.put(record.event_id, fixture)
+        return fixture
+
+    async def resolve_ranks(self, record):
+        """(home position, away position) of a previous match, from the memo, the standings or its pregame-form."""
+        if self.standings is not None and self.fixture_memo.get(record.event_id) is None:
+            key = season_key(record)
+            if key is not None and not self.standings.fetched(key):
+                task = self._standings_tasks.get(key)
+                if task is None:
+                    task = self._standings_tasks[key] = asyncio.ensure_future(self._load_standings(key))
+                await task
+
+            positions = self.standings.positions(record)
+            if positions is not None:
+                return positions
+
+        fixture = await self.resolve_fixture(record)
+        return fixture.home_position, fixture.away_position
+
+    async def _load_standings(self, key):
+        try:
+            standings_json = await self.get_json(standings_api(*key))
+        except Exception as err:
+            logger.warning("😫 No standings from %s, using the pregame-forms. Error: %s", standings_api(*key), err)
+            standings_json = None
+        self.standings.add_standings(key, standings_json)
+
+
+async def fetch_pregame_ranks(client, record, individual_record):
+    """Fill the rankings of one previous match from its pregame-form."""
+    try:
+        with metrics.span("fixture_lookup"):
+            home_position, away_position = await client.resolve_ranks(record)
+        apply_ranks(individual_record, home_position, away_position)
+    except Exception as err:
+        logger.error("😫 Failed to get JSON from API URL: %s.\nSee Error: %s\n", pregame_form_api(record.event_id), err)
+    return individual_record
+
+
+async def fetch_match(client, match):
+    """Add the team ranks and both teams' previous records to one tournament game."""
+    with metrics.span("match"):
+        return await _fetch_match(client, match)
+
+
+async def fetch_team_history(client, team_name, team_id, league, venue, tournament_id=None):
+    """Previous records of one team, their pregame-form ranks fetched concurrently."""
+    fixtures = await client.team_performance(team_id)
+
+    with metrics.span("history_traversal"):
+        selected = previous_records(team_name, league, fixtures, venue, tournament_id)
+    return list(await asyncio.gather(
+        *(fetch_pregame_ranks(client, record, individual_record)
+          for record, individual_record in selected)
+    ))
+
+
+async def _fetch_match(client, match):
+    match_ID = match['ID']
+
+    home_team_id, away_team_id = match.get('Home Team ID'), match.get('Away Team ID')
+    if home_team_id is None or away_team_id is None:
+        # Not in the scheduled-events payload; the event has them.
+        pregame_rank_json, team_info_json = await asyncio.gather(
+            client.get_json(pregame_form_api(match_ID)),
+            client.get_json(event_api(match_ID)),
+        )
+        home_team_id = team_info_json['event']['homeTeam']['id']
+        away_team_id = team_info_json['event']['awayTeam']['id']
+    else:
+        pregame_rank_json = await client.get_json(pregame_form_api(match_ID))
+
+    match["Home Team Rank"] = pregame_rank_json["homeTeam"]["position"]
+    match["Away Team Rank"] = pregame_rank_json["awayTeam"]["position"]
+
+    # Both histories load at the same time, so a match costs about as much as one team's history.
+    home_history, away_history = await asyncio.gather(
+        fetch_team_history(client, match['Home Team'], home_team_id, match['League'], 'Home',
+                           match.get('Tournament ID')),
+        fetch_team_history(client, match['Away Team'], away_team_id, match['League'], 'Away',
+                           match.get('Tournament ID')),
+        return_exceptions=True,
+    )
+    if isinstance(home_history, Exception):
+        raise home_history
+
+    match['Home Team History'] = home_history
+    if isinstance(away_history, Exception):
+        logger.error("😫 Could not get the history of %s. Error: %s\n", match['Away Team'], away_history)
+    else:
+        match['Away Team History'] = away_history
+
+    logger.debug("Previous Records [HT] %s: %s", match['MatchUp'], match['Home Team History'])
+    logger.debug("Previous Records [AT] %s: %s", match['MatchUp'], match.get('Away Team History'))
+    return match
+
+
+async def scrape_date(client, todays_date, checkpoints=None):
+    """Return the `tournament_games` of a date with ranks and previous records filled in.
+
+    Matches completed by earlier runs are taken from `checkpoints` (a
+    CheckpointStore), and every match is checkpointed as soon as it is done.
+    """
+    tournament_games = await client.get_json(
+        scheduled_events_api(todays_date),
+        parse=lambda body, finished=None: select_scheduled_games(body, todays_date, finished))
+    logger.info("\nTournament Games (%d): %s\n", len(tournament_games),
+                ", ".join(match['MatchUp'] for match in tournament_games))
+
+    todo = tournament_games if checkpoints is None else checkpoints.resume(todays_date, tournament_games)
+
+    # Every team's history is requested right away rather than once its match gets to it.
+    client.prefetch_team_performance(match[field] for match in todo for field in ('Home Team ID', 'Away Team ID')
+                                     if match.get(field) is not None)
+
+    async def checkpointed_fetch(match):
+        result = await fetch_match(client, match)
+        if checkpoints is not None:
+            checkpoints.checkpoint_match(todays_date, result)
+        return result
+
+    results = await asyncio.gather(
+        *(checkpointed_fetch(match) for match in todo),
+        return_exceptions=True,
+    )
+    for match, result in zip(todo, results):
+        if isinstance(result, Exception):
+            logger.error("😫 Could not process match %s. Error: %s\n", match['MatchUp'], result)
+
+    return tournament_games
+
+
+async def run(dates, base_url, concurrency, cache=None, fixture_memo=None, save=None, archive=None,
+              checkpoints=None, standings=None):
+    """Scrape `dates` one after the other over a single client session.
+
+    `save(date, tournament_games)` is called as soon as a date is done.
+    Returns {date: [Match]} of the dates that could be scraped.
+    """
+    games_by_date = {}
+    async with SofascoreApiClient(base_url=base_url, concurrency=concurrency, cache=cache,
+                                  fixture_memo=fixture_memo, archive=archive, standings=standings) as client:
+        for todays_date in dates:
+            try:
+                tournament_games = await scrape_date(client, todays_date, checkpoints)
+            except Exception as err:
+                logger.error("😭 Skipping %s: could not load its scheduled events. Error: %s\n", todays_date, err)
+                continue
+
+            if save is not None:
+                save(todays_date, tournament_games)
+            # Only the compact form of a saved date is kept for the rest of the batch.
+            games_by_date[todays_date] = [Match.from_record(match) for match in tournament_games]
+    return games_by_date
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_date_arguments(parser)
+    parser.add_argument("--base-url", default=SOFASCORE_BASE_URL,
+                        help="Server hosting /api/v1, e.g. a local stand-in server.")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="Maximum number of open connections.")
+    add_scraper_arguments(parser)
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    dates = scraper_dates_from_args(parser, args)
+
+    setup_logging()
+    logger.info("Started!😄🙌😃 ")
+    stores = ScraperStores(args)
+    try:
+        with exported_metrics(args):
+            asyncio.run(run(dates, args.base_url, args.concurrency, stores.cache, stores.fixture_memo, stores.save,
+                            stores.archive, stores.checkpoints, stores.standings))
+    finally:
+        stores.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+
+"""End-to-end benchmark of the scrapers against the local replay server.
+
+Every mode scrapes the same recorded matchdays from `sofascore_stub_server.py`
+(with the given latency and jitter) and reports matches per minute, p50/p95
+latency per stage and the peak RSS of Python and of the browser processes.
+Without `--fixtures-dir` a synthetic recording of `--matches` matches is
+generated first.
+
+    python3 sofascore_benchmark.py --modes api chrome-lean --latency 120 --jitter 40
+    python3 sofascore_benchmark.py --fixtures-dir recorded_api --date 2025-04-21 --modes chrome --workers 4
+    python3 sofascore_benchmark.py --modes chrome-lean --workers 1 --tabs 4
+
+Modes: `chrome` (headless), `chrome-lean` and `api` (direct API client). The
+response cache is disabled and every mode starts with an empty fixture memo.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import tempfile
+import threading
+import time
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import pytz
+
+from sofascore_common import (
+    scheduled_events_api,
+    event_api,
+    pregame_form_api,
+    team_performance_api,
+    standings_api,
+    add_date_arguments,
+    dates_from_args,
+    setup_logging,
+)
+from sofascore_fixture_memo import FixtureMemo
+from sofascore_checkpoints import is_complete
+from sofascore_standings import StandingsResolver
+from sofascore_metrics import metrics
+from sofascore_stub_server import start_stub_server
+
+
+logger = logging.getLogger(__name__)
+
+
+MODES = ("chrome", "chrome-lean", "api")
+
+# Season of the synthetic recording.
+SEASON_ID = 61627
+
+# Seconds between two RSS samples.
+SAMPLE_INTERVAL = 0.2
+
+
+# Synthetic recording
+
+def generate_fixtures(fixtures_dir, dates, matches=10, history=12):
+    """Write a recording of `matches` Premier League matches per date into `fixtures_dir`.
+
+    Every team has `history` previous league matches against the other teams of
+    the day, so previous fixtures are shared between histories like on a real
+    matchday.
+    """
+    def write(api_path, data):
+        path = os.path.join(fixtures_dir, api_path.lstrip("/") + ".json")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+    def team(number):
+        return {"id": 1000 + number, "name": f"Team {number}", "slug": f"team-{number}"}
+
+    def event(event_id, home, away, start, **fields):
+        return {
+            "id": event_id, "customId": f"c{event_id}", "slug": f"team-{home}-team-{away}",
+            "startTimestamp": start,
+            "tournament": {"name": "Premier League", "category": {"country": {"name": "England"}},
+                           "uniqueTournament": {"id": 17}},
+            "season": {"id": SEASON_ID},
+            "homeTeam": team(home), "awayTeam": team(away), **fields,
+        }
+
+    teams = 2 * matches
+    nairobi = pytz.timezone("Africa/Nairobi")
+
+    for day, date in enumerate(dates):
+        kickoff = nairobi.localize(datetime.strptime(date, "%Y-%m-%d").replace(hour=18))
+        base_id = 10_000_000 * (day + 1)
+
+        scheduled = []
+        for number in range(matches):
+            home, away = 2 * number, 2 * number + 1
+            match = event(base_id + number, home, away, int(kickoff.timestamp()),
+                          status={"type": "notstarted"})
+            scheduled.append(match)
+            write(event_api(match["id"]), {"event": match})
+            write(pregame_form_api(match["id"]), {"homeTeam": {"position": number + 1},
+                                                  "awayTeam": {"position": teams - number}})
+        write(scheduled_events_api(date), {"events": scheduled})
+
+        # Round k pairs team t with team (k - t) mod `teams`, the same fixture seen from both sides.
+        performance = defaultdict(list)
+        for k in range(history):
+            start = int((kickoff - timedelta(days=7 * (history - k))).timestamp())
+            for number in range(teams):
+                opponent = (k - number) % teams
+                if opponent == number:
+                    continue
+                home, away = (number, opponent) if (number < opponent) == (k % 2 == 0) else (opponent, number)
+                event_id = base_id + 100_000 + k * teams + min(number, opponent)
+                performance[number].append(event(
+                    event_id, home, away, start, status={"type": "finished"}, roundInfo={"round": k + 1},
+                    homeScore={"current": (k + home) % 3}, awayScore={"current": (k + away) % 2},
+                    winnerCode=[1, 2, 3][(k + number + opponent) % 3],
+                ))
+                write(pregame_form_api(event_id), {"homeTeam": {"position": home % 20 + 1},
+                                                   "awayTeam": {"position": away % 20 + 1}})
+
+        for number, events in performance.items():
+            write(team_performance_api(1000 + number), {"events": events})
+
+        # The table after the last round, not the pregame-form positions: it ranks none of the
+        # recorded fixtures, as none is of round `history + 1`.
+        write(standings_api(17, SEASON_ID), {"standings": [{"type": "total", "rows": [
+            {"team": team(number), "position": teams - number, "matches": history} for number in range(teams)
+        ]}]})
+
+
+# Measurements
+
+def _rss_kb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def _descendants(pid):
+    children = defaultdict(list)
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces; the parent PID follows its closing ")".
+                children[int(f.read().rsplit(")", 1)[1].split()[1])].append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+
+    found, todo = [], [pid]
+    while todo:
+        for child in children[todo.pop()]:
+            found.append(child)
+            todo.append(child)
+    return found
+
+
+class RssSampler:
+    """Peak RSS of this process and of its child processes (chromedriver + Chrome), sampled on Linux."""
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.python_peak_kb = 0
+        self.browser_peak_kb = 0
+        self.available = os.path.isdir("/proc/self")
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        if self.available:
+            self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._sample()
+        else:
+            # Lifetime peak, the best that's available without /proc.
+            self.python_peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self):
+        pid = os.getpid()
+        self.python_peak_kb = max(self.python_peak_kb, _rss_kb(pid))
+        self.browser_peak_kb = max(self.browser_peak_kb, sum(_rss_kb(child) for child in _descendants(pid)))
+
+
+# Modes
+
+def run_mode(mode, base_url, dates, workers, concurrency, tabs=1, rank_source="pregame-form"):
+    """Scrape `dates` in `mode`; returns {date: [Match]}."""
+    fixture_memo = FixtureMemo(path=None)
+    standings = StandingsResolver(path=None) if rank_source == "standings" else None
+
+    if mode == "api":
+        import sofascore_api_client as api_client
+
+        return asyncio.run(api_client.run(dates, base_url, concurrency, fixture_memo=fixture_memo,
+                                          standings=standings))
+
+    import sofascore_script_chrome_driver as chrome
+
+    return chrome.run(dates, workers=workers, headless=True, lean=mode == "chrome-lean",
+                      fixture_memo=fixture_memo, base_url=base_url, tabs=tabs, standings=standings)
+
+
+def benchmark(mode, server, dates, workers, concurrency, tabs=1, rank_source="pregame-form"):
+    """Scrape `dates` in `mode` from the stub `server` and measure it."""
+    logger.info("⏱️  Benchmarking %s on %s", mode, ', '.join(dates))
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    # The stage timings of this mode only.
+    metrics.reset()
+    bytes_before = server.bytes_sent
+    with RssSampler() as rss:
+        start = time.perf_counter()
+        games = run_mode(mode, base_url, dates, workers, concurrency, tabs, rank_source)
+        elapsed = time.perf_counter() - start
+    bytes_sent = server.bytes_sent - bytes_before
+
+    matches = sum(len(tournament_games) for tournament_games in games.values())
+    complete = sum(is_complete(match) for tournament_games in games.values() for match in tournament_games)
+    return {
+        "mode": mode,
+        "matches": matches,
+        "complete_matches": complete,
+        "seconds": elapsed,
+        "matches_per_minute": complete / elapsed * 60 if elapsed else 0.0,
+        # Pages and API responses served for the mode, scheduled-events included.
+        "kb_per_match": bytes_sent / 1024 / matches if matches else None,
+        "python_peak_rss_mb": rss.python_peak_kb / 1024,
+        "browser_peak_rss_mb": rss.browser_peak_kb / 1024 if rss.available else None,
+        "stages": metrics.summary(),
+    }
+
+
+def print_report(results):
+    for result in results:
+        browser_rss = result["browser_peak_rss_mb"]
+        print(f"\n{result['mode']}: {result['complete_matches']}/{result['matches']} matches "
+              f"in {result['seconds']:.1f}s = {result['matches_per_minute']:.1f} matches/min")
+        print(f"  peak RSS: Python {result['python_peak_rss_mb']:.0f} MB, "
+              f"browser {'n/a' if browser_rss is None else f'{browser_rss:.0f} MB'}")
+        if result["kb_per_match"] is not None:
+            print(f"  served: {result['kb_per_match']:.1f} kB per match")
+        print(f"  {'stage':<32} {'count':>6} {'p50 ms':>9} {'p95 ms':>9}")
+        for stage, stats in result["stages"].items():
+            print(f"  {stage:<32} {stats['count']:>6} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_date_arguments(parser)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=["api"])
+    parser.add_argument("--fixtures-dir", help="Recorded API responses (default: a synthetic recording).")
+    parser.add_argument("--matches", type=int, default=10, help="Matches per date of the synthetic recording.")
+    parser.add_argument("--latency", type=float, default=100, help="Delay of every response (ms).")
+    parser.add_argument("--jitter", type=float, default=30, help="Random +/- variation of the delay (ms).")
+    parser.add_argument("--workers", type=int, default=1, help="Chrome instances of the chrome modes.")
+    parser.add_argument("--tabs", type=int, default=1, help="Tabs per Chrome of the chrome modes.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Connections of the api mode.")
+    parser.add_argument("--rank-source", choices=("standings", "pregame-form"), default="pregame-form",
+                        help="Ranks of previous fixtures, as in the scrapers. With standings, the recording "
+                        "only has the table after its last round, so the past fixtures fall back to their "
+                        "pregame-form and the mode costs one more request per league.")
+    parser.add_argument("--json", help="Also write the results to this JSON file.")
+    args = parser.parse_args()
+
+    dates = dates_from_args(parser, args)
+    setup_logging()
+
+    with tempfile.TemporaryDirectory(prefix="sofascore_fixtures_") as synthetic_dir:
+        fixtures_dir = args.fixtures_dir
+        if fixtures_dir is None:
+            fixtures_dir = synthetic_dir
+            generate_fixtures(fixtures_dir, dates, matches=args.matches)
+
+        server = start_stub_server(fixtures_dir, latency=args.latency / 1000, jitter=args.jitter / 1000)
+        print(f"Replaying {fixtures_dir} on http://127.0.0.1:{server.server_port} "
+              f"({args.latency:.0f} ± {args.jitter:.0f} ms)")
+
+        try:
+            results = [benchmark(mode, server, dates, args.workers, args.concurrency, args.tabs, args.rank_source)
+                       for mode in args.modes]
+        finally:
+            server.shutdown()
+
+    print_report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
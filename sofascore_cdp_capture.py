@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+
+"""Event-driven capture of SofaScore API responses over the Chrome DevTools Protocol.
+
+Rather than polling `driver.get_log("performance")` and scanning every entry
+for a matching `:path` header, a background thread listens to
+`Network.responseReceived` and `Network.loadingFinished` as they arrive and
+keeps an index of API path -> request ID -> response body.
+
+    capture = CdpCapture(driver).start()
+    driver.get(redirect_url)
+    pregame_rank_json = capture.wait_for_json(f"/api/v1/event/{match_ID}/pregame-form", timeout=15)
+"""
+
+import base64
+import logging
+import threading
+
+from urllib.parse import urlsplit
+
+import trio
+
+from sofascore_common import json_loads
+from sofascore_metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class CdpCapture:
+    """Index the API responses of the driver's current tab by path."""
+
+    def __init__(self, driver, path_prefix="/api/v1/", buffer_size=1000, cache=None, archive=None):
+        """Only responses whose URL path starts with `path_prefix` are kept.
+
+        Captured responses are also written to `cache` (a ResponseCache) and
+        recorded in `archive` (a FlowArchive) if given.
+        """
+        self.driver = driver
+        self.cache = cache
+        self.archive = archive
+        self.path_prefix = path_prefix
+        self.buffer_size = buffer_size
+
+        self._condition = threading.Condition()
+        self._request_ids = {}  # API path -> request ID of its latest response
+        self._bodies = {}       # request ID -> response body
+        self._pending = {}      # request ID -> (API path, response), headers received but still loading
+
+        # Traffic of the tab, e.g. to compare browsing profiles.
+        self.bytes_received = 0
+        self.requests_finished = 0
+        self.requests_failed = 0
+
+        self._ready = threading.Event()
+        self._error = None
+        self._thread = None
+        self._trio_token = None
+        self._cancel_scope = None
+
+    def start(self, timeout=30):
+        """Open the CDP session in a background thread and wait until it is listening."""
+        self._thread = threading.Thread(target=trio.run, args=(self._listen,), daemon=True)
+        self._thread.start()
+
+        if not self._ready.wait(timeout):
+            raise TimeoutError("CDP capture did not start listening in time")
+        if self._error is not None:
+            raise self._error
+        return self
+
+    def stop(self):
+        """Close the CDP session and wait for the listener thread to exit."""
+        if self._trio_token is not None:
+            try:
+                trio.from_thread.run_sync(self._cancel_scope.cancel, trio_token=self._trio_token)
+            except trio.RunFinishedError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def request_id(self, api_path):
+        """Request ID of the latest captured response for `api_path`, or None."""
+        with self._condition:
+            return self._request_ids.get(api_path)
+
+    def get(self, api_path):
+        """Body of the latest captured response for `api_path`, or None."""
+        with self._condition:
+            return self._bodies.get(self._request_ids.get(api_path))
+
+    def get_json(self, api_path):
+        """Decoded JSON of the latest captured response for `api_path`, or None."""
+        body = self.get(api_path)
+        return None if body is None else json_loads(body)
+
+    def wait_for(self, api_path, timeout=30):
+        """Block until a response body for `api_path` has been captured and return it.
+
+        Returns as soon as the body is available (immediately if it already is);
+        raises TimeoutError after `timeout` seconds otherwise.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: api_path in self._request_ids, timeout):
+                raise TimeoutError(f"No response from {api_path} within {timeout}s")
+            return self._bodies[self._request_ids[api_path]]
+
+    def wait_for_json(self, api_path, timeout=30):
+        """Like `wait_for`, but returns the decoded JSON."""
+        return json_loads(self.wait_for(api_path, timeout))
+
+    def __contains__(self, api_path):
+        with self._condition:
+            return api_path in self._request_ids
+
+    def forget(self, api_path):
+        """Drop the captured response for `api_path` so that the next one is waited for."""
+        with self._condition:
+            self._bodies.pop(self._request_ids.pop(api_path, None), None)
+
+    def clear(self):
+        """Drop every captured response, e.g. before moving on to the next match."""
+        with self._condition:
+            self._request_ids.clear()
+            self._bodies.clear()
+
+    def _store(self, api_path, request_id, body):
+        with self._condition:
+            # Keep one body per path so that the index doesn't grow with every reload.
+            previous_request_id = self._request_ids.get(api_path)
+            if previous_request_id is not None:
+                self._bodies.pop(previous_request_id, None)
+
+            self._request_ids[api_path] = request_id
+            self._bodies[request_id] = body
+            self._condition.notify_all()
+
+    async def _fetch_body(self, session, devtools, request_id, api_path, response):
+        # The body is fetched as soon as it has loaded, before a navigation can evict it.
+        try:
+            with metrics.span("body_fetch"):
+                body, base64_encoded = await session.execute(devtools.network.get_response_body(request_id))
+                if base64_encoded:
+                    body = base64.b64decode(body).decode("utf-8")
+        except Exception as err:
+            logger.error("😫 Response.body is null for %s.\nSee error:\n%s", api_path, err)
+            return
+        self._store(api_path, str(request_id), body)
+        if self.cache is not None:
+            self.cache.put(api_path, body)
+        if self.archive is not None:
+            self.archive.write(response.url, response.status, response.headers, body)
+        logger.debug("📍✅  Captured %s", api_path)
+
+    async def _listen(self):
+        try:
+            with trio.CancelScope() as cancel_scope:
+                self._cancel_scope = cancel_scope
+                self._trio_token = trio.lowlevel.current_trio_token()
+
+                async with self.driver.bidi_connection() as connection:
+                    session, devtools = connection.session, connection.devtools
+                    network = devtools.network
+
+                    await session.execute(network.enable())
+                    events = session.listen(network.ResponseReceived, network.LoadingFinished,
+                                            network.LoadingFailed, buffer_size=self.buffer_size)
+                    self._ready.set()
+
+                    async with trio.open_nursery() as nursery:
+                        async for event in events:
+                            if isinstance(event, network.ResponseReceived):
+                                api_path = urlsplit(event.response.url).path
+                                # Team logos and other images are served under /api/v1/ too.
+                                if (api_path.startswith(self.path_prefix)
+                                        and "json" in (event.response.mime_type or "")):
+                                    self._pending[event.request_id] = (api_path, event.response)
+
+                            elif isinstance(event, network.LoadingFinished):
+                                self.bytes_received += int(event.encoded_data_length)
+                                self.requests_finished += 1
+                                pending = self._pending.pop(event.request_id, None)
+                                if pending is not None:
+                                    nursery.start_soon(self._fetch_body, session, devtools,
+                                                       event.request_id, *pending)
+
+                            else:
+                                self.requests_failed += 1
+                                self._pending.pop(event.request_id, None)
+
+        except Exception as err:
+            logger.error("❌‼️  CDP capture stopped. See Error below:\n%s", err, exc_info=True)
+            self._error = err
+        finally:
+            self._ready.set()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+"""Durable record of the matches already scraped, so that an interrupted run can resume.
+
+Every match is committed to SQLite as soon as it is scraped, flagged complete
+or not. A new run over the same date takes the completed matches from the
+store and only scrapes the rest: what was left when Chrome died, the matches
+whose previous fixtures couldn't all be ranked, or the matches added since
+the last run when a scheduled job re-runs the day. Previous fixtures are
+checkpointed the same way by the FixtureMemo as each one is resolved.
+
+    checkpoints = CheckpointStore()
+    done = checkpoints.completed_matches("2025-04-21")
+    ...
+    checkpoints.checkpoint_match("2025-04-21", match)
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+from sofascore_records import Match
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CHECKPOINT_PATH = "sofascore_checkpoints.sqlite3"
+
+
+def is_complete(match):
+    """A match (a `tournament_games` dict or a Match) is complete once the previous records of both teams
+    are in, with the ranks of every one of them."""
+    if not isinstance(match, Match):
+        match = Match.from_record(match)
+    return match.is_complete()
+
+
+class CheckpointStore:
+    """SQLite table of scraped matches keyed by (date, match ID), with a flag telling if they are complete."""
+
+    def __init__(self, path=DEFAULT_CHECKPOINT_PATH, resume=True):
+        """With `resume=False` earlier checkpoints are ignored (but still overwritten)."""
+        self.path = path
+        self.resume_enabled = resume
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS completed_matches (
+                date TEXT NOT NULL,
+                match_id INTEGER NOT NULL,
+                result TEXT NOT NULL,
+                completed_at REAL NOT NULL,
+                complete INTEGER NOT NULL DEFAULT 1,
+                PRIMARY KEY (date, match_id)
+            )
+        """)
+        self._add_complete_flags()
+        self._connection.commit()
+
+    def _add_complete_flags(self):
+        """Add the complete column to older stores, flagging the matches they took as complete without their ranks."""
+        columns = [row[1] for row in self._connection.execute("PRAGMA table_info(completed_matches)")]
+        if "complete" in columns:
+            return
+        self._connection.execute("ALTER TABLE completed_matches ADD COLUMN complete INTEGER NOT NULL DEFAULT 1")
+        rows = self._connection.execute("SELECT date, match_id, result FROM completed_matches").fetchall()
+        self._connection.executemany(
+            "UPDATE completed_matches SET complete = 0 WHERE date = ? AND match_id = ?",
+            [(date, match_id) for date, match_id, result in rows if not is_complete(json.loads(result))],
+        )
+
+    def completed_matches(self, todays_date):
+        """{match ID: match} of the matches of `todays_date` completed by earlier runs."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT match_id, result FROM completed_matches WHERE date = ? AND complete", (todays_date,)
+            ).fetchall()
+        return {match_id: json.loads(result) for match_id, result in rows}
+
+    def checkpoint_match(self, todays_date, match):
+        """Commit a scraped match right away, so that it survives a crash of the run.
+
+        A match that isn't complete (see `is_complete`) is flagged as failed and scraped again on resume.
+        """
+        complete = is_complete(match)
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO completed_matches VALUES (?, ?, ?, ?, ?)",
+                (todays_date, int(match['ID']), json.dumps(match, ensure_ascii=False), time.time(), complete),
+            )
+            self._connection.commit()
+
+    def resume(self, todays_date, tournament_games):
+        """Fill in the completed matches of `tournament_games`; returns the ones left to scrape."""
+        done = self.completed_matches(todays_date) if self.resume_enabled else {}
+        todo = []
+        for counter, match in enumerate(tournament_games):
+            if match['ID'] in done:
+                tournament_games[counter] = done[match['ID']]
+            else:
+                todo.append(match)
+
+        if done:
+            logger.info("⏩ %s: %d matches already done, %d left",
+                        todays_date, len(tournament_games) - len(todo), len(todo))
+        return todo
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._connection.execute(
+                "SELECT complete, COUNT(*) FROM completed_matches GROUP BY complete").fetchall())
+        return {"completed_matches": counts.get(1, 0), "failed_matches": counts.get(0, 0)}
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
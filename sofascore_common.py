@@ -0,0 +1,643 @@
+#!/usr/bin/env python3
+
+"""Settings, API paths and JSON parsing shared by the SofaScore scrapers.
+
+The Selenium scripts and the direct API client all build the same
+`tournament_games` and previous-match records through the helpers below.
+"""
+
+from bisect import bisect_right
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+
+import pytz
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import re
+import threading
+
+# orjson is optional; it parses and serializes several times faster than json.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+from sofascore_tournaments import tournament_selector, unique_tournament_id, configure_tournaments, DEFAULT_TOURNAMENTS_PATH
+from sofascore_records import performance_fixtures
+
+
+logger = logging.getLogger(__name__)
+
+
+## The tracked leagues are listed in sofascore_tournaments.json, keyed by their uniqueTournament ID.
+
+# Only the last four Home matches of the home team (and Away matches of the away team) are tracked.
+PREVIOUS_HOME_GAMES = 4
+
+SOFASCORE_BASE_URL = "https://www.sofascore.com"
+
+# Matchday scraped when no date is given. Change this date as required.
+DEFAULT_DATE = "2025-04-21"
+
+# Timezone of the matchdays: a game belongs to the date it kicks off on in this timezone.
+LOCAL_TIMEZONE = "Africa/Nairobi"
+
+
+# API endpoints
+
+def scheduled_events_api(date):
+    return f"/api/v1/sport/football/scheduled-events/{date}"
+
+
+def event_api(event_id):
+    return f"/api/v1/event/{event_id}"
+
+
+def pregame_form_api(event_id):
+    return f"/api/v1/event/{event_id}/pregame-form"
+
+
+def team_performance_api(team_id):
+    return f"/api/v1/team/{team_id}/performance"
+
+
+def standings_api(unique_tournament_id, season_id):
+    return f"/api/v1/unique-tournament/{unique_tournament_id}/season/{season_id}/standings/total"
+
+
+# Matchdays
+
+def matchday_dates(dates=(), start=None, end=None):
+    """Sorted, de-duplicated YYYY-MM-DD strings of `dates` plus every day from `start` to `end`.
+
+    Raises ValueError on a malformed date or when `end` is before `start`.
+    """
+    days = {datetime.strptime(date, "%Y-%m-%d").date() for date in dates}
+
+    if start is not None or end is not None:
+        first = datetime.strptime(start or end, "%Y-%m-%d").date()
+        last = datetime.strptime(end or start, "%Y-%m-%d").date()
+        if last < first:
+            raise ValueError(f"End date {end} is before start date {start}")
+        days.update(first + timedelta(days=offset) for offset in range((last - first).days + 1))
+
+    return [day.isoformat() for day in sorted(days)]
+
+
+def add_date_arguments(parser):
+    """Add the --date / --from / --to options of the batch scripts."""
+    parser.add_argument("--date", nargs="+", default=[], metavar="DATE",
+                        help=f"Matchdays as YYYY-MM-DD (default: {DEFAULT_DATE}).")
+    parser.add_argument("--from", dest="start", metavar="DATE", help="First matchday of a range.")
+    parser.add_argument("--to", dest="end", metavar="DATE", help="Last matchday of a range.")
+
+
+def dates_from_args(parser, args):
+    """Matchdays selected by the options of `add_date_arguments`."""
+    try:
+        return matchday_dates(args.date, args.start, args.end) or [DEFAULT_DATE]
+    except ValueError as err:
+        parser.error(str(err))
+
+
+# Scraper options and stores
+
+def add_scraper_arguments(parser, no_cache_help="Always request the API."):
+    """Add the --output / --cache / --fixture-memo / --rank-source / --standings / --tournaments /
+    --archive / --checkpoints / --restart / --store options of the scrapers."""
+    ## Imported here, as these modules import this one.
+    from sofascore_response_cache import DEFAULT_CACHE_PATH
+    from sofascore_fixture_memo import DEFAULT_MEMO_PATH
+    from sofascore_standings import DEFAULT_STANDINGS_PATH
+    from sofascore_checkpoints import DEFAULT_CHECKPOINT_PATH
+    from sofascore_store import DEFAULT_STORE_PATH
+
+    parser.add_argument("--output", help="JSON file for the results of a single date "
+                        "(default: tournament_games_<date>.json).")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="On-disk API response cache.")
+    parser.add_argument("--no-cache", action="store_true", help=no_cache_help)
+    parser.add_argument("--fixture-memo", default=DEFAULT_MEMO_PATH,
+                        help="Store of previous fixtures already resolved by earlier runs.")
+    parser.add_argument("--rank-source", choices=("standings", "pregame-form"), default="pregame-form",
+                        help="Ranks of previous fixtures from each fixture's pregame-form, or from the "
+                        "standings snapshot of the round before it (one request per league) when there is one. "
+                        "Only the current table can be fetched, so a first run ranks no past fixture from the "
+                        "standings and every one falls back to its pregame-form; snapshots build up over runs.")
+    parser.add_argument("--standings", default=DEFAULT_STANDINGS_PATH,
+                        help="Store of the standings snapshots fetched by earlier runs.")
+    parser.add_argument("--tournaments", default=DEFAULT_TOURNAMENTS_PATH,
+                        help="Tracked leagues and their SofaScore unique-tournament IDs.")
+    parser.add_argument("--archive", help="Record every API response to this flow archive "
+                        "(e.g. flows.flows.gz) for sofascore_replay.py.")
+    parser.add_argument("--checkpoints", default=DEFAULT_CHECKPOINT_PATH,
+                        help="Store of the matches completed so far; a re-run only scrapes the rest.")
+    parser.add_argument("--restart", action="store_true",
+                        help="Scrape every match again, ignoring the completed ones.")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH,
+                        help="SQLite store of the matches and previous fixtures (sofascore_store.py).")
+
+
+def scraper_dates_from_args(parser, args):
+    """Matchdays of a scraper run, once the `add_scraper_arguments` options are checked."""
+    dates = dates_from_args(parser, args)
+    try:
+        configure_tournaments(args.tournaments)
+    except (OSError, ValueError, KeyError) as err:
+        parser.error(f"Can't load the tournaments from {args.tournaments}: {err!r}")
+    if args.output and len(dates) > 1:
+        parser.error("--output only applies to a single date")
+    return dates
+
+
+class ScraperStores:
+    """The stores of a scraper run, opened from the `add_scraper_arguments` options.
+
+        stores = ScraperStores(args)
+        try:
+            run(dates, cache=stores.cache, save=stores.save, ...)
+        finally:
+            stores.close()
+    """
+
+    def __init__(self, args):
+        from sofascore_response_cache import ResponseCache
+        from sofascore_fixture_memo import FixtureMemo
+        from sofascore_standings import StandingsResolver
+        from sofascore_flow_archive import FlowArchive
+        from sofascore_checkpoints import CheckpointStore
+        from sofascore_store import MatchStore
+
+        self.args = args
+        self.cache = None if args.no_cache else ResponseCache(args.cache)
+        # Fixtures taken from the memo load no response, so a recorded run resolves them
+        # again (mostly from the response cache) to get their pregame-form into the archive.
+        self.fixture_memo = FixtureMemo(None if args.archive else args.fixture_memo)
+        self.standings = None
+        if args.rank_source == "standings":
+            # Likewise, only the standings recorded in the archive are used.
+            self.standings = StandingsResolver(None if args.archive else args.standings)
+        self.archive = FlowArchive(args.archive).start() if args.archive else None
+        self.checkpoints = CheckpointStore(args.checkpoints, resume=not args.restart)
+        self.store = MatchStore(args.store)
+
+    # Get the Standings in the JSON output, one file per date.
+    # Store the standings in the same array of dictionaries above taking into account which match they belong to.
+    def save(self, todays_date, tournament_games):
+        output = self.args.output or f"tournament_games_{todays_date}.json"
+        with open(output, 'w') as f:
+            json.dump(tournament_games, f, indent=2, ensure_ascii=False)
+        self.store.save_date(todays_date, tournament_games)
+        logger.info("Saved %d matches to %s and %s", len(tournament_games), output, self.args.store)
+
+    def close(self):
+        """Finish the archive, then log the stats of every store and close it."""
+        try:
+            if self.archive is not None:
+                self.archive.close()
+                logger.info("Recorded %d API responses to %s", self.archive.flows_written, self.args.archive)
+        finally:
+            logger.info("Previous fixtures: %s", self.fixture_memo.stats())
+            self.fixture_memo.close()
+
+            if self.standings is not None:
+                logger.info("Standings: %s", self.standings.stats())
+                self.standings.close()
+
+            logger.info("Checkpoints: %s", self.checkpoints.stats())
+            self.checkpoints.close()
+
+            logger.info("Match store: %s", self.store.stats())
+            self.store.close()
+
+            if self.cache is not None:
+                logger.info("Response cache: %s", self.cache.stats())
+                self.cache.close()
+
+
+# JSON backend
+
+def json_loads(data):
+    """Decode JSON from bytes or str with the fastest available backend."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps_compact(obj):
+    """Serialize `obj` to compact UTF-8 JSON bytes with the fastest available backend."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+# Start of a scheduled-events payload, up to its first event.
+SCHEDULED_EVENTS_START = re.compile(r'\s*\{\s*"events"\s*:\s*\[')
+EVENT_SEPARATOR = re.compile(r'[\s,]*')
+
+_event_decoder = json.JSONDecoder()
+
+
+def iter_scheduled_events(body):
+    """Yield the events of a scheduled-events body (bytes or str) one at a time.
+
+    Every event is decoded on its own as the body is read, so only one event's
+    objects are alive at a time instead of the whole day's.
+    """
+    if isinstance(body, bytes):
+        body = body.decode("utf-8")
+
+    start = SCHEDULED_EVENTS_START.match(body)
+    if start is None:
+        # Not laid out as {"events": [...], ...}; decode it as a whole.
+        yield from json_loads(body).get("events", ())
+        return
+
+    position = start.end()
+    while True:
+        position = EVENT_SEPARATOR.match(body, position).end()
+        if body[position:position + 1] == "]":
+            return
+        event, position = _event_decoder.raw_decode(body, position)
+        yield event
+
+
+# Configure logging
+
+## One log file, rotated by size, instead of a new numbered file per run:
+## sofascore_script.log, then sofascore_script.log.1 ... .5 (oldest).
+LOG_FILENAME = "sofascore_script.log"
+LOG_MAX_BYTES = 20 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+## Records waiting for the logging thread. A full queue drops records rather than stalling a scraper.
+LOG_QUEUE_SIZE = 10_000
+
+## Every DEBUG/INFO message template is written at most LOG_RATE_BURST times per LOG_RATE_INTERVAL seconds.
+LOG_RATE_BURST = 20
+LOG_RATE_INTERVAL = 1.0
+
+# Third-party loggers that would flood the DEBUG log file.
+QUIET_LOGGERS = ("selenium", "urllib3", "trio", "trio-websocket", "asyncio", "aiohttp", "WDM")
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Hand records to a QueueListener thread without formatting them or ever waiting on the queue."""
+
+    def __init__(self, queue):
+        super().__init__(queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Containers may still change on the scraping thread: render those messages now.
+        # Any other message is only formatted on the logging thread.
+        args = record.args if isinstance(record.args, tuple) else (record.args,)
+        if any(isinstance(arg, (dict, list, set)) for arg in args):
+            record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            # The traceback is rendered while its frames are alive, and they are released.
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class RateLimitFilter(logging.Filter):
+    """Let each DEBUG/INFO message template through at most `burst` times per `interval` seconds.
+
+    Templates are the unformatted messages, so `logger.debug("Captured %s", path)`
+    is one template for every path. Warnings and errors always pass. The first
+    record of a template after a suppression carries `suppressed`, the count of
+    the ones left out.
+    """
+
+    # Templates tracked at most; past that the counts start over.
+    MAX_TEMPLATES = 10_000
+
+    def __init__(self, burst=LOG_RATE_BURST, interval=LOG_RATE_INTERVAL):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self._windows = {}  # (logger name, template) -> [window start, records passed, records suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+
+        key = (record.name, record.msg if isinstance(record.msg, str) else type(record.msg))
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or record.created - window[0] >= self.interval:
+                if window is None and len(self._windows) >= self.MAX_TEMPLATES:
+                    self._windows.clear()
+                if window is not None and window[2]:
+                    record.suppressed = window[2]
+                self._windows[key] = [record.created, 1, 0]
+                return True
+            if window[1] < self.burst:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+
+
+class LogFormatter(logging.Formatter):
+    """The log line format, with the count of similar records left out by a RateLimitFilter."""
+
+    def format(self, record):
+        line = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            line += f" [+{suppressed} similar suppressed]"
+        return line
+
+
+class LogListener(logging.handlers.QueueListener):
+    """QueueListener whose stop waits for room in a full queue, so every queued record is written."""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+def _stop_logging(listener, queue_handler):
+    listener.stop()
+    if queue_handler.dropped:
+        record = logging.makeLogRecord({"levelno": logging.WARNING, "levelname": "WARNING",
+                                        "msg": f"{queue_handler.dropped} log records dropped (queue full)"})
+        for handler in listener.handlers:
+            handler.handle(record)
+    for handler in listener.handlers:
+        handler.close()
+
+
+def setup_logging(filename=LOG_FILENAME, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT):
+    """Send DEBUG records of every module to a rotating log file and WARNING records to the console.
+
+    Records go through a bounded queue to a background thread, which formats
+    and writes them, so logging never blocks a scraper on disk I/O.
+    DEBUG/INFO records are rate-limited per message template (RateLimitFilter).
+    The queue is flushed at exit.
+    """
+    ## Create a logger
+    logger = logging.getLogger()
+    logger.setLevel(logging.DEBUG)
+
+    ## Set format
+    formatter = LogFormatter(
+        "{asctime} - {levelname} - {message}",
+        style="{",
+        datefmt="%Y-%m-%d %H:%M",
+    )
+
+    ## Create file handler
+    ### Append, and roll over to a new file past `max_bytes`
+    main_file_handler = logging.handlers.RotatingFileHandler(
+        filename, mode="a", maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    main_file_handler.setLevel(logging.DEBUG)
+    main_file_handler.setFormatter(formatter)
+
+    ## Create console handler
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.WARNING)
+    console_handler.setFormatter(formatter)
+
+    ## Both are written from the listener thread
+    queue_handler = NonBlockingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    queue_handler.addFilter(RateLimitFilter())
+    logger.addHandler(queue_handler)
+
+    listener = LogListener(queue_handler.queue, main_file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(_stop_logging, listener, queue_handler)
+
+    for name in QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    return logger
+
+
+# Need to make sure the UNIX timestamps for the games is matching the date specified by 'todays_date'
+
+SECONDS_PER_DAY = 86_400
+
+# Kick-off times are on the quarter hour.
+QUARTER_HOUR = 900
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+@lru_cache(maxsize=None)
+def zone_transitions(zone=LOCAL_TIMEZONE):
+    """(UNIX times at which the UTC offset of `zone` changes, UTC offset in seconds from each one on).
+
+    Taken from the transition table of the pytz zone, so the offsets are the
+    ones convert_unix_to_time() applies, at whatever second a change happens
+    (e.g. Africa/Monrovia at 00:44:30 UTC on 1972-01-07). The first time is
+    the start of year 1; a zone with a fixed offset has only that one.
+    """
+    tz = pytz.timezone(zone)
+    transitions = getattr(tz, "_utc_transition_times", None) or [datetime.min]
+    times = tuple(int(transition.replace(tzinfo=timezone.utc).timestamp()) for transition in transitions)
+    if not hasattr(tz, "_transition_info"):
+        return times, (int(tz.utcoffset(None).total_seconds()),)
+    return times, tuple(int(offset.total_seconds()) for offset, _, _ in tz._transition_info)
+
+
+def utc_offset(unix_timestamp, zone=LOCAL_TIMEZONE):
+    """UTC offset in seconds of `zone` at a UNIX timestamp: a bisection of its transitions."""
+    times, offsets = zone_transitions(zone)
+    return offsets[bisect_right(times, unix_timestamp) - 1]
+
+
+def local_date(unix_timestamp, zone=LOCAL_TIMEZONE):
+    """YYYY-MM-DD date of a UNIX timestamp in `zone`, the date of convert_unix_to_time() without the time."""
+    local_seconds = unix_timestamp + utc_offset(unix_timestamp, zone)
+    return date.fromordinal(EPOCH_ORDINAL + local_seconds // SECONDS_PER_DAY).isoformat()
+
+def convert_unix_to_time(unix_timestamp):
+    # Convert UNIX timestamp to timezone=LOCAL_TIMEZONE
+    date_utc = datetime.fromtimestamp(unix_timestamp, tz=timezone.utc)
+    target_timezone = pytz.timezone(LOCAL_TIMEZONE)
+    local_time = date_utc.astimezone(target_timezone)
+    local_time = local_time.isoformat()
+
+    # Format time in 24-hour format (HH:MM:SS)
+    date = local_time.split("T")[0]
+    time = (local_time.split("T")[1]).split("+")[0]
+    return (date, time)
+
+
+def is_finished_event(event):
+    """Whether a SofaScore event is over, so that its data no longer changes."""
+    return (event.get("status") or {}).get("type") == "finished"
+
+
+def finished_event_ids(data):
+    """IDs of the finished events of a decoded API payload: its `events`, or its `event`."""
+    if not isinstance(data, dict):
+        return []
+    events = data.get("events") or ([data["event"]] if "event" in data else [])
+    return [event["id"] for event in events
+            if isinstance(event, dict) and "id" in event and is_finished_event(event)]
+
+
+def select_tournament_games(events, todays_date, selector=None, finished=None):
+    """Build the `tournament_games` records from a scheduled-events payload.
+
+    `selector` is a TournamentSelector, the one of sofascore_tournaments.json by default.
+    The IDs of the finished events of the whole payload are appended to the list `finished` if given.
+    """
+    selector = selector or tournament_selector()
+    tournament_games = []
+
+    for scheduled_games in events['events']:
+        if finished is not None and is_finished_event(scheduled_games):
+            finished.append(scheduled_games['id'])
+
+        # Cheapest test first: most of the day's events are from other leagues.
+        tournament = scheduled_games["tournament"]
+        if not selector.selects(tournament):
+            continue
+
+        date_value = local_date(scheduled_games["startTimestamp"])
+
+        if date_value == todays_date:
+            tournament_games.append({
+                'League': tournament["name"],
+                'Tournament ID': unique_tournament_id(tournament),
+                'Custom ID': scheduled_games['customId'],
+                'Home Team': scheduled_games["homeTeam"]['name'],
+                'Away Team': scheduled_games["awayTeam"]['name'],
+                'ID': scheduled_games['id'],
+                'MatchUp': scheduled_games["slug"],
+                'Date': date_value,
+                'Home Team ID': scheduled_games["homeTeam"].get('id'),
+                'Away Team ID': scheduled_games["awayTeam"].get('id'),
+            })
+
+    return tournament_games
+
+
+def select_scheduled_games(body, todays_date, finished=None):
+    """`select_tournament_games` of a raw scheduled-events body, filtering the events as they are decoded."""
+    return select_tournament_games({'events': iter_scheduled_events(body)}, todays_date, finished=finished)
+
+
+def parse_performance(body, finished=None):
+    """HistoricFixtures of a raw `/team/{id}/performance` body; the decoded events aren't kept.
+
+    The IDs of its finished events are appended to the list `finished` if given.
+    """
+    performance_json = json_loads(body)
+    if finished is not None:
+        finished.extend(finished_event_ids(performance_json))
+    return performance_fixtures(performance_json)
+
+
+## [{'A/H': '<>', 'Result': '<W/D/L>', 'Scored': <num>, 'Conceded': <num>, 'Team Ranking': <num>, 'Opponent Rank': <num>,
+##   'Event ID': <id>, 'Date': '<YYYY-MM-DD>', 'Opponent': '<name>', 'Opponent ID': <id>}]
+
+def same_tournament(league, tournament_id, record):
+    """Whether the previous match `record` (a HistoricFixture) is from the league of the upcoming one.
+
+    The unique-tournament IDs are compared when both are known, as several
+    countries have a "Premiership" or a "Championship"; the names otherwise.
+    """
+    if tournament_id is not None and record.unique_tournament_id is not None:
+        return tournament_id == record.unique_tournament_id
+    return league == record.league
+
+
+def previous_record(team_name, league, record, tournament_id=None):
+    """Derive a previous-match record for `team_name` from a HistoricFixture of its `/team/{id}/performance`.
+
+    Returns None when the fixture is from another league or the team did not play in it.
+    The rankings are filled in later from the fixture's pregame-form.
+    """
+    if not same_tournament(league, tournament_id, record):
+        return None
+
+    individual_record = {
+        'A/H': None,
+        'Result': None,
+        'Scored': None,
+        'Conceded': None,
+        "Team Ranking": None,
+        "Opponent Rank": None
+    }
+
+    if team_name == record.home.name:
+        individual_record['A/H'] = 'Home'
+        results = {1: 'Win', 3: 'Draw', 2: 'Loss'}
+        individual_record['Scored'] = record.home_score
+        individual_record['Conceded'] = record.away_score
+        opponent = record.away
+    elif team_name == record.away.name:
+        individual_record['A/H'] = 'Away'
+        results = {1: 'Loss', 3: 'Draw', 2: 'Win'}
+        individual_record['Scored'] = record.away_score
+        individual_record['Conceded'] = record.home_score
+        opponent = record.home
+    else:
+        return None
+
+    individual_record['Result'] = results.get(record.winner_code)
+
+    # Identify the fixture for the structured store (sofascore_store.py).
+    individual_record['Event ID'] = record.event_id
+    individual_record['Date'] = local_date(record.start_timestamp) if record.start_timestamp is not None else None
+    individual_record['Opponent'] = opponent.name
+    individual_record['Opponent ID'] = opponent.id
+    return individual_record
+
+
+def previous_records(team_name, league, fixtures, venue='Home', tournament_id=None):
+    """Pick the previous league matches of a team, latest first, up to PREVIOUS_HOME_GAMES games at `venue`.
+
+    `fixtures` are the HistoricFixtures of the team's `/team/{id}/performance` (see parse_performance).
+    `venue` is 'Home' for the home team of the upcoming match and 'Away' for the away team.
+    `tournament_id` is the match's 'Tournament ID'; without it, leagues are matched by name.
+    Returns a list of (fixture, record) pairs; the fixture is kept to look up its ranks.
+    """
+    # The JSON output has the latest matchups at the bottom and the oldest at the top
+    selected = []
+    venue_games_counter = 0
+
+    for record in reversed(fixtures):
+        if venue_games_counter == PREVIOUS_HOME_GAMES:
+            break
+
+        individual_record = previous_record(team_name, league, record, tournament_id)
+        if individual_record is None:
+            continue
+
+        if individual_record['A/H'] == venue:
+            venue_games_counter += 1
+        selected.append((record, individual_record))
+
+    return selected
+
+
+def apply_ranks(individual_record, home_position, away_position):
+    """Fill 'Team Ranking' and 'Opponent Rank' from the perspective of the record's team."""
+    if individual_record['A/H'] == 'Home':
+        individual_record['Team Ranking'], individual_record['Opponent Rank'] = home_position, away_position
+    else:
+        individual_record['Team Ranking'], individual_record['Opponent Rank'] = away_position, home_position
+    return individual_record
+
+
+def previous_game_url(record, base_url=SOFASCORE_BASE_URL):
+    """Web page of a previous match, opened to load its pregame-form."""
+    return (base_url + "/football/match/" + record.slug + '/' +
+            str(record.custom_id) + "#id:" + str(record.event_id) + ",tab:standings")
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+
+"""Columnar normalization of SofaScore event lists, with NumPy.
+
+An event list, either a scheduled-events day or a team's performance,
+becomes one table of NumPy columns. IDs and kick-off times are int64 and
+scores are float (NaN when not played). The table can also keep the few
+strings that the match records need. Local dates are bucketed for all events
+in one vectorized pass, in any timezone, so filtering and date matching run
+on arrays.
+
+    table = event_table(iter_scheduled_events(body))
+    tournament_games = table_tournament_games(table, "2025-04-21")
+
+sofascore_features.py builds its history table on event_table(). The
+scrapers keep filtering scheduled events one at a time, because most of a
+day's events are dropped after a single set lookup, before anything else is
+read from them. To compare both paths on a synthetic full-day payload:
+
+    python3 sofascore_events.py --benchmark 3000
+"""
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pytz
+
+from sofascore_common import (
+    LOCAL_TIMEZONE,
+    QUARTER_HOUR,
+    SECONDS_PER_DAY,
+    zone_transitions,
+    convert_unix_to_time,
+    iter_scheduled_events,
+    select_scheduled_games,
+    select_tournament_games,
+)
+from sofascore_tournaments import tournament_selector
+
+
+# Marks a missing ID in the int64 columns.
+MISSING_ID = -1
+
+# Numeric columns of event_table(), with their dtype.
+NUMERIC_COLUMNS = {
+    "event_id": np.int64,
+    "start_timestamp": np.int64,
+    "unique_tournament_id": np.int64,
+    "home_team_id": np.int64,
+    "away_team_id": np.int64,
+    "home_score": np.float64,
+    "away_score": np.float64,
+    "winner_code": np.int8,
+}
+
+STRING_COLUMNS = ("league", "country", "custom_id", "slug", "home_team", "away_team")
+
+
+def event_table(events, strings=STRING_COLUMNS):
+    """Normalize an iterable of SofaScore events into a dict of NumPy columns, one row per event.
+
+    The events are read once and not kept, so `events` may be a generator
+    like iter_scheduled_events(). Missing IDs are MISSING_ID, missing scores
+    NaN and a missing winnerCode 0. Only the `strings` of STRING_COLUMNS are
+    extracted.
+    """
+    event_id, start_timestamp, unique_tournament_id, home_team_id, away_team_id = [], [], [], [], []
+    home_score, away_score, winner_code = [], [], []
+    text = {name: [] for name in strings}
+    league, country = text.get("league"), text.get("country")
+    custom_id, slug, home_name, away_name = (text.get(name) for name in ("custom_id", "slug", "home_team", "away_team"))
+
+    for event in events:
+        tournament = event.get("tournament") or {}
+        home_team, away_team = event.get("homeTeam") or {}, event.get("awayTeam") or {}
+        event_id.append(event.get("id", MISSING_ID))
+        start_timestamp.append(event.get("startTimestamp", 0))
+        unique_tournament_id.append((tournament.get("uniqueTournament") or {}).get("id", MISSING_ID))
+        home_team_id.append(home_team.get("id", MISSING_ID))
+        away_team_id.append(away_team.get("id", MISSING_ID))
+        home_score.append((event.get("homeScore") or {}).get("current", np.nan))
+        away_score.append((event.get("awayScore") or {}).get("current", np.nan))
+        winner_code.append(event.get("winnerCode") or 0)
+        if league is not None:
+            league.append(tournament.get("name"))
+        if country is not None:
+            country.append(((tournament.get("category") or {}).get("country") or {}).get("name"))
+        if custom_id is not None:
+            custom_id.append(event.get("customId"))
+        if slug is not None:
+            slug.append(event.get("slug"))
+        if home_name is not None:
+            home_name.append(home_team.get("name"))
+        if away_name is not None:
+            away_name.append(away_team.get("name"))
+
+    values = {"event_id": event_id, "start_timestamp": start_timestamp, "unique_tournament_id": unique_tournament_id,
+              "home_team_id": home_team_id, "away_team_id": away_team_id, "home_score": home_score,
+              "away_score": away_score, "winner_code": winner_code}
+    table = {name: np.asarray(values[name], dtype=dtype) for name, dtype in NUMERIC_COLUMNS.items()}
+    for name, column in text.items():
+        table[name] = np.asarray(column, dtype=object)
+    return table
+
+
+def local_days(timestamps, zone=LOCAL_TIMEZONE):
+    """Local calendar day of every UNIX timestamp in `zone`, as days since 1970-01-01.
+
+    The UTC offsets are found with one search of the zone's transition table
+    (see zone_transitions()) for the whole column, so DST changes are honoured
+    without a timezone lookup per timestamp.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    times, offsets = zone_transitions(zone)
+    interval = np.searchsorted(np.asarray(times, dtype=np.int64), timestamps, side="right") - 1
+    return (timestamps + np.asarray(offsets, dtype=np.int64)[interval]) // SECONDS_PER_DAY
+
+
+def day_number(date):
+    """Days since 1970-01-01 of a YYYY-MM-DD date, to compare with local_days()."""
+    return int(np.datetime64(date, "D").astype(np.int64))
+
+
+def selected_rows(table, selector=None):
+    """Boolean mask of the rows of `table` from the tracked tournaments."""
+    selector = selector or tournament_selector()
+    unique_tournament_id = table["unique_tournament_id"]
+    selected = np.isin(unique_tournament_id, np.fromiter(selector.ids, dtype=np.int64))
+
+    # Events without a uniqueTournament fall back to their (country, league) pair, as in TournamentSelector.
+    for row in np.flatnonzero(unique_tournament_id == MISSING_ID).tolist():
+        selected[row] = (table["country"][row], table["league"][row]) in selector.pairs
+    return selected
+
+
+def table_tournament_games(table, todays_date, selector=None, zone=LOCAL_TIMEZONE):
+    """The `tournament_games` records of select_tournament_games(), from an event_table()."""
+    rows = np.flatnonzero(selected_rows(table, selector))
+    rows = rows[local_days(table["start_timestamp"][rows], zone) == day_number(todays_date)]
+
+    def values(name):
+        values = table[name][rows].tolist()
+        if table[name].dtype == np.int64:
+            values = [None if value == MISSING_ID else value for value in values]
+        return values
+
+    return [
+        {
+            'League': league,
+            'Tournament ID': unique_tournament_id,
+            'Custom ID': custom_id,
+            'Home Team': home_team,
+            'Away Team': away_team,
+            'ID': event_id,
+            'MatchUp': slug,
+            'Date': todays_date,
+            'Home Team ID': home_team_id,
+            'Away Team ID': away_team_id,
+        }
+        for league, unique_tournament_id, custom_id, home_team, away_team, event_id, slug, home_team_id, away_team_id
+        in zip(values("league"), values("unique_tournament_id"), values("custom_id"), values("home_team"),
+               values("away_team"), values("event_id"), values("slug"), values("home_team_id"),
+               values("away_team_id"))
+    ]
+
+
+def scheduled_tournament_games(body, todays_date, selector=None, zone=LOCAL_TIMEZONE):
+    """`tournament_games` of a raw scheduled-events body, through the columnar table."""
+    return table_tournament_games(event_table(iter_scheduled_events(body)), todays_date, selector, zone)
+
+
+# Benchmark
+
+def synthetic_day(events, date="2025-04-21", tracked=0.05, seed=0):
+    """A scheduled-events body of `events` events around `date`, `tracked` of them in a tracked league.
+
+    Like a real full day, most events are from untracked leagues and some
+    kick off on the days before and after in local time.
+    """
+    generator = random.Random(seed)
+    selector = tournament_selector()
+    tracked_ids = sorted(selector.ids)
+    midnight = int(pytz.timezone(LOCAL_TIMEZONE).localize(datetime.strptime(date, "%Y-%m-%d")).timestamp())
+
+    def event(number):
+        if generator.random() < tracked:
+            unique_tournament_id = generator.choice(tracked_ids)
+            league, country = selector.leagues[unique_tournament_id], "England"
+        else:
+            unique_tournament_id = 10_000 + generator.randrange(2_000)
+            league, country = f"League {unique_tournament_id}", f"Country {unique_tournament_id % 200}"
+        home, away = 2 * number, 2 * number + 1
+        return {
+            "tournament": {"name": league, "slug": league.lower(), "category": {
+                "name": country, "slug": country.lower(), "id": unique_tournament_id % 200,
+                "country": {"alpha2": "XX", "name": country}},
+                "uniqueTournament": {"name": league, "id": unique_tournament_id}, "id": unique_tournament_id},
+            "season": {"name": "25/26", "year": "25/26", "id": 60_000 + unique_tournament_id},
+            "roundInfo": {"round": generator.randrange(1, 39)},
+            "customId": f"c{number}", "id": 13_000_000 + number, "slug": f"team-{home}-team-{away}",
+            "status": {"code": 0, "description": "Not started", "type": "notstarted"},
+            "homeTeam": {"name": f"Team {home}", "slug": f"team-{home}", "shortName": f"T{home}", "id": home},
+            "awayTeam": {"name": f"Team {away}", "slug": f"team-{away}", "shortName": f"T{away}", "id": away},
+            "homeScore": {}, "awayScore": {},
+            "startTimestamp": midnight + generator.randrange(-6 * 3600, 30 * 3600, QUARTER_HOUR),
+        }
+
+    return json.dumps({"events": [event(number) for number in range(events)]})
+
+
+def _select_by_convert_unix_to_time(events, todays_date):
+    """select_tournament_games() with the date of every tracked event from convert_unix_to_time(), as it was."""
+    selector = tournament_selector()
+    return [event for event in events["events"]
+            if selector.selects(event["tournament"])
+            and convert_unix_to_time(event["startTimestamp"])[0] == todays_date]
+
+
+def _measure(function, *args, repeat=5):
+    """(best seconds, peak traced bytes) of `function(*args)`."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    function(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--benchmark", type=int, default=3000, metavar="EVENTS",
+                        help="Events of the synthetic day (default: 3000).")
+    parser.add_argument("--date", default="2025-04-21")
+    parser.add_argument("--timezone", default=LOCAL_TIMEZONE, help="Timezone of the local dates.")
+    args = parser.parse_args()
+
+    body = synthetic_day(args.benchmark, args.date)
+    events = json.loads(body)
+    table = event_table(events["events"])
+
+    runs = {
+        "per event, convert_unix_to_time (before)": (_select_by_convert_unix_to_time, events, args.date),
+        "per event, decoded payload (select_tournament_games)": (select_tournament_games, events, args.date),
+        "per event, raw body (select_scheduled_games)": (select_scheduled_games, body, args.date),
+        "columnar, decoded payload (event_table + filter)":
+            (lambda: table_tournament_games(event_table(events["events"]), args.date, zone=args.timezone),),
+        "columnar, raw body (scheduled_tournament_games)":
+            (lambda: scheduled_tournament_games(body, args.date, zone=args.timezone),),
+        "columnar, filter only (table_tournament_games)":
+            (lambda: table_tournament_games(table, args.date, zone=args.timezone),),
+        "local_days only": (lambda: local_days(table["start_timestamp"], args.timezone),),
+    }
+
+    print(f"{args.benchmark} events, {len(body) / 1e6:.1f} MB body, timezone {args.timezone}")
+    for name, (function, *function_args) in runs.items():
+        seconds, peak, result = _measure(function, *function_args)
+        matches = f"{len(result):4d} matches" if isinstance(result, list) else " " * 12
+        print(f"  {name:55s} {matches} {seconds * 1000:8.2f} ms  peak {peak / 1e6:6.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
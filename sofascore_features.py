@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+
+"""Form features of every team of a matchday, computed with NumPy in one pass.
+
+The `/team/{id}/performance` events of all the teams are flattened into one
+column table (one row per team and fixture). Outcomes, goals for and
+against, points, rolling form over the previous games and rank
+differentials are then computed for every row at once, from the team's own
+perspective, instead of record by record.
+
+    table = history_table(performance_by_team, ranks)
+    features = form_features(table, window=5)
+    features["form_points"]  # points of each team's previous 5 games, per row
+
+From the command line, over flow archives recorded with `--archive`:
+
+    python3 sofascore_features.py flows.flows.gz --date 2025-04-21 --output features.csv
+    python3 sofascore_features.py --benchmark 20000
+"""
+
+import argparse
+import csv
+import itertools
+import logging
+import time
+
+import numpy as np
+
+from sofascore_common import (
+    add_date_arguments,
+    matchday_dates,
+    json_loads,
+    scheduled_events_api,
+    team_performance_api,
+    pregame_form_api,
+    standings_api,
+    select_scheduled_games,
+)
+from sofascore_events import event_table, local_days
+from sofascore_records import HistoricFixture
+from sofascore_standings import StandingsResolver, season_key
+
+
+logger = logging.getLogger(__name__)
+
+
+# winnerCode of the SofaScore events.
+HOME_WIN, AWAY_WIN, DRAW = 1, 2, 3
+
+# Columns of the output, in order.
+FEATURE_COLUMNS = ("team_id", "event_id", "start_timestamp", "is_home", "goals_for", "goals_against",
+                   "win", "draw", "loss", "points", "team_rank", "opponent_rank", "rank_diff",
+                   "games_before", "form_points", "form_goals_for", "form_goals_against")
+
+
+def history_table(performance_by_team, ranks=None, tournament_id=None):
+    """Flatten {team ID: performance JSON} into a dict of NumPy columns, one row per team and fixture.
+
+    `ranks` maps event IDs to their (home position, away position) from the
+    pregame-form; fixtures without ranks get NaN. With `tournament_id` only
+    the fixtures of that unique tournament are kept.
+    """
+    team_ids = list(performance_by_team)
+    events_by_team = [performance_by_team[team_id].get("events", ()) for team_id in team_ids]
+    events = event_table(itertools.chain.from_iterable(events_by_team), strings=())
+    team_id = np.repeat(np.asarray(team_ids, dtype=np.int64), [len(team_events) for team_events in events_by_team])
+
+    is_home = events["home_team_id"] == team_id
+    keep = is_home | (events["away_team_id"] == team_id)
+    if tournament_id is not None:
+        keep &= events["unique_tournament_id"] == tournament_id
+    team_id, is_home = team_id[keep], is_home[keep]
+    column = {name: events[name][keep] for name in ("event_id", "start_timestamp", "home_score", "away_score",
+                                                    "winner_code")}
+
+    # A fixture listed twice in a team's performance is kept once, at its first row.
+    _, first = np.unique(np.stack((team_id, column["event_id"])), axis=1, return_index=True)
+    first.sort()
+
+    table = {"team_id": team_id[first], "event_id": column["event_id"][first],
+             "start_timestamp": column["start_timestamp"][first], "is_home": is_home[first],
+             "home_score": column["home_score"][first], "away_score": column["away_score"][first],
+             "winner_code": column["winner_code"][first]}
+    table["home_position"], table["away_position"] = _join_ranks(table["event_id"], ranks or {})
+    return table
+
+
+def _join_ranks(event_id, ranks):
+    """(home position, away position) columns of the fixtures `event_id`, NaN where unknown."""
+    home_position = np.full(len(event_id), np.nan)
+    away_position = np.full(len(event_id), np.nan)
+    if not ranks or not len(event_id):
+        return home_position, away_position
+
+    rank_ids = np.fromiter(ranks, dtype=np.int64, count=len(ranks))
+    # None positions become NaN.
+    positions = np.array(list(ranks.values()), dtype=np.float64).reshape(-1, 2)
+    order = np.argsort(rank_ids)
+    rank_ids, positions = rank_ids[order], positions[order]
+
+    found = np.searchsorted(rank_ids, event_id).clip(max=len(rank_ids) - 1)
+    known = rank_ids[found] == event_id
+    home_position[known], away_position[known] = positions[found[known], 0], positions[found[known], 1]
+    return home_position, away_position
+
+
+def _rolling_previous(values, group_start, window):
+    """Sum of the previous `window` values of every row within its group (the row itself excluded)."""
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    rows = np.arange(len(values))
+    first = np.maximum(group_start, rows - window)
+    return cumulative[rows] - cumulative[first]
+
+
+def form_features(table, window=5):
+    """Perspective-aware features of every row of `table`, sorted by team and kick-off time.
+
+    `form_*` columns cover the team's previous `window` fixtures in the table,
+    not the fixture of the row itself, so they describe the form going into it.
+    """
+    order = np.lexsort((table["start_timestamp"], table["team_id"]))
+    column = {name: values[order] for name, values in table.items()}
+    is_home = column["is_home"]
+    winner = column["winner_code"]
+
+    goals_for = np.where(is_home, column["home_score"], column["away_score"])
+    goals_against = np.where(is_home, column["away_score"], column["home_score"])
+
+    win = ((winner == HOME_WIN) & is_home) | ((winner == AWAY_WIN) & ~is_home)
+    draw = winner == DRAW
+    loss = ((winner == HOME_WIN) & ~is_home) | ((winner == AWAY_WIN) & is_home)
+    points = 3 * win + draw
+
+    team_rank = np.where(is_home, column["home_position"], column["away_position"])
+    opponent_rank = np.where(is_home, column["away_position"], column["home_position"])
+
+    # Index of the first row of each row's team, to keep the windows within one team.
+    team_id = column["team_id"]
+    rows = np.arange(len(team_id))
+    new_team = np.concatenate(([True], team_id[1:] != team_id[:-1])) if len(team_id) else np.zeros(0, bool)
+    group_start = np.maximum.accumulate(np.where(new_team, rows, 0)) if len(team_id) else rows
+
+    return {
+        "team_id": team_id,
+        "event_id": column["event_id"],
+        "start_timestamp": column["start_timestamp"],
+        "is_home": is_home,
+        "goals_for": goals_for,
+        "goals_against": goals_against,
+        "win": win,
+        "draw": draw,
+        "loss": loss,
+        "points": points,
+        "team_rank": team_rank,
+        "opponent_rank": opponent_rank,
+        # Positive when the opponent is ranked lower (a larger position number).
+        "rank_diff": opponent_rank - team_rank,
+        "games_before": np.minimum(rows - group_start, window),
+        "form_points": _rolling_previous(points, group_start, window),
+        "form_goals_for": _rolling_previous(np.nan_to_num(goals_for), group_start, window),
+        "form_goals_against": _rolling_previous(np.nan_to_num(goals_against), group_start, window),
+    }
+
+
+def matchday_history(index, todays_date, tournament_id=None, standings=None):
+    """{team ID: performance JSON} and fixture ranks of the teams playing on `todays_date`, from a FlowIndex.
+
+    Fixtures are ranked from their recorded pregame-form, else from the
+    recorded standings of their league (see StandingsResolver.positions), as
+    archives recorded with `--rank-source standings` have no pregame-form of
+    the fixtures the standings ranked. Snapshots are added to `standings`, so
+    one resolver passed for every date collects the tables of all of them.
+    """
+    scheduled = index.body(todays_date, scheduled_events_api(todays_date))
+    if scheduled is None:
+        return {}, {}
+
+    performance_by_team, ranks = {}, {}
+    for match in select_scheduled_games(scheduled, todays_date):
+        if tournament_id is not None and match['Tournament ID'] != tournament_id:
+            continue
+        for team_id in (match['Home Team ID'], match['Away Team ID']):
+            body = index.body(todays_date, team_performance_api(team_id))
+            if body is not None:
+                performance_by_team[team_id] = json_loads(body)
+
+    if standings is None:
+        standings = StandingsResolver(path=None)
+    loaded = set()
+
+    for performance_json in performance_by_team.values():
+        for event in performance_json.get("events", ()):
+            if event["id"] in ranks:
+                continue
+            body = index.body(todays_date, pregame_form_api(event["id"]))
+            if body is not None:
+                pregame_form_json = json_loads(body)
+                ranks[event["id"]] = (pregame_form_json["homeTeam"].get("position"),
+                                      pregame_form_json["awayTeam"].get("position"))
+                continue
+
+            fixture = HistoricFixture.from_event(event)
+            key = season_key(fixture)
+            if key is not None and key not in loaded:
+                loaded.add(key)
+                standings_body = index.body(todays_date, standings_api(*key))
+                if standings_body is not None:
+                    standings.add_standings(key, json_loads(standings_body))
+            positions = standings.positions(fixture)
+            if positions is not None:
+                ranks[event["id"]] = positions
+
+    return performance_by_team, ranks
+
+
+def synthetic_table(rows, teams=20, seed=0):
+    """A random table of `rows` fixture rows, to time form_features() at season scale."""
+    generator = np.random.default_rng(seed)
+    return {
+        "team_id": generator.integers(0, teams, rows),
+        "event_id": np.arange(rows),
+        "start_timestamp": generator.integers(1_700_000_000, 1_730_000_000, rows),
+        "is_home": generator.random(rows) < 0.5,
+        "home_score": generator.integers(0, 5, rows).astype(np.float64),
+        "away_score": generator.integers(0, 5, rows).astype(np.float64),
+        "winner_code": generator.integers(1, 4, rows).astype(np.int8),
+        "home_position": generator.integers(1, 21, rows).astype(np.float64),
+        "away_position": generator.integers(1, 21, rows).astype(np.float64),
+    }
+
+
+def write_csv(path, features):
+    # The local dates of the whole column at once, as YYYY-MM-DD strings.
+    dates = np.datetime_as_string(local_days(features["start_timestamp"]).astype("datetime64[D]")).tolist()
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(("date",) + FEATURE_COLUMNS)
+        for date, row in zip(dates, zip(*(features[name].tolist() for name in FEATURE_COLUMNS))):
+            writer.writerow((date,) + row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("archives", nargs="*", help="Flow archives, oldest first.")
+    add_date_arguments(parser)
+    parser.add_argument("--tournament", type=int, metavar="ID",
+                        help="Only the fixtures of this unique tournament (see sofascore_tournaments.json).")
+    parser.add_argument("--window", type=int, default=5, help="Previous games in the form columns.")
+    parser.add_argument("--output", default="form_features.csv")
+    parser.add_argument("--benchmark", type=int, metavar="ROWS",
+                        help="Only time form_features() on ROWS random fixture rows.")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        table = synthetic_table(args.benchmark)
+        start = time.perf_counter()
+        form_features(table, args.window)
+        print(f"form_features: {args.benchmark} rows in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return
+
+    if not args.archives:
+        parser.error("give flow archives or --benchmark")
+
+    # Imported here so that --benchmark works without the archive module's dependencies.
+    from sofascore_flow_archive import FlowIndex
+
+    index = FlowIndex.load(args.archives)
+    try:
+        dates = matchday_dates(args.date, args.start, args.end) or index.dates()
+    except ValueError as err:
+        parser.error(str(err))
+
+    performance_by_team, ranks = {}, {}
+    standings = StandingsResolver(path=None)
+    for todays_date in dates:
+        day_performance, day_ranks = matchday_history(index, todays_date, args.tournament, standings)
+        performance_by_team.update(day_performance)
+        ranks.update(day_ranks)
+    index.close()
+
+    start = time.perf_counter()
+    features = form_features(history_table(performance_by_team, ranks, args.tournament), args.window)
+    elapsed = time.perf_counter() - start
+
+    write_csv(args.output, features)
+    print(f"{len(features['team_id'])} rows for {len(performance_by_team)} teams in {elapsed * 1000:.1f} ms "
+          f"-> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+
+"""Memo of resolved historic fixtures, shared across matches and runs.
+
+The same previous fixture often shows up in several teams' histories on one
+matchday (two of today's teams played each other recently) and again on the
+next run day. Its ranks, score and winnerCode are looked up once, kept in
+memory for the run and persisted to SQLite for the next runs, so every
+historic event is resolved at most once.
+
+    memo = FixtureMemo()
+    fixture = memo.resolve(record, lambda event_id: session.open_page_and_wait(...))
+    apply_ranks(individual_record, fixture.home_position, fixture.away_position)
+"""
+
+import logging
+import sqlite3
+import threading
+
+from sofascore_records import HistoricFixture
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MEMO_PATH = "sofascore_fixtures.sqlite3"
+
+
+def historic_fixture(record, pregame_form_json):
+    """The memo entry of a previous fixture `record` (a HistoricFixture), ranked from its pregame-form.
+
+    The positions missing from the pregame-form (or all of them, without one) are None.
+    """
+    pregame_form_json = pregame_form_json or {}
+    return record.with_positions((pregame_form_json.get("homeTeam") or {}).get("position"),
+                                 (pregame_form_json.get("awayTeam") or {}).get("position"))
+
+
+def is_ranked(fixture):
+    return fixture.home_position is not None and fixture.away_position is not None
+
+
+class FixtureMemo:
+    """In-run dict in front of an SQLite table of historic fixtures keyed by event ID."""
+
+    def __init__(self, path=DEFAULT_MEMO_PATH):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+
+        self._fixtures = {}
+        self._in_flight = {}  # event ID -> threading.Event set once it is resolved
+        self._lock = threading.Lock()
+
+        self._connection = None
+        if path is not None:
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS historic_fixtures (
+                    event_id INTEGER PRIMARY KEY,
+                    home_position INTEGER,
+                    away_position INTEGER,
+                    home_score INTEGER,
+                    away_score INTEGER,
+                    winner_code INTEGER
+                )
+            """)
+            self._connection.commit()
+
+            # Stores of earlier versions may hold fixtures whose lookup failed; those are resolved again.
+            for event_id, home_position, away_position, home_score, away_score, winner_code in \
+                    self._connection.execute("SELECT * FROM historic_fixtures "
+                                             "WHERE home_position IS NOT NULL AND away_position IS NOT NULL"):
+                self._fixtures[event_id] = HistoricFixture(
+                    event_id, home_score=home_score, away_score=away_score, winner_code=winner_code,
+                    home_position=home_position, away_position=away_position)
+
+    def get(self, event_id):
+        with self._lock:
+            return self._fixtures.get(int(event_id))
+
+    def put(self, event_id, fixture):
+        with self._lock:
+            self._put(int(event_id), fixture)
+
+    ## For callers that load fixtures themselves (e.g. the asyncio client, which awaits
+    ## its in-flight lookups instead of blocking a thread on them), so the counters stay here.
+
+    def lookup(self, event_id):
+        """The memoized fixture of `event_id`, counted as a hit, else None (not counted)."""
+        with self._lock:
+            fixture = self._fixtures.get(int(event_id))
+            if fixture is not None:
+                self.hits += 1
+            return fixture
+
+    def record_miss(self):
+        """Count a fixture that the caller now loads."""
+        with self._lock:
+            self.misses += 1
+
+    def resolve(self, record, load_pregame_form):
+        """Return the ranked HistoricFixture of `record`, calling `load_pregame_form(event_id)` on a miss.
+
+        When another thread is already resolving the same event this waits for
+        its result instead of loading the fixture a second time. A fixture left
+        without ranks is returned but not memoized.
+        """
+        event_id = int(record.event_id)
+
+        while True:
+            with self._lock:
+                fixture = self._fixtures.get(event_id)
+                if fixture is not None:
+                    self.hits += 1
+                    return fixture
+
+                in_flight = self._in_flight.get(event_id)
+                if in_flight is None:
+                    in_flight = self._in_flight[event_id] = threading.Event()
+                    self.misses += 1
+                    break
+
+            # Another worker is resolving it; use its result (or retry if it failed).
+            in_flight.wait()
+
+        try:
+            fixture = historic_fixture(record, load_pregame_form(event_id))
+            with self._lock:
+                self._put(event_id, fixture)
+            return fixture
+        finally:
+            with self._lock:
+                del self._in_flight[event_id]
+            in_flight.set()
+
+    def stats(self):
+        with self._lock:
+            return {"fixtures": len(self._fixtures), "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        if self._connection is not None:
+            with self._lock:
+                self._connection.close()
+
+    def _put(self, event_id, fixture):
+        # Without both ranks (a failed or partial pregame-form) the next lookup tries again.
+        if not is_ranked(fixture):
+            return
+        self._fixtures[event_id] = fixture
+        if self._connection is not None:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO historic_fixtures VALUES (?, ?, ?, ?, ?, ?)",
+                (event_id, fixture.home_position, fixture.away_position, fixture.home_score, fixture.away_score,
+                 fixture.winner_code),
+            )
+            self._connection.commit()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+
+"""Compressed archive of the API flows seen while scraping, for offline re-processing.
+
+Every captured API response (URL, status, headers and the raw body) is
+appended to a gzip stream by a writer thread. Each flow is one JSON header
+line followed by the body bytes, so bodies are stored as received: no
+escaping, and nothing is parsed until a replay needs it.
+
+    archive = FlowArchive("flows_2025-04-21.flows.gz").start()
+    archive.write(url, 200, headers, body)
+    ...
+    archive.close()
+
+    for flow in read_flows("flows_2025-04-21.flows.gz"):
+        ...
+
+`FlowIndex` groups the flows of an archive by matchday for
+`sofascore_replay.py`.
+"""
+
+import gzip
+import logging
+import queue
+import re
+import tempfile
+import threading
+import time
+import zlib
+
+from collections import defaultdict, namedtuple
+from urllib.parse import urlsplit
+
+from sofascore_common import json_loads, json_dumps_compact
+
+
+logger = logging.getLogger(__name__)
+
+
+Flow = namedtuple("Flow", ["time", "url", "status", "headers", "body"])
+
+SCHEDULED_EVENTS_PATH = re.compile(r"^/api/v1/sport/football/scheduled-events/(\d{4}-\d{2}-\d{2})$")
+
+_CLOSE = object()
+
+# Seconds a producer waits for room in the queue before checking the writer thread again.
+PUT_TIMEOUT = 1.0
+
+
+class FlowArchive:
+    """Append flows to a gzip archive from a background thread."""
+
+    def __init__(self, path, max_queue=1000, compresslevel=6):
+        self.path = path
+        self.compresslevel = compresslevel
+        self.flows_written = 0
+
+        # Bounded so that a slow disk slows the producers down instead of growing memory.
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._closed = False
+        self._error = None  # what stopped the writer thread, if it failed
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="flow-archive", daemon=True)
+        self._thread.start()
+        return self
+
+    def write(self, url, status, headers, body):
+        """Queue one flow; `body` is the response body as bytes or str."""
+        if self._closed:
+            logger.warning("⚠️  Archive %s is closed, dropping flow for %s", self.path, url)
+            return
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        headers = {str(name): str(value) for name, value in (headers or {}).items()}
+        self._put(Flow(time.time(), str(url), int(status), headers, body))
+
+    def close(self):
+        """Write the remaining flows and end the gzip member; raises if the writer thread failed."""
+        self._closed = True
+        if self._thread is not None:
+            try:
+                self._put(_CLOSE)
+            finally:
+                self._thread.join()
+                self._thread = None
+
+    def _put(self, item):
+        """Queue `item`, waiting for room only as long as the writer thread is running."""
+        while True:
+            if self._error is not None or (self._thread is not None and not self._thread.is_alive()):
+                raise RuntimeError(f"The writer of {self.path} has stopped") from self._error
+            try:
+                self._queue.put(item, timeout=PUT_TIMEOUT)
+                return
+            except queue.Full:
+                pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _run(self):
+        try:
+            self._write_flows()
+        except BaseException as err:
+            self._error = err
+            logger.error("❌ Stopped writing flows to %s: %r", self.path, err, exc_info=True)
+
+    def _write_flows(self):
+        # Every session appends its own gzip member; readers see one continuous stream.
+        with gzip.open(self.path, "ab", compresslevel=self.compresslevel) as archive_file:
+            while True:
+                flow = self._queue.get()
+                if flow is _CLOSE:
+                    break
+
+                header = {"time": flow.time, "url": flow.url, "status": flow.status,
+                          "headers": flow.headers, "length": len(flow.body)}
+                try:
+                    header = json_dumps_compact(header)
+                except (TypeError, ValueError) as err:
+                    logger.error("❌ Could not serialize flow for %s: %s", flow.url, err)
+                    continue
+
+                archive_file.write(header + b"\n")
+                archive_file.write(flow.body + b"\n")
+                self.flows_written += 1
+
+
+def read_flows(path):
+    """Yield the flows of an archive in the order they were captured.
+
+    An archive cut short by a crash yields every complete flow before the cut.
+    """
+    with gzip.open(path, "rb") as archive_file:
+        try:
+            while True:
+                header = archive_file.readline()
+                if not header:
+                    break
+                header = json_loads(header)
+                body = archive_file.read(header["length"] + 1)[:-1]
+                if len(body) < header["length"]:
+                    raise EOFError("Truncated flow body")
+                yield Flow(header["time"], header["url"], header["status"], header["headers"], body)
+        except (EOFError, zlib.error, gzip.BadGzipFile, ValueError) as err:
+            logger.warning("⚠️  %s ends with an incomplete flow (%s); ignoring the rest", path, err)
+
+
+class FlowIndex:
+    """Latest response body per API path, grouped by the matchday being scraped.
+
+    The scrapers process one date at a time, starting with its scheduled-events,
+    so every flow recorded after the scheduled-events of a date (and before the
+    next one) belongs to that date.
+
+    The bodies are not kept in memory: they are copied, uncompressed, to a
+    temporary file as the archives are read, and only their offsets are
+    indexed. A season of archives costs disk space, not gigabytes of RAM.
+    """
+
+    def __init__(self):
+        self.flows = 0
+        self._offsets_by_date = defaultdict(dict)  # date -> {api_path: (offset, length)}
+        self._latest = {}
+        self._date = None
+        self._bodies = tempfile.TemporaryFile(prefix="sofascore_flows_")
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, paths):
+        index = cls()
+        for path in paths:
+            for flow in read_flows(path):
+                index.add(flow)
+        return index
+
+    def add(self, flow):
+        if flow.status != 200:
+            return
+        api_path = urlsplit(flow.url).path
+
+        scheduled_events = SCHEDULED_EVENTS_PATH.match(api_path)
+        if scheduled_events is not None:
+            self._date = scheduled_events.group(1)
+
+        with self._lock:
+            self._bodies.seek(0, 2)
+            location = (self._bodies.tell(), len(flow.body))
+            self._bodies.write(flow.body)
+        self._offsets_by_date[self._date][api_path] = location
+        self._latest[api_path] = location
+        self.flows += 1
+
+    def dates(self):
+        """Matchdays whose scheduled-events are in the archive."""
+        return sorted(date for date in self._offsets_by_date if date is not None)
+
+    def body(self, todays_date, api_path):
+        """Body of `api_path` as recorded for `todays_date`, else its latest recording, else None."""
+        location = self._offsets_by_date.get(todays_date, {}).get(api_path) or self._latest.get(api_path)
+        if location is None:
+            return None
+        offset, length = location
+        with self._lock:
+            self._bodies.seek(offset)
+            return self._bodies.read(length)
+
+    def close(self):
+        """Delete the temporary copy of the bodies."""
+        self._bodies.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
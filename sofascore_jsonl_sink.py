@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+
+"""Append-only JSONL sink fed through a bounded queue.
+
+Producers (e.g. the mitmproxy thread) hand records to `write()`, which only
+enqueues them; a writer thread serializes each record as one compact JSON
+line, flushes periodically and appends `url<TAB>offset<TAB>length` to a small
+index file. Memory stays flat however long the session runs, and everything
+written before a crash is on disk.
+
+    sink = JsonlSink("captured_api_data.jsonl").start()
+    sink.write({"url": flow.request.url, "data": json_data})
+    ...
+    sink.close()
+"""
+
+import logging
+import queue
+import threading
+import time
+
+from sofascore_common import json_loads, json_dumps_compact
+
+
+logger = logging.getLogger(__name__)
+
+
+_CLOSE = object()
+
+# Seconds a producer waits for room in the queue before checking the writer thread again.
+PUT_TIMEOUT = 1.0
+
+
+class JsonlSink:
+    """Write records as JSON lines from a background thread."""
+
+    def __init__(self, path, index_path=None, max_queue=1000, flush_interval=1.0):
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+        self.flush_interval = flush_interval
+        self.records_written = 0
+
+        # Bounded so that a slow disk slows the producer down instead of growing memory.
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._closed = False
+        self._error = None  # what stopped the writer thread, if it failed
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="jsonl-sink", daemon=True)
+        self._thread.start()
+        return self
+
+    def write(self, record, url=None):
+        """Queue a record: a dict, or an already serialized JSON line (bytes) with its `url`."""
+        if url is None:
+            url = record.get("url", "") if isinstance(record, dict) else ""
+        if self._closed:
+            logger.warning("⚠️  Sink %s is closed, dropping record for %s", self.path, url)
+            return
+        self._put((url, record))
+
+    def close(self):
+        """Write the remaining records and stop the writer thread; raises if the writer thread failed."""
+        self._closed = True
+        if self._thread is not None:
+            try:
+                self._put(_CLOSE)
+            finally:
+                self._thread.join()
+                self._thread = None
+
+    def _put(self, item):
+        """Queue `item`, waiting for room only as long as the writer thread is running."""
+        while True:
+            if self._error is not None or (self._thread is not None and not self._thread.is_alive()):
+                raise RuntimeError(f"The writer of {self.path} has stopped") from self._error
+            try:
+                self._queue.put(item, timeout=PUT_TIMEOUT)
+                return
+            except queue.Full:
+                pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _run(self):
+        try:
+            self._write_records()
+        except BaseException as err:
+            self._error = err
+            logger.error("❌ Stopped writing records to %s: %r", self.path, err, exc_info=True)
+
+    def _write_records(self):
+        with open(self.path, "ab") as data_file, open(self.index_path, "a", encoding="utf-8") as index_file:
+            offset = data_file.tell()
+            last_flush = time.monotonic()
+
+            while True:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    item = None
+
+                if item is _CLOSE:
+                    break
+
+                if item is not None:
+                    url, record = item
+                    try:
+                        line = _serialize(record)
+                    except (TypeError, ValueError) as err:
+                        logger.error("❌ Could not serialize record for %s: %s", url, err)
+                        continue
+
+                    data_file.write(line)
+                    index_file.write(f"{url}\t{offset}\t{len(line)}\n")
+                    offset += len(line)
+                    self.records_written += 1
+
+                # Flush when idle or at least every `flush_interval` seconds.
+                if item is None or time.monotonic() - last_flush >= self.flush_interval:
+                    data_file.flush()
+                    index_file.flush()
+                    last_flush = time.monotonic()
+
+
+def _serialize(record):
+    if isinstance(record, bytes):
+        return record if record.endswith(b"\n") else record + b"\n"
+    return json_dumps_compact(record) + b"\n"
+
+
+def json_document(content):
+    """Whether `content` (bytes) holds a single, complete JSON object or array"""
+    body = content.strip()
+    if body[:1] + body[-1:] not in (b"{}", b"[]"):
+        return False
+    try:
+        json_loads(body)
+    except ValueError:
+        return False
+    return True
+
+
+def raw_jsonl_line(url, method, status_code, content, valid=None):
+    """Build the JSONL line of a captured response around its raw body, without serializing it again
+
+    Only a body that is a valid JSON object or array is spliced in as is; `valid`
+    says whether it is when the caller already knows, otherwise it's checked here.
+    Anything else (empty 204s, error pages, a cut-off body) is stored as a JSON string.
+    """
+    record = {"url": url, "method": method, "status_code": status_code}
+    if valid is None:
+        valid = json_document(content)
+    if not valid:
+        record["data"] = content.decode("utf-8", errors="replace")
+        return json_dumps_compact(record) + b"\n"
+    header = json_dumps_compact(record)
+    # Newlines can only be whitespace between JSON tokens, so blanking them keeps one record per line
+    body = content.strip().replace(b"\n", b" ").replace(b"\r", b" ")
+    return header[:-1] + b',"data":' + body + b"}\n"
+
+
+def read_records(path, offset=0):
+    """Yield the records of a JSONL file one at a time, starting at byte `offset`.
+
+    Lines that aren't valid JSON (e.g. cut off by a crash) are logged and skipped.
+    """
+    with open(path, "rb") as data_file:
+        data_file.seek(offset)
+        for line_number, line in enumerate(data_file, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json_loads(line)
+            except ValueError as err:
+                logger.warning("⚠️  Skipping invalid record %d of %s (from byte %d): %s",
+                               line_number, path, offset, err)
+
+
+def read_index(index_path):
+    """Map every URL to the (offset, length) of its records in the JSONL file."""
+    index = {}
+    with open(index_path, encoding="utf-8") as index_file:
+        for line in index_file:
+            url, offset, length = line.rstrip("\n").rsplit("\t", 2)
+            index.setdefault(url, []).append((int(offset), int(length)))
+    return index
+
+
+def read_record_at(path, offset, length):
+    """Read the single record stored at `offset` (as given by the index)."""
+    with open(path, "rb") as data_file:
+        data_file.seek(offset)
+        return json_loads(data_file.read(length))
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+
+"""Timing spans around the scraper stages, aggregated into histograms.
+
+Every stage of the per-match pipeline is wrapped in a span; its duration goes
+into a histogram per stage. At the end of a run (and, if asked, every few
+seconds while it runs) the histograms are written as a Prometheus text file
+(for node_exporter's textfile collector) and as a JSON summary.
+
+    from sofascore_metrics import metrics
+
+    with metrics.span("navigation"):
+        driver.get(url)
+    ...
+    metrics.write("sofascore_metrics.prom", "sofascore_metrics.json")
+"""
+
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+
+from contextlib import contextmanager
+
+
+logger = logging.getLogger(__name__)
+
+
+# Upper bounds (seconds) of the histogram buckets; page loads take seconds, parsing milliseconds.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Durations kept per stage to compute exact percentiles; a random sample beyond that.
+RESERVOIR_SIZE = 10_000
+
+METRIC_NAME = "sofascore_stage_duration_seconds"
+ERRORS_NAME = "sofascore_stage_errors_total"
+
+
+class Histogram:
+    """Bucketed durations of one stage, plus a sample of them for percentiles."""
+
+    def __init__(self, buckets=BUCKETS, reservoir_size=RESERVOIR_SIZE):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.errors = 0
+        self.reservoir_size = reservoir_size
+        self._sample = []
+
+    def observe(self, seconds):
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+        for position, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.bucket_counts[position] += 1
+                break
+
+        if len(self._sample) < self.reservoir_size:
+            self._sample.append(seconds)
+        else:
+            replaced = random.randrange(self.count)
+            if replaced < self.reservoir_size:
+                self._sample[replaced] = seconds
+
+    def percentile(self, fraction):
+        """Nearest-rank percentile of the sampled durations (0 when empty)."""
+        if not self._sample:
+            return 0.0
+        ordered = sorted(self._sample)
+        return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "sum_s": self.sum,
+            "mean_ms": self.sum / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile(0.50) * 1000,
+            "p95_ms": self.percentile(0.95) * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+class Metrics:
+    """Thread-safe registry of one Histogram per stage."""
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._live_thread = None
+        self._live_stop = threading.Event()
+
+    @contextmanager
+    def span(self, stage):
+        """Time the enclosed block as one observation of `stage`; failed blocks are also counted."""
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.observe(stage, time.perf_counter() - start, error=True)
+            raise
+        self.observe(stage, time.perf_counter() - start)
+
+    def observe(self, stage, seconds, error=False):
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = Histogram()
+            histogram.observe(seconds)
+            if error:
+                histogram.errors += 1
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def summary(self):
+        """{stage: {count, errors, sum_s, mean_ms, p50_ms, p95_ms, max_ms}}"""
+        with self._lock:
+            return {stage: histogram.summary() for stage, histogram in sorted(self._histograms.items())}
+
+    def to_prometheus(self):
+        """The histograms in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {METRIC_NAME} Duration of the SofaScore scraper stages.",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        errors = [
+            f"# HELP {ERRORS_NAME} Stage runs that raised an error.",
+            f"# TYPE {ERRORS_NAME} counter",
+        ]
+
+        with self._lock:
+            for stage, histogram in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.buckets, histogram.bucket_counts):
+                    cumulative += bucket_count
+                    lines.append(f'{METRIC_NAME}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'{METRIC_NAME}_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{METRIC_NAME}_sum{{stage="{stage}"}} {histogram.sum}')
+                lines.append(f'{METRIC_NAME}_count{{stage="{stage}"}} {histogram.count}')
+                errors.append(f'{ERRORS_NAME}{{stage="{stage}"}} {histogram.errors}')
+
+        return "\n".join(lines + errors) + "\n"
+
+    def write(self, prometheus_path=None, json_path=None):
+        """Write the Prometheus text file and/or the JSON summary, replacing the previous ones atomically."""
+        if prometheus_path:
+            _write_atomic(prometheus_path, self.to_prometheus())
+        if json_path:
+            _write_atomic(json_path, json.dumps(self.summary(), indent=2) + "\n")
+
+    def start_live_export(self, prometheus_path=None, json_path=None, interval=15):
+        """Rewrite the export files every `interval` seconds until `stop_live_export()`."""
+        def export():
+            while not self._live_stop.wait(interval):
+                try:
+                    self.write(prometheus_path, json_path)
+                except OSError as err:
+                    logger.error("❌ Could not export the metrics: %s", err)
+
+        self._live_stop.clear()
+        self._live_thread = threading.Thread(target=export, name="metrics-export", daemon=True)
+        self._live_thread.start()
+
+    def stop_live_export(self):
+        if self._live_thread is not None:
+            self._live_stop.set()
+            self._live_thread.join()
+            self._live_thread = None
+
+
+def _write_atomic(path, text):
+    # Scrapers of the textfile must never see a half-written file.
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temporary_path, path)
+
+
+def add_metrics_arguments(parser):
+    """Add the --metrics-prom / --metrics-json / --metrics-interval options."""
+    parser.add_argument("--metrics-prom", metavar="PATH",
+                        help="Write the stage timings to this Prometheus text file.")
+    parser.add_argument("--metrics-json", metavar="PATH", help="Write a JSON summary of the stage timings.")
+    parser.add_argument("--metrics-interval", type=float, default=0, metavar="SECONDS",
+                        help="Also rewrite the metrics files every SECONDS while running.")
+
+
+@contextmanager
+def exported_metrics(args):
+    """Export `metrics` as set by the `add_metrics_arguments` options, live and at the end of the block."""
+    paths = (args.metrics_prom, args.metrics_json)
+    if any(paths) and args.metrics_interval > 0:
+        metrics.start_live_export(*paths, interval=args.metrics_interval)
+    try:
+        yield metrics
+    finally:
+        metrics.stop_live_export()
+        if any(paths):
+            metrics.write(*paths)
+            logger.info("Stage timings written to %s", " and ".join(path for path in paths if path))
+
+
+# Shared by every module of a run.
+metrics = Metrics()
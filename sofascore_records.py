@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+
+"""Compact record types of the scraped data: TeamRef, HistoricFixture and Match.
+
+A `/team/{id}/performance` event is a large nested dict, of which only a few
+IDs, names and scores are used. Right after parsing, it becomes a
+HistoricFixture with `__slots__` and nothing else of it is kept. Likewise,
+`run()` keeps every saved matchday as Match objects, not as the output
+dicts. Each type serializes to a flat tuple (`to_tuple()` / `from_tuple()`),
+which is also what it pickles as.
+
+    fixtures = performance_fixtures(performance_json)
+    fixtures[0].home.name, fixtures[0].winner_code
+    match = Match.from_record(tournament_game)
+    match.to_record() == tournament_game
+"""
+
+import sys
+
+
+class TeamRef:
+    """ID, name and slug of a team."""
+
+    __slots__ = ("id", "name", "slug")
+
+    def __init__(self, id=None, name=None, slug=None):
+        self.id = id
+        self.name = name
+        self.slug = slug
+
+    @classmethod
+    def from_json(cls, team):
+        """TeamRef of a `homeTeam` / `awayTeam` object of the API."""
+        return cls(team.get("id"), team.get("name"), team.get("slug"))
+
+    def to_tuple(self):
+        return self.id, self.name, self.slug
+
+    @classmethod
+    def from_tuple(cls, values):
+        return cls(*values)
+
+    def __reduce__(self):
+        return TeamRef.from_tuple, (self.to_tuple(),)
+
+    def __eq__(self, other):
+        return isinstance(other, TeamRef) and self.to_tuple() == other.to_tuple()
+
+    def __hash__(self):
+        return hash(self.to_tuple())
+
+    def __repr__(self):
+        return f"TeamRef(id={self.id!r}, name={self.name!r})"
+
+
+class HistoricFixture:
+    """A previous fixture: what the scrapers use of a `/team/{id}/performance` event, plus its ranks.
+
+    `home_position` / `away_position` are the teams' league positions before
+    the fixture. They are None until resolved from its pregame-form or the
+    standings. Fixtures loaded from the FixtureMemo only carry the event ID,
+    the ranks, the score and the winnerCode.
+    """
+
+    __slots__ = ("event_id", "custom_id", "slug", "start_timestamp", "league", "unique_tournament_id",
+                 "season_id", "round", "home", "away", "home_score", "away_score", "winner_code",
+                 "home_position", "away_position")
+
+    def __init__(self, event_id, custom_id=None, slug=None, start_timestamp=None, league=None,
+                 unique_tournament_id=None, season_id=None, round=None, home=None, away=None,
+                 home_score=None, away_score=None, winner_code=None, home_position=None, away_position=None):
+        self.event_id = event_id
+        self.custom_id = custom_id
+        self.slug = slug
+        self.start_timestamp = start_timestamp
+        self.league = league
+        self.unique_tournament_id = unique_tournament_id
+        self.season_id = season_id
+        self.round = round
+        self.home = home
+        self.away = away
+        self.home_score = home_score
+        self.away_score = away_score
+        self.winner_code = winner_code
+        self.home_position = home_position
+        self.away_position = away_position
+
+    @classmethod
+    def from_event(cls, record):
+        """Compact form of a `/team/{id}/performance` event."""
+        tournament = record.get("tournament") or {}
+        return cls(
+            record["id"],
+            record.get("customId"),
+            record.get("slug"),
+            record.get("startTimestamp"),
+            tournament.get("name"),
+            (tournament.get("uniqueTournament") or {}).get("id"),
+            (record.get("season") or {}).get("id"),
+            (record.get("roundInfo") or {}).get("round"),
+            TeamRef.from_json(record.get("homeTeam") or {}),
+            TeamRef.from_json(record.get("awayTeam") or {}),
+            (record.get("homeScore") or {}).get("current"),
+            (record.get("awayScore") or {}).get("current"),
+            record.get("winnerCode"),
+        )
+
+    def with_positions(self, home_position, away_position):
+        """A copy of the fixture with the ranks of both teams filled in."""
+        fixture = HistoricFixture.from_tuple(self.to_tuple())
+        fixture.home_position, fixture.away_position = home_position, away_position
+        return fixture
+
+    def to_tuple(self):
+        return (self.event_id, self.custom_id, self.slug, self.start_timestamp, self.league,
+                self.unique_tournament_id, self.season_id, self.round,
+                self.home.to_tuple() if self.home is not None else None,
+                self.away.to_tuple() if self.away is not None else None,
+                self.home_score, self.away_score, self.winner_code, self.home_position, self.away_position)
+
+    @classmethod
+    def from_tuple(cls, values):
+        fixture = cls(*values)
+        if fixture.home is not None:
+            fixture.home = TeamRef.from_tuple(fixture.home)
+        if fixture.away is not None:
+            fixture.away = TeamRef.from_tuple(fixture.away)
+        return fixture
+
+    def __reduce__(self):
+        return HistoricFixture.from_tuple, (self.to_tuple(),)
+
+    def __eq__(self, other):
+        return isinstance(other, HistoricFixture) and self.to_tuple() == other.to_tuple()
+
+    def __hash__(self):
+        return hash(self.to_tuple())
+
+    def __repr__(self):
+        home, away = (team.name if team is not None else None for team in (self.home, self.away))
+        return f"HistoricFixture(event_id={self.event_id!r}, {home!r} v {away!r}, league={self.league!r})"
+
+
+def performance_fixtures(performance_json):
+    """The events of a `/team/{id}/performance` payload as HistoricFixtures, oldest first like the payload."""
+    return [HistoricFixture.from_event(record) for record in performance_json.get("events", ())]
+
+
+# Keys of a previous-match record in the output (see sofascore_common.previous_record), in order.
+HISTORY_KEYS = ("A/H", "Result", "Scored", "Conceded", "Team Ranking", "Opponent Rank",
+                "Event ID", "Date", "Opponent", "Opponent ID")
+
+# Marks a key absent from a record, as opposed to a None value.
+_ABSENT = "\0absent"
+
+# Keys of the previous-fixture ranks, which stay None when their lookup failed.
+RANK_KEYS = ("Team Ranking", "Opponent Rank")
+_RANK_INDEXES = tuple(HISTORY_KEYS.index(key) for key in RANK_KEYS)
+
+
+def _history_tuple(record):
+    if not record.keys() <= set(HISTORY_KEYS):
+        return dict(record)  # Unknown keys: kept as it is.
+    # Venues, results, dates and opponents repeat across a season; one copy of each is kept.
+    return tuple(sys.intern(value) if isinstance(value, str) else value
+                 for value in (record.get(key, _ABSENT) for key in HISTORY_KEYS))
+
+
+def _is_ranked(values):
+    if isinstance(values, dict):
+        return all(values.get(key) is not None for key in RANK_KEYS)
+    return all(values[index] is not None and values[index] != _ABSENT for index in _RANK_INDEXES)
+
+
+def _history_record(values):
+    if isinstance(values, dict):
+        return dict(values)
+    return {key: value for key, value in zip(HISTORY_KEYS, values) if value != _ABSENT}
+
+
+class Match:
+    """A scraped tournament game: the `tournament_games` output dict as slots, its histories as tuples.
+
+    Ranks and histories are None while they haven't been scraped, and then
+    missing from `to_record()`, like in the output dicts.
+    """
+
+    __slots__ = ("event_id", "custom_id", "slug", "date", "league", "unique_tournament_id", "home", "away",
+                 "home_rank", "away_rank", "home_history", "away_history")
+
+    def __init__(self, event_id, custom_id=None, slug=None, date=None, league=None, unique_tournament_id=None,
+                 home=None, away=None, home_rank=None, away_rank=None, home_history=None, away_history=None):
+        self.event_id = event_id
+        self.custom_id = custom_id
+        self.slug = slug
+        self.date = date
+        self.league = league
+        self.unique_tournament_id = unique_tournament_id
+        self.home = home
+        self.away = away
+        self.home_rank = home_rank
+        self.away_rank = away_rank
+        self.home_history = home_history
+        self.away_history = away_history
+
+    @classmethod
+    def from_record(cls, match):
+        """Match of a `tournament_games` dict (sofascore_common.select_tournament_games, then scraped)."""
+        home_history, away_history = match.get("Home Team History"), match.get("Away Team History")
+        return cls(
+            match["ID"], match.get("Custom ID"), match.get("MatchUp"), match.get("Date"), match.get("League"),
+            match.get("Tournament ID"),
+            TeamRef(match.get("Home Team ID"), match.get("Home Team")),
+            TeamRef(match.get("Away Team ID"), match.get("Away Team")),
+            match.get("Home Team Rank"), match.get("Away Team Rank"),
+            None if home_history is None else tuple(_history_tuple(record) for record in home_history),
+            None if away_history is None else tuple(_history_tuple(record) for record in away_history),
+        )
+
+    def to_record(self):
+        """The `tournament_games` dict of the match, as written to the JSON output."""
+        match = {'League': self.league}
+        # Output saved before the tournament IDs has none.
+        if self.unique_tournament_id is not None:
+            match['Tournament ID'] = self.unique_tournament_id
+        match.update({
+            'Custom ID': self.custom_id,
+            'Home Team': self.home.name,
+            'Away Team': self.away.name,
+            'ID': self.event_id,
+            'MatchUp': self.slug,
+            'Date': self.date,
+            'Home Team ID': self.home.id,
+            'Away Team ID': self.away.id,
+        })
+        if self.home_rank is not None:
+            match['Home Team Rank'] = self.home_rank
+        if self.away_rank is not None:
+            match['Away Team Rank'] = self.away_rank
+        if self.home_history is not None:
+            match['Home Team History'] = [_history_record(values) for values in self.home_history]
+        if self.away_history is not None:
+            match['Away Team History'] = [_history_record(values) for values in self.away_history]
+        return match
+
+    def is_complete(self):
+        """Both histories are in, and every previous fixture in them got both ranks."""
+        return (self.home_history is not None and self.away_history is not None
+                and all(_is_ranked(values) for values in self.home_history + self.away_history))
+
+    def to_tuple(self):
+        return (self.event_id, self.custom_id, self.slug, self.date, self.league, self.unique_tournament_id,
+                self.home.to_tuple(), self.away.to_tuple(), self.home_rank, self.away_rank,
+                self.home_history, self.away_history)
+
+    @classmethod
+    def from_tuple(cls, values):
+        match = cls(*values)
+        match.home, match.away = TeamRef.from_tuple(match.home), TeamRef.from_tuple(match.away)
+        return match
+
+    def __reduce__(self):
+        return Match.from_tuple, (self.to_tuple(),)
+
+    def __eq__(self, other):
+        return isinstance(other, Match) and self.to_tuple() == other.to_tuple()
+
+    def __hash__(self):
+        # Histories with unknown keys are kept as dicts, which don't hash; equal matches still hash alike.
+        return hash(self.to_tuple()[:-2])
+
+    def __repr__(self):
+        return f"Match(event_id={self.event_id!r}, {self.home.name!r} v {self.away.name!r}, date={self.date!r})"
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+"""Re-run the parsing of recorded matchdays from flow archives, with no browser or network.
+
+The archives written with `--archive` by the scrapers (or the mitmproxy
+capture) are fed through the same parsing stages as the direct API client:
+select_tournament_games, previous_records, the W/D/L and Home/Away
+derivation and the previous-fixture ranks. After a change to the parsing
+logic the outputs are rebuilt in seconds instead of scraping again.
+
+    python3 sofascore_replay.py flows.flows.gz
+    python3 sofascore_replay.py season/*.flows.gz --from 2024-08-16 --to 2025-05-25 --output-dir replayed
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+
+from sofascore_common import add_date_arguments, matchday_dates, json_loads, setup_logging
+from sofascore_api_client import SofascoreApiClient, scrape_date
+from sofascore_flow_archive import FlowIndex
+from sofascore_store import MatchStore
+from sofascore_standings import StandingsResolver
+from sofascore_records import Match
+from sofascore_tournaments import configure_tournaments, DEFAULT_TOURNAMENTS_PATH
+
+
+logger = logging.getLogger(__name__)
+
+
+class ArchiveClient(SofascoreApiClient):
+    """SofascoreApiClient answering from a FlowIndex instead of the network.
+
+    Previous fixtures are resolved again from their recorded standings or
+    pregame-form; no persistent fixture memo or standings snapshots are used,
+    so they go through the current parsing code.
+    """
+
+    def __init__(self, index, standings=None):
+        super().__init__(base_url="", standings=standings)
+        self.index = index
+        self.todays_date = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def get_json(self, api_path, parse=None):
+        body = self.index.body(self.todays_date, api_path)
+        if body is None:
+            raise LookupError(f"{api_path} is not in the archive")
+        return (parse or json_loads)(body)
+
+
+async def replay(index, dates, save=None, standings=None):
+    """Rebuild the `tournament_games` of `dates`; returns {date: [Match]}."""
+    games_by_date = {}
+    async with ArchiveClient(index, standings) as client:
+        for todays_date in dates:
+            client.todays_date = todays_date
+            try:
+                tournament_games = await scrape_date(client, todays_date)
+            except LookupError as err:
+                logger.error("😭 Skipping %s: %s\n", todays_date, err)
+                continue
+
+            if save is not None:
+                save(todays_date, tournament_games)
+            games_by_date[todays_date] = [Match.from_record(match) for match in tournament_games]
+    return games_by_date
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("archives", nargs="+", help="Flow archives, oldest first.")
+    add_date_arguments(parser)
+    parser.add_argument("--output-dir", default=".", help="Directory of the tournament_games_<date>.json files.")
+    parser.add_argument("--rank-source", choices=("standings", "pregame-form"), default="pregame-form",
+                        help="Rank previous fixtures only from their pregame-form, or from the recorded "
+                        "standings of the round before them (falling back to their pregame-form). An archive "
+                        "of a single run only holds the current tables, so its past fixtures all fall back.")
+    parser.add_argument("--tournaments", default=DEFAULT_TOURNAMENTS_PATH,
+                        help="Tracked leagues and their SofaScore unique-tournament IDs.")
+    parser.add_argument("--store", help="Also save the rebuilt matches to this SQLite store (sofascore_store.py).")
+    args = parser.parse_args()
+
+    try:
+        configure_tournaments(args.tournaments)
+    except (OSError, ValueError, KeyError) as err:
+        parser.error(f"Can't load the tournaments from {args.tournaments}: {err!r}")
+    setup_logging()
+    start = time.process_time()
+
+    index = FlowIndex.load(args.archives)
+    try:
+        dates = matchday_dates(args.date, args.start, args.end) or index.dates()
+    except ValueError as err:
+        parser.error(str(err))
+    loaded = time.process_time()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    store = MatchStore(args.store) if args.store else None
+
+    def save(todays_date, tournament_games):
+        output = os.path.join(args.output_dir, f"tournament_games_{todays_date}.json")
+        with open(output, 'w') as f:
+            json.dump(tournament_games, f, indent=2, ensure_ascii=False)
+        if store is not None:
+            store.save_date(todays_date, tournament_games)
+        logger.info("Saved %d matches to %s", len(tournament_games), output)
+
+    standings = StandingsResolver(path=None) if args.rank_source == "standings" else None
+    games_by_date = asyncio.run(replay(index, dates, save, standings))
+    index.close()
+    if store is not None:
+        store.close()
+
+    matches = sum(len(tournament_games) for tournament_games in games_by_date.values())
+    print(f"Replayed {matches} matches of {len(games_by_date)}/{len(dates)} dates from {index.flows} flows "
+          f"in {time.process_time() - start:.2f}s CPU ({loaded - start:.2f}s loading the archives)")
+
+
+if __name__ == "__main__":
+    main()
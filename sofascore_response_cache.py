@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+
+"""Persistent on-disk cache of SofaScore API responses, keyed by API path.
+
+Data of finished matches never changes, so `/api/v1/event/{id}` and
+`/api/v1/event/{id}/pregame-form` of a finished event are kept forever.
+`scheduled-events` and `team/{id}/performance` change during a matchday and
+only live for a short TTL. When the cache grows past `max_bytes` the least
+recently used responses are evicted. Hits only update the recency in
+memory; it is written to SQLite with the next `put()`, in one batch.
+
+    cache = ResponseCache()
+    body = cache.get("/api/v1/event/13981715/pregame-form")
+    if body is None:
+        ...
+        cache.put("/api/v1/event/13981715/pregame-form", body)
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+import time
+
+from sofascore_common import json_loads, iter_scheduled_events, finished_event_ids
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CACHE_PATH = "sofascore_cache.sqlite3"
+
+# Time to live (seconds) of responses that can still change. None means forever.
+SCHEDULED_EVENTS_TTL = 10 * 60
+TEAM_PERFORMANCE_TTL = 60 * 60
+UNFINISHED_EVENT_TTL = 5 * 60
+DEFAULT_TTL = 60 * 60
+
+EVENT_PATH = re.compile(r"^/api/v1/event/(\d+)(/pregame-form)?$")
+
+# Cache hits whose access time is kept in memory at most before it is written out.
+ACCESS_BATCH = 1000
+
+
+class ResponseCache:
+    """SQLite-backed response cache with per-endpoint TTLs and size-based LRU eviction."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=512 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._accessed = {}  # path -> time of its last hit, not written yet
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        # A crash may lose the last responses, never corrupt the cache; no fsync on every put.
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                path TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+            CREATE TABLE IF NOT EXISTS finished_events (
+                event_id INTEGER PRIMARY KEY
+            );
+        """)
+        self._connection.commit()
+        # Bytes of all the cached bodies, kept up to date rather than summed on every put.
+        (self._total,) = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+
+    def get(self, api_path):
+        """Cached body (bytes) of `api_path`, or None when missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT body, expires_at FROM responses WHERE path = ?", (api_path,)
+            ).fetchone()
+
+            if row is None or (row[1] is not None and row[1] < now):
+                self.misses += 1
+                return None
+
+            self._accessed[api_path] = now
+            if len(self._accessed) >= ACCESS_BATCH:
+                self._write_accesses()
+                self._connection.commit()
+            self.hits += 1
+            return row[0]
+
+    def get_json(self, api_path):
+        body = self.get(api_path)
+        return None if body is None else json_loads(body)
+
+    def put(self, api_path, body, data=None, finished=None):
+        """Store the response body of `api_path`.
+
+        `finished` is the IDs of the finished events in the body, when the
+        caller already has them. Otherwise they are read from `data`, the
+        decoded JSON if already parsed, or from the body, decoded here.
+        """
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        if finished is None:
+            # Decoded before taking the lock, so a large payload doesn't hold up the other threads.
+            try:
+                if data is None and "/scheduled-events/" in api_path:
+                    # Only its events are needed, so the day's payload is streamed through.
+                    data = {"events": iter_scheduled_events(body)}
+                elif data is None:
+                    data = json_loads(body)
+                finished = finished_event_ids(data)
+            except ValueError:
+                return
+
+        now = time.time()
+        with self._lock:
+            self._remember_finished_events(finished)
+            ttl = self._ttl(api_path)
+            expires_at = None if ttl is None else now + ttl
+
+            self._write_accesses()
+            row = self._connection.execute("SELECT size FROM responses WHERE path = ?", (api_path,)).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (path, body, size, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (api_path, body, len(body), expires_at, now),
+            )
+            self._total += len(body) - (row[0] if row is not None else 0)
+            self._evict()
+            self._connection.commit()
+
+    def is_finished(self, event_id):
+        with self._lock:
+            return self._is_finished(event_id)
+
+    def stats(self):
+        with self._lock:
+            (entries,) = self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()
+            size = self._total
+        return {"entries": entries, "bytes": size, "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            self._write_accesses()
+            self._connection.commit()
+            self._connection.close()
+
+    def _write_accesses(self):
+        if self._accessed:
+            self._connection.executemany("UPDATE responses SET last_access = ? WHERE path = ?",
+                                         [(when, path) for path, when in self._accessed.items()])
+            self._accessed.clear()
+
+    def _is_finished(self, event_id):
+        return self._connection.execute(
+            "SELECT 1 FROM finished_events WHERE event_id = ?", (int(event_id),)
+        ).fetchone() is not None
+
+    def _ttl(self, api_path):
+        if "/scheduled-events/" in api_path:
+            return SCHEDULED_EVENTS_TTL
+        if api_path.startswith("/api/v1/team/") and api_path.endswith("/performance"):
+            return TEAM_PERFORMANCE_TTL
+
+        event_path = EVENT_PATH.match(api_path)
+        if event_path is not None:
+            return None if self._is_finished(event_path.group(1)) else UNFINISHED_EVENT_TTL
+
+        return DEFAULT_TTL
+
+    def _remember_finished_events(self, finished):
+        # Team histories and match payloads tell which events are over, which
+        # makes their pregame-form immutable.
+        if finished:
+            self._connection.executemany("INSERT OR IGNORE INTO finished_events (event_id) VALUES (?)",
+                                         [(event_id,) for event_id in finished])
+
+    def _evict(self):
+        if self._total <= self.max_bytes:
+            return
+
+        # Drop the least recently used responses until the cache fits again.
+        for path, size in self._connection.execute(
+            "SELECT path, size FROM responses ORDER BY last_access"
+        ).fetchall():
+            self._connection.execute("DELETE FROM responses WHERE path = ?", (path,))
+            self._total -= size
+            if self._total <= self.max_bytes:
+                break
+        logger.debug("🧹 Evicted cached responses down to %d bytes", self._total)
@@ -2,319 +2,466 @@
 
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
-from selenium.webdriver.chrome.options import Options
 
 from webdriver_manager.chrome import ChromeDriverManager
 
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
+from selenium.common.exceptions import TimeoutException
 
 
-from selenium.common.exceptions import WebDriverException
-
-import json
+import argparse
+import threading
 import time
 
-from datetime import datetime, timezone
-
-import pytz
-
 import logging
-import os
-import glob
-
-
 
-
-# Enables capturing network logs
-options = webdriver.ChromeOptions()
-options.set_capability(
-    'goog:loggingPrefs',{"performance":"ALL","browser":"ALL"}
+from sofascore_common import (
+    SOFASCORE_BASE_URL,
+    pregame_form_api,
+    team_performance_api,
+    select_scheduled_games,
+    parse_performance,
+    previous_records,
+    apply_ranks,
+    previous_game_url as build_previous_game_url,
+    json_loads,
+    add_date_arguments,
+    add_scraper_arguments,
+    scraper_dates_from_args,
+    ScraperStores,
+    setup_logging,
 )
+from sofascore_cdp_capture import CdpCapture
+from sofascore_worker_pool import BrowserWorkerPool
+from sofascore_fixture_memo import FixtureMemo
+from sofascore_records import Match
+from sofascore_metrics import metrics, add_metrics_arguments, exported_metrics
 
-# Disable GPU and Use Software Rendering
-options.add_argument("--disable-gpu")
-options.add_argument("--disable-software-rasterizer")  # Forces software rendering
-
-# Disable Unnecessary Chrome Features
-options.add_argument("--disable-extensions")
-options.add_argument("--disable-infobars")
-# options.add_argument("--no-sandbox")
-
-# The argument '--disable-dev-shm-usage' forces Chrome to use the /tmp directory.
-# This may slow down the execution though since disk will be used instead of memory:
-# options.add_argument("--disable-dev-shm-usage")
-
-options.add_argument("--disable-popup-blocking")  # Block pop-ups
-# options.add_argument("--auto-open-devtools-for-tabs") # Open DevTools by default
-
-# Load the Page in Headless Mode (Page is resource-heavy).
-#options.add_argument("--headless")
-
-
-options.add_experimental_option(
-    "prefs", {"profile.default_content_setting_values.notifications": 2}
-)
-
-options.add_experimental_option("excludeSwitches", ["enable-logging"])  # Optional to suppress warnings
-
-driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()),options=options)
-
-
-driver.set_page_load_timeout(60)
-
-driver.execute_cdp_cmd("Network.enable", {})
-
-tournament_games = []
 
-countries = ["England","Spain","Italy","Germany","France",
-             "Netherlands","Türkiye","Portugal","Belgium","Scotland"]
-
-
-club_leagues = ["Premier League","LaLiga","Serie A","Bundesliga","Ligue 1",
-                "Eredivisie","Super Lig","LaLiga 2","Championship","2.Bundesliga",
-                "Serie B","Ligue 2","Liga Portugal Betclic","First Division A","Premiership"]
-
-
-# Change this date as required.
-todays_date = "2025-04-21"
-
-
-
-# Configure logging
-
-## Check if a log file exists, otherwise create file
-## if one exists, create new file with number appended to filename.
-
-def get_new_log_filename(base_name="sofascore_script.log"):
-    """Check for existing log files and create a new one with an incremented number."""
-    if not os.path.exists(base_name):
-        return base_name  # No existing log, use default name
-
-    # Get all log files that match "app_*.log"
-    existing_logs = glob.glob("sofascore_script_*.log")
-
-    # Extract numbers and find the highest
-    numbers = [int(log.split("_")[-1].split(".")[0]) for log in existing_logs if log.split("_")[-1].split(".")[0].isdigit()]
-    new_number = max(numbers) + 1 if numbers else 1
-    return f"sofascore_script_{new_number}.log"
-
-# Determine the new log filename
-log_filename = get_new_log_filename()
-
-
-## Create a logger
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-
-## Set format
-formatter = logging.Formatter(
-    "{asctime} - {levelname} - {message}",
-    style="{",
-    datefmt="%Y-%m-%d %H:%M",
-)
-
-## Create file handler
-### Append instead of overwrite
-main_file_handler = logging.FileHandler(log_filename, mode="a", encoding="utf-8")
-main_file_handler.setLevel(logging.DEBUG)
-main_file_handler.setFormatter(formatter)
-logger.addHandler(main_file_handler)
-
 
-## Create console handler
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.WARNING)
-console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
 
-logger.info("Started!😄🙌😃 ")
-
-# Open the webpage
-
-main_webpage = f"https://www.sofascore.com/football/{todays_date}"
-logger.info(f"▶️   Visiting: {main_webpage}")
-
-
-try:
-    driver.get(main_webpage)
-    logger.info(f"🗿 Visiting the home page URL: {main_webpage}.")
-    logger.info("**************************************************************************************\n")
-except Exception as err:
-    logger.exception(f"😭 Failure visiting home page URL {err}.\n")
-
-
-driver.execute_script("window.scrollTo(0,document.body.scrollHeight);")
-# Extract Network Logs
-log_entries = driver.get_log("performance")
-
-# Process logs to extract API JSON responses:
-
-scheduled_date_api = "/api/v1/sport/football/scheduled-events/" + todays_date
-
-logs = [json.loads(log["message"])["message"] for log in log_entries]
-for log in logs:
-    api_path = log["params"].get('headers',{}).get(':path','')
-    if scheduled_date_api == api_path:
-        logger.info(f"Match {api_path} == {scheduled_date_api}")
-        break
-try:
-    events = json.loads(driver.execute_cdp_cmd('Network.getResponseBody',{'requestId': log['params']['requestId']})['body'])
-except Exception as err:
-    logger.exception("😭 Failed to load JSON from API URL {scheduled_date_api}.\n")
-
-# Need to make sure the UNIX timestamps for the games is matching the date specified by 'todays_date'
-def convert_unix_to_time(unix_timestamp):
-    # Convert UNIX timestamp to timezone="Africa/Nairobi"
-    date_utc = datetime.fromtimestamp(unix_timestamp, tz=timezone.utc)
-    target_timezone = pytz.timezone("Africa/Nairobi")
-    local_time = date_utc.astimezone(target_timezone)
-    local_time = local_time.isoformat()
+# Longest time to wait for an API response after opening a page (seconds).
+RESPONSE_TIMEOUT = 15
+
+
+# "Lean capture" profile: everything the scraper doesn't need is dropped before
+# it is requested. Only the /api/v1/... XHRs (and the SPA's own scripts) load.
+LEAN_BLOCKED_URLS = [
+    # Images, team logos & player photos
+    "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*",
+    "*img.sofascore.com*", "*/image", "*/image/*",
+    # Fonts
+    "*.woff*", "*.ttf*", "*.otf*", "*.eot*",
+    # Media
+    "*.mp4*", "*.webm*", "*.mp3*", "*.m3u8*",
+    # Ads, analytics & other third-party trackers
+    "*googletagmanager.com*", "*google-analytics.com*", "*analytics.google.com*",
+    "*doubleclick.net*", "*googlesyndication.com*", "*googleadservices.com*", "*adservice.google.*",
+    "*amazon-adsystem.com*", "*facebook.net*", "*facebook.com/tr*", "*scorecardresearch.com*",
+    "*hotjar.com*", "*criteo.*", "*taboola.com*", "*outbrain.com*", "*adnxs.com*",
+    "*pubmatic.com*", "*rubiconproject.com*", "*quantserve.com*", "*sentry.io*",
+    "*onetrust.com*", "*cookielaw.org*",
+]
+
+LEAN_CHROME_ARGUMENTS = [
+    "--blink-settings=imagesEnabled=false",
+    "--mute-audio",
+    "--no-first-run",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--metrics-recording-only",
+]
+
+
+def create_chrome_options(headless=False, lean=False):
+    options = webdriver.ChromeOptions()
+    options.set_capability(
+        'goog:loggingPrefs',{"browser":"ALL"}
+    )
+
+    # Disable GPU and Use Software Rendering
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-software-rasterizer")  # Forces software rendering
+
+    # Disable Unnecessary Chrome Features
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-infobars")
+    # options.add_argument("--no-sandbox")
+
+    # The argument '--disable-dev-shm-usage' forces Chrome to use the /tmp directory.
+    # This may slow down the execution though since disk will be used instead of memory:
+    # options.add_argument("--disable-dev-shm-usage")
+
+    options.add_argument("--disable-popup-blocking")  # Block pop-ups
+    # options.add_argument("--auto-open-devtools-for-tabs") # Open DevTools by default
+
+    # Load the Page in Headless Mode (Page is resource-heavy).
+    if headless or lean:
+        options.add_argument("--headless=new")
+
+    if lean:
+        for argument in LEAN_CHROME_ARGUMENTS:
+            options.add_argument(argument)
+
+
+    options.add_experimental_option(
+        "prefs", {"profile.default_content_setting_values.notifications": 2}
+    )
+
+    options.add_experimental_option("excludeSwitches", ["enable-logging"])  # Optional to suppress warnings
+
+    # Navigations return once the DOM is ready, not after every image and script has loaded:
+    # the API responses are awaited on the CDP capture instead.
+    options.page_load_strategy = "eager"
+    return options
+
+
+class ChromeBrowser:
+    """A Chrome instance with `tabs` tabs, driven from several threads one WebDriver command at a time."""
+
+    def __init__(self, headless=False, lean=False, tabs=1):
+        """`lean` runs headless and blocks images, media, fonts and trackers (LEAN_BLOCKED_URLS)."""
+        self.lean = lean
+        self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()),
+                                       options=create_chrome_options(headless, lean))
+        self.driver.set_page_load_timeout(60)
+
+        # With several tabs a page is only started, so that the other tabs can go on meanwhile.
+        self.pipelined = tabs > 1
+
+        self.handles = [self.driver.current_window_handle]
+        for _ in range(tabs - 1):
+            self.driver.switch_to.new_window('tab')
+            self.handles.append(self.driver.current_window_handle)
+
+        self._lock = threading.Lock()
+        self._current_handle = self.handles[-1]
+        self._open_tabs = len(self.handles)
+
+    def run(self, handle, command):
+        """Return `command(driver)`, run with the tab `handle` selected."""
+        with self._lock:
+            if self._current_handle != handle:
+                self.driver.switch_to.window(handle)
+                self._current_handle = handle
+            return command(self.driver)
+
+    def release(self):
+        """Called by every tab as it quits; Chrome quits with its last tab."""
+        with self._lock:
+            self._open_tabs -= 1
+            if self._open_tabs == 0:
+                self.driver.quit()
+
+    def quit(self):
+        """Quit Chrome whatever its tabs are doing, e.g. when they couldn't all be set up."""
+        with self._lock:
+            self._open_tabs = 0
+            self.driver.quit()
+
+
+class BrowserSession:
+    """One tab of a ChromeBrowser together with the CDP capture of its API responses."""
+
+    def __init__(self, browser, handle, cache=None, base_url=SOFASCORE_BASE_URL, archive=None):
+        """`base_url` is the site whose pages are opened, e.g. a local replay server.
+
+        Every API response, including the ones taken from the cache, is
+        recorded in `archive` (a FlowArchive) if given.
+        """
+        self.browser = browser
+        self.handle = handle
+        self.cache = cache
+        self.base_url = base_url
+        self.archive = archive
+
+        def start_capture(driver):
+            # Both only apply to the selected tab.
+            if browser.lean:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
+            return CdpCapture(driver, cache=cache, archive=archive).start()
+
+        # Captures the API responses (by path) as the tab receives them.
+        self.capture = browser.run(handle, start_capture)
+
+    def is_alive(self):
+        try:
+            self.browser.run(self.handle, lambda driver: driver.window_handles)
+            return True
+        except Exception:
+            return False
+
+    def quit(self):
+        self.capture.stop()
+        self.browser.release()
+
+    def close_popups(self):
+        """Close the cookie/'Add to Favourites' popups if they are shown."""
+        def close(driver):
+            for button_class in ('Button pBEmc', 'Button gTStrj'):
+                try:
+                    driver.find_element(By.XPATH, f"//button[contains(@class, '{button_class}')]").click()
+                    logger.info("Popup (%s) was closed.\n", button_class)
+                except Exception:
+                    pass
+
+        with metrics.span("popup_dismissal"):
+            self.browser.run(self.handle, close)
+
+    def open_page_and_wait(self, url, api_path, timeout=RESPONSE_TIMEOUT, parse=json_loads):
+        """Open `url` and return the JSON of `api_path` as soon as the page has received it."""
+        return self.open_page_and_wait_all(url, [api_path], timeout, parse)[0]
+
+    def open_page_and_wait_all(self, url, api_paths, timeout=RESPONSE_TIMEOUT, parse=json_loads):
+        """Return the JSON of every API path in `api_paths`, opening `url` only for cache misses.
+
+        The wait for the responses starts once the page's DOM is ready (or
+        right away with several tabs), and a page that doesn't finish loading
+        within the page-load timeout is still waited on. The page is reloaded
+        once if the responses haven't all arrived within `timeout`, so
+        `2 * timeout` is the worst case after navigating. `parse(body)`
+        replaces the plain JSON decoding, e.g. to filter a large payload as it
+        is decoded.
+        """
+        results = self._from_cache(api_paths, parse)
+
+        for attempt in range(2):
+            missing = [api_path for api_path in api_paths if api_path not in results]
+            if not missing:
+                break
 
-    # Format time in 24-hour format (HH:MM:SS)
-    date = local_time.split("T")[0]
-    time = (local_time.split("T")[1]).split("+")[0]
-    return (date, time)
+            if attempt == 1:
+                logger.warning("⏳ No response from %s after %ss, reloading %s", missing, timeout, url)
 
+            def load(driver):
+                try:
+                    if attempt == 0:
+                        driver.get(url)
+                    else:
+                        driver.refresh()
+                except TimeoutException:
+                    # The API responses may well have arrived already; the capture decides below.
+                    logger.warning("⏳ %s is still loading, waiting for its API responses anyway", url)
+                # Lazy-loaded sections of the SPA only request their data once scrolled into view.
+                driver.execute_script("window.scrollTo(0,document.body.scrollHeight);")
 
-for scheduled_games in events['events']:
-    tournament_game = dict()
-    league_name = scheduled_games["tournament"]["name"]
-    logger.info(f"League Name: {league_name}")
+            with metrics.span("navigation"):
+                if self.browser.pipelined:
+                    # Returns as soon as the navigation (or the reload) has started, so the browser is
+                    # only held briefly; the responses are awaited below, while the other tabs are driven.
+                    script = "window.location.assign(arguments[0]);" if attempt == 0 else "window.location.reload();"
+                    self.browser.run(self.handle, lambda driver: driver.execute_script(script, url))
+                else:
+                    self.browser.run(self.handle, load)
+
+            deadline = time.monotonic() + timeout
+            try:
+                for api_path in missing:
+                    with metrics.span("response_wait"):
+                        body = self.capture.wait_for(api_path, max(0, deadline - time.monotonic()))
+                    with metrics.span("json_parse"):
+                        results[api_path] = parse(body)
+            except TimeoutError:
+                if attempt == 1:
+                    raise
+
+        return [results[api_path] for api_path in api_paths]
+
+    def fetch_all(self, api_paths, timeout=RESPONSE_TIMEOUT, parse=json_loads):
+        """Request every API path at once from the current page; returns {api_path: JSON} of the ones that arrived.
+
+        The requests go out together through the page's own `fetch()`, with its
+        cookies and headers, and are picked up by the CDP capture like the
+        SPA's. Paths missing from the result (timeout or error) are left to
+        the caller, e.g. to open their page instead.
+        """
+        results = self._from_cache(api_paths, parse)
+        missing = [api_path for api_path in api_paths if api_path not in results]
+        if not missing:
+            return results
+
+        def request(driver):
+            # Relative requests need a page of the site, e.g. when every page so far came from the cache.
+            if not driver.current_url.startswith(self.base_url):
+                with metrics.span("navigation"):
+                    try:
+                        driver.get(self.base_url + "/")
+                    except TimeoutException:
+                        logger.warning("⏳ %s/ is still loading, requesting the API paths anyway", self.base_url)
+            driver.execute_script(
+                "for (const path of arguments[0]) fetch(path, {credentials: 'include'}).catch(() => {});",
+                missing)
+
+        for api_path in missing:
+            self.capture.forget(api_path)
+        self.browser.run(self.handle, request)
+
+        deadline = time.monotonic() + timeout
+        for api_path in missing:
+            try:
+                with metrics.span("response_wait"):
+                    body = self.capture.wait_for(api_path, max(0, deadline - time.monotonic()))
+            except TimeoutError:
+                logger.warning("⏳ No response from %s after %ss", api_path, timeout)
+                continue
+            with metrics.span("json_parse"):
+                results[api_path] = parse(body)
+        return results
+
+    def _from_cache(self, api_paths, parse=json_loads):
+        """{api_path: JSON} of the API paths found in the response cache."""
+        results = {}
+        if self.cache is not None:
+            for api_path in api_paths:
+                body = self.cache.get(api_path)
+                if body is not None:
+                    with metrics.span("json_parse"):
+                        results[api_path] = parse(body)
+                    if self.archive is not None:
+                        self.archive.write(self.base_url + api_path, 200, {"x-from-cache": "1"}, body)
+        return results
+
+
+def quit_session(session):
     try:
-        category = scheduled_games["tournament"]["category"]
-        country = category["country"]["name"]
-        logger.info(f"Country: {country}")
-    except KeyError:
-        logger.error("Key not found -> category['country']['name']")
-        continue
-    except Exception as e:
-        logger.error(f"Tournament is likely irrelevant. Check error:\n{e}",
-                     exc_info=True )
-
-
-    date_value, time_value = convert_unix_to_time(scheduled_games["startTimestamp"])
-    printed_datetime = f"{date_value}\t{time_value}"
-
-    if country in countries and league_name in club_leagues and date_value == todays_date:
-        tournament_game['League'] = league_name
-
-        tournament_game['Custom ID'] = scheduled_games['customId']
-        tournament_game['Home Team'] = scheduled_games["homeTeam"]['name']
-        tournament_game['Away Team'] = scheduled_games["awayTeam"]['name']
-        tournament_game['ID'] = scheduled_games['id']
-        tournament_game['MatchUp'] = scheduled_games["slug"]
-    if len(tournament_game) != 0:
-        tournament_games.append(tournament_game)
-
-logger.info(f"\nTournament Games: {tournament_games}\n")
-
+        session.quit()
+    except Exception:
+        pass
+
+
+class ChromeTabs:
+    """Hands out the tabs of Chrome instances as BrowserSessions, for the workers of a BrowserWorkerPool.
+
+    A new Chrome with `tabs` tabs is started when no tab is free. With one
+    tab per Chrome every worker owns its own browser.
+    """
+
+    def __init__(self, tabs=1, headless=False, lean=False, cache=None, base_url=SOFASCORE_BASE_URL, archive=None):
+        self.tabs = max(1, tabs)
+        self.headless = headless
+        self.lean = lean
+        self.cache = cache
+        self.base_url = base_url
+        self.archive = archive
+
+        self._free = []
+        self._starting = 0  # Chrome instances being started
+        self._condition = threading.Condition()
+
+    def create_session(self):
+        with self._condition:
+            while True:
+                while self._free:
+                    session = self._free.pop()
+                    if session.is_alive():
+                        return session
+                    # Its Chrome crashed before the tab was used.
+                    quit_session(session)
+
+                if self.tabs == 1 or not self._starting:
+                    break
+                # The tabs of the Chrome being started will be free in a moment.
+                self._condition.wait()
+            self._starting += 1
+
+        sessions = []
+        try:
+            browser = ChromeBrowser(self.headless, self.lean, self.tabs)
+            try:
+                for handle in browser.handles:
+                    sessions.append(BrowserSession(browser, handle, self.cache, self.base_url, self.archive))
+            except BaseException:
+                # E.g. the CDP capture of a tab didn't start: don't leave this Chrome running.
+                for session in sessions:
+                    session.capture.stop()
+                sessions = []
+                browser.quit()
+                raise
+        finally:
+            with self._condition:
+                self._starting -= 1
+                self._free.extend(sessions[1:])
+                self._condition.notify_all()
+        return sessions[0]
+
+    def close(self):
+        """Quit the tabs that were never handed out."""
+        with self._condition:
+            sessions, self._free = self._free, []
+        for session in sessions:
+            quit_session(session)
+
+
+def scrape_tournament_games(session, todays_date):
+    """Open the matchday page and build `tournament_games` from its scheduled-events."""
+    # Open the webpage
+
+    main_webpage = f"{session.base_url}/football/{todays_date}"
+    logger.info("▶️   Visiting: %s", main_webpage)
+
+    # Process the captured API JSON responses:
+
+    scheduled_date_api = "/api/v1/sport/football/scheduled-events/" + todays_date
 
+    try:
+        # The day's events are filtered as they are decoded; only the selected ones are kept.
+        tournament_games = session.open_page_and_wait(
+            main_webpage, scheduled_date_api, parse=lambda body: select_scheduled_games(body, todays_date))
+        logger.info("🗿 Visiting the home page URL: %s.", main_webpage)
+        logger.info("**************************************************************************************\n")
+    except Exception as err:
+        logger.exception("😭 Failed to load JSON from API URL %s.\n", scheduled_date_api)
+        raise
 
-redirect_base_url = "https://www.sofascore.com/football/match/"
+    logger.info("\nTournament Games (%d): %s\n", len(tournament_games),
+                ", ".join(match['MatchUp'] for match in tournament_games))
+    return tournament_games
 
-# Initialize a counter for the array storing the game details/attrs above so as to append new attrs
-counter = 0
 
+def scrape_match(session, match, fixture_memo=None, standings=None, team_histories=None):
+    """Add the team ranks and both teams' previous records to one tournament game.
 
-# Iterate through the array above using the attrs to go through the individual web pages for the match-ups.
-## TODO: Needs to be efficient somehow.
+    Previous fixtures already resolved (for another match or by an earlier run)
+    are taken from `fixture_memo` instead of opening their page again. With
+    `standings` (a StandingsResolver) the other ones are ranked from their
+    league standings, and only looked up one by one when that fails. Team
+    histories already prefetched for the matchday are taken from
+    `team_histories` ({team ID: HistoricFixtures}).
+    """
+    if fixture_memo is None:
+        fixture_memo = FixtureMemo(path=None)
 
-for match in tournament_games:
     match_ID = match['ID']
 
-    redirect_url = f"{redirect_base_url}{match['MatchUp']}/{match['Custom ID']}#id:{match_ID}"
-
-    try:
-
-        driver.get(redirect_url)
-        logger.info(f"\tRedirecting to the Standings Web page (for the upcoming match):=> \n📌\t{redirect_url}\n")
-        logger.info("************************************************************************************\n")
+    # Responses of the previous match are no longer needed.
+    session.capture.clear()
 
-    except Exception as err:
-        logger.exception(f"😫 Could not redirect to URL: {redirect_url}. \tError {err}\n")
-
-    try:
-        close_button = driver.find_element(By.XPATH, "//button[contains(@class, 'Button pBEmc')]")
-        close_button.click()
-        logger.info("Popup was closed.\n")
-
-    except Exception as err:
-        logger.error(f"Popup not present or popup didn't close.\nSee Error: {err}\n\n")
+    redirect_url = f"{session.base_url}/football/match/{match['MatchUp']}/{match['Custom ID']}#id:{match_ID}"
 
     # Filter and Extract JSON Responses from Multiple Endpoints
 
     # API URL for standings
     standings_url = f"/api/v1/event/{match_ID}/pregame-form"
-
-    driver.find_element("tag name", "body").send_keys(Keys.CONTROL, "r")
-    driver.execute_script("window.scrollTo(0,document.body.scrollHeight);")
-    time.sleep(1)
-    driver.execute_script("window.scrollTo(0, 0);")
-    time.sleep(1)
-
-
-    # Get all Performance Logs
-    log_entries_rankings_raw = driver.get_log("performance")
-
-    # Filter and Extract JSON Responses from Multiple Endpoints
-    logs_standings = [json.loads(log_er_raw['message'])['message'] for log_er_raw in log_entries_rankings_raw]
-    for log in logs_standings:
-        api_path = log['params'].get('headers',{}).get(':path','')
-        if standings_url == api_path:
-            logger.debug(f"📍✅   Match {standings_url}  :----->  {api_path}\n")
-            break
-        else:
-            logger.debug(f"❌ No Match -> API URL: {standings_url};\t{api_path}")
-
-    try:
-        pregame_rank_json = json.loads(driver.execute_cdp_cmd('Network.getResponseBody',{'requestId': log['params']['requestId']})['body'])
-    except Exception as error:
-        logger.exception(f"⚠️  Could not retrieve response: {error}")
-
-    tournament_games[counter]["Home Team Rank"] = pregame_rank_json["homeTeam"]["position"]
-    tournament_games[counter]["Away Team Rank"] = pregame_rank_json["awayTeam"]["position"]
-
-    driver.refresh()
-    driver.execute_script("window.scrollTo(0,document.body.scrollHeight);")
-    time.sleep(1)
-    driver.execute_script("window.scrollTo(0, 0);")
-
+    api_base_url_team_info = f"/api/v1/event/{match_ID}"
 
     try:
-        close_button = driver.find_element(By.XPATH, "//button[contains(@class, 'Button pBEmc')]")
-        close_button.click()
-        logger.info("Popup closed.")
-
+        # The match page loads both endpoints.
+        pregame_rank_json, team_info_json = session.open_page_and_wait_all(
+            redirect_url, [standings_url, api_base_url_team_info])
+        logger.info("\tRedirecting to the Standings Web page (for the upcoming match):=> \n📌\t%s\n", redirect_url)
+        logger.info("************************************************************************************\n")
     except Exception as err:
-        logger.error(f"Popup not present or popup didn't close. See Error: {err}\n")
-
-    time.sleep(3)
-
-    driver.find_element("tag name", "body").send_keys(Keys.CONTROL, "r")
-    driver.execute_script("window.scrollTo(0,document.body.scrollHeight);")
-    time.sleep(2)
-    driver.execute_script("window.scrollTo(0, 0);")
-
-    api_base_url_team_info = f"/api/v1/event/{match_ID}"
+        logger.exception("😫 Could not retrieve the match data from URL: %s. \tError %s\n", redirect_url, err)
+        return match
 
-    log_entries_team_info_raw = driver.get_log("performance")
+    session.close_popups()
 
-    logs_team_info = [json.loads(log_eti_raw['message'])['message'] for log_eti_raw in log_entries_team_info_raw]
-
-    for log in logs_team_info:
-        api_path = log['params'].get('headers',{}).get(':path','')
-        if api_base_url_team_info == api_path:
-            logger.debug(f"📍✅   Match {api_base_url_team_info}:----> {api_path}\n")
-            break
-        else:
-            logger.debug(f"❌ No match with API URL: {api_base_url_team_info};\t{api_path}")
-
-    try:
-        team_info_json = json.loads(driver.execute_cdp_cmd('Network.getResponseBody',{'requestId': log['params']['requestId']})['body'])
-    except Exception as e:
-        logger.exception(f"⚠️  Could not retrieve response from URL {api_base_url_team_info}.\nError: {e}\n")
+    match["Home Team Rank"] = pregame_rank_json["homeTeam"]["position"]
+    match["Away Team Rank"] = pregame_rank_json["awayTeam"]["position"]
 
 
     team_names = []
@@ -326,13 +473,13 @@ for match in tournament_games:
 
 
     logger.debug("Standings:")
-    logger.debug(f"{tournament_games[counter]}")
+    logger.debug("%s", match)
     logger.debug("\nTeam Info:")
-    logger.debug(f"Team Names: {team_names}; Team IDs{team_ids}\n")
+    logger.debug("Team Names: %s; Team IDs%s\n", team_names, team_ids)
 
     # Home & Away Team Web pages:
 
-    team_base_url = "https://www.sofascore.com/team/football/"
+    team_base_url = session.base_url + "/team/football/"
 
     home_team_redirect_url = team_base_url + team_names[0] + "/" + str(team_ids[0]) + "#tab:matches"
     away_team_redirect_url = team_base_url + team_names[1] + "/" + str(team_ids[1]) + "#tab:matches"
@@ -343,8 +490,6 @@ for match in tournament_games:
     # Maybe ensure there are at least 4 (previous) home matches for the home team &
     # 4 (previous) matches for away team.
 
-    # The JSON output has the latest matchups at the bottom and the oldest at the top
-
     # Retrieve the following info from the matchups:
     # 1. Is team Home / Away?
     # 2. Score:
@@ -354,321 +499,241 @@ for match in tournament_games:
     # 4. Team Standing
     # 5. Opponent Standing
 
-    ## Home Team:
-
-    try:
-        driver.get(home_team_redirect_url)
-        logger.info(f"📶🛜 Redirecting to the Web page of Home Team: {home_team_redirect_url}")
-        logger.info("********************************************************************************\n\n")
-
-    except Exception as err:
-        logger.error(f"😫 Failure redirecting to {home_team_redirect_url}."
-                     f"\nError:\t{err}\n", exc_info=True)
-
-    driver.refresh()
-    time.sleep(1)
-    driver.find_element("tag name", "body").send_keys(Keys.CONTROL, "r")
-    time.sleep(1)
-
-    try:
-        close_button = driver.find_element(By.XPATH, "//button[contains(@class, 'Button pBEmc')]")
-        close_button.click()
-        logger.info("Popup was closed.\n")
-
-    except Exception as err:
-        logger.error(f"Popup not present or popup didn't close."
-                     f"\nSee Error: {err}\n\n", exc_info=True)
-
-    time.sleep(1)
-
-    try:
-        close_button = driver.find_element(By.XPATH, "//button[contains(@class, 'Button gTStrj')]")
-        close_button.click()
-        logger.info("'Add to Favourites' popup was closed.\n")
-
-    except Exception as err:
-        logger.error(f"'Add to Favourites' popup isn't present or the popup didn't close."
-                     f"\nSee Error: {err}\n\n", exc_info=True)
-
-    time.sleep(1)
-    home_team_performance_api_url = f"/api/v1/team/{team_ids[0]}/performance"
-
-    driver.find_element("tag name", "body").send_keys(Keys.CONTROL, "r")
-    driver.execute_script("window.scrollTo(0,document.body.scrollHeight);")
-    time.sleep(2)
-    driver.execute_script("window.scrollTo(0, 0);")
-    time.sleep(2)
-
-    log_entries_home_team = driver.get_log("performance")
-    count=0
-    for log_entry_ht in log_entries_home_team:
-        try:
-            logs = json.loads(log_entry_ht["message"])["message"]
-#            if (
-#                logs["method"] == "Network.responseReceived"
-#                or logs["method"] == "Network.requestWillBeSent"
-#                or logs["method"] == "Network.requestWillBeSentExtraInfo"
-#            ):
+    ## Home & Away Teams:
 
-            api_path = logs["params"].get('headers',{}).get(':path','')
-
-            if api_path != '' and count <= 3:
-                logger.debug(f"See example logs: {logs}")
-            else:
-                pass
-            count+=1
-
-            request_id = logs["params"]["requestId"]
-
-            if home_team_performance_api_url == api_path:
-                logger.debug(f"📍✅   Match {home_team_performance_api_url}"
-                             f"===> {api_path}\n\n")
-
-                logger.debug(f"The matching logs body == {logs}\n\n")
-                # Get the response body using the matched request ID
-                try:
-                    perf_res_body = driver.execute_cdp_cmd('Network.getResponseBody',{"requestId": request_id})
-                    print("BODY:", perf_res_body["body"])
-                except WebDriverException as err:
-                    logger.error(f"😫 Response.body is null."
-                                 f"\nSee error:\n{err}", exc_info=True)
-
-                except Exception as e:
-                    logger.error(f" ❌‼️  Error encountered while attempting to retrieve"
-                                 f" and parse JSON from the API URL endpoint "
-                                 f"{home_team_performance_api_url}.\n"
-                                 f"\nSee error:\n{e}", exc_info=True)
-                break
-
-            else:
-                logger.debug(f"❌‼️  No match with API URL:"
-                             f"{home_team_performance_api_url}\t!= {api_path}")
-
-        except Exception as e:
-            logger.error(f"❌‼️  Unexpected Error encountered."
-                         f" See Error below:\n{e}", exc_info=True)
-
-
-#    logs = [json.loads(log_entry_ht["message"])["message"] for log_entry_ht in log_entries_home_team]
-#
-#    for log in logs:
-#        api_path = log["params"].get('headers',{}).get(':path','')
-#        if home_team_performance_api_url == api_path:
-#            logger.debug(f"📍✅   Match {home_team_performance_api_url} === {api_path}\n")
-#            break
-#        else:
-#            logger.debug(f"❌ No match with API URL:"
-#                         f"{home_team_performance_api_url}\t!= {api_path}")
-#
-
-    # The JSON output list needs to be reversed as the bottom values are the most recent matchups
-    # Reverse in-place
-
-#    try:
-#        perf_res_body = driver.execute_cdp_cmd('Network.getResponseBody',{'requestId': log["params"]["requestId"]})
-#        log['body'] = perf_res_body
-#
-#    except WebDriverException as err:
-#        logger.error("😫 Response.body is null."
-#                     f"\nSee error:\n{err}", exc_info=True)
-#    except Exception as e:
-#        logger.error("😫 Failed to get JSON output from API"
-#                    f" {home_team_performance_api_url}."
-#                    f" See error:\n{e}", exc_info=True)
-#
-
-
-    ht_prev_matches_json = json.loads(perf_res_body)
-    ht_prev_matches_json = ht_prev_matches_json['events']
-    ht_prev_matches_json.reverse()
+    # The histories come from the prefetch, else both are requested at once from the
+    # match page; a team page is only opened for a history that didn't arrive either way.
+    teams = (('Home', match['Home Team'], team_performance_api(team_ids[0]), home_team_redirect_url),
+             ('Away', match['Away Team'], team_performance_api(team_ids[1]), away_team_redirect_url))
+    performance = {team_performance_api(team_id): team_histories[team_id]
+                   for team_id in team_ids if team_histories and team_id in team_histories}
+    missing = [performance_api_url for _, _, performance_api_url, _ in teams if performance_api_url not in performance]
+    if missing:
+        performance.update(session.fetch_all(missing, parse=parse_performance))
 
     ## The previous matches will be stored in arrays/lists of dictionaries, one array/list per home or away team - 2 arrays in total.
 
     ## [{'A/H': '<>', 'Result': '<W/D/L>', 'Scored': <num>, 'Conceded': <num>, 'Team Ranking': <num>, 'Opponent Rank': <num>}]
 
-    prev_records_home_team_total = []
-
-    # Going to use this URL to get the ranking from the pregame_form API URL endpoint.
-    previous_game_base_url = "https://www.sofascore.com/football/match/"
-    home_games_counter = 0
-
-    for record in ht_prev_matches_json:
-        # Only last four Home matches are required to be tracked:
-        logger.debug(f"Counter: {home_games_counter}\n")
-
-        individual_prev_home_team_record = {
-            'A/H': None,
-            'Result': None,
-            'Scored': None,
-            'Conceded': None,
-            "Team Ranking": None,
-            "Opponent Rank": None
-        }
-
-        if home_games_counter == 1:
-            logger.debug(f"Record Output:\n%s", json.dumps(record, indent=3))
-
-        if home_games_counter == 4:
-            break
-
-        if match['League'] != record['tournament']['name']:
-            continue
-        elif match['League'] == record['tournament']['name']:
-
-            if match["Home Team"] == record['homeTeam']['name']:
-
-                logger.debug(f"{match['Home Team']} was playing at home "
-                      f"{record['homeTeam']['name']} against"
-                      f" {record['awayTeam']['name']}. League =>"
-                      f" {match['League']} matches {record['tournament']['name']}."
-                     )
-
-                home_games_counter += 1
-
-                individual_prev_home_team_record["A/H"] = 'Home'
-
-                if record["winnerCode"] == 1:
-                    individual_prev_home_team_record['Result'] = 'Win'
-                elif record["winnerCode"] == 3:
-                    individual_prev_home_team_record['Result'] = 'Draw'
-                elif record["winnerCode"] == 2:
-                    individual_prev_home_team_record['Result'] = 'Loss'
+    selected_by_team = {}
+    for venue, team_name, performance_api_url, team_redirect_url in teams:
+        prev_matches = performance.get(performance_api_url)
+        if prev_matches is None:
+            try:
+                prev_matches = session.open_page_and_wait(team_redirect_url, performance_api_url,
+                                                          parse=parse_performance)
+                logger.info("📶🛜 Redirecting to the Web page of %s Team: %s", venue, team_redirect_url)
+                logger.info("********************************************************************************\n\n")
+            except Exception as e:
+                logger.error(" ❌‼️  Error encountered while attempting to retrieve"
+                             " and parse JSON from the API URL endpoint "
+                             "%s.\n"
+                             "\nSee error:\n%s", performance_api_url, e, exc_info=True)
+                continue
+
+        # Only last four Home (Away) matches of the home (away) team are required to be tracked:
+        with metrics.span("history_traversal"):
+            selected_by_team[venue] = previous_records(team_name, match['League'], prev_matches, venue,
+                                                       match.get('Tournament ID'))
+
+    unresolved = [record for selected in selected_by_team.values() for record, _ in selected
+                  if fixture_memo.get(record.event_id) is None]
+
+    # One standings request per league of the histories, not seen yet in this run.
+    if standings is not None and unresolved:
+        try:
+            standings.load_seasons(unresolved, session.fetch_all)
+        except Exception as err:
+            logger.error("😫 Could not load the standings, using the pregame-forms. Error: %s\n", err)
+        unresolved = [record for record in unresolved if standings.positions(record) is None]
 
-                individual_prev_home_team_record['Scored'] = record['homeScore']['current']
-                individual_prev_home_team_record['Conceded'] = record['awayScore']['current']
+    # The pregame-forms of both teams' previous fixtures not resolved yet, requested at once too.
+    unresolved_ids = {record.event_id for record in unresolved}
+    pregame_forms = session.fetch_all([pregame_form_api(event_id) for event_id in unresolved_ids]) if unresolved_ids else {}
 
-                previous_game_url = (previous_game_base_url + record['slug'] + '/' +
-                str(record["customId"]) + "#id:" + str(record["id"]) + ",tab:standings")
+    for venue, team_name, _, _ in teams:
+        if venue in selected_by_team:
+            match[f"{venue} Team History"] = team_history(session, match['League'], team_name,
+                                                          selected_by_team[venue], pregame_forms, fixture_memo,
+                                                          standings)
+    return match
 
-                try:
-                    driver.get(previous_game_url)
-                    logger.info(f"🎯 Accessing URL: {previous_game_url}")
-                    logger.info("******************************************************************\n")
-                except Exception as err:
-                    logger.error(f"😫 Failed getting rankings for a previous matchup.\n",
-                                exc_info=True)
 
-                time.sleep(3)
-                driver.refresh()
-                time.sleep(1)
+def team_history(session, league, team_name, selected, pregame_forms, fixture_memo, standings=None):
+    """Fill the ranks of a team's selected previous records from the fixture memo, `standings` or `pregame_forms`.
 
-                try:
-                    close_button = driver.find_element(By.XPATH, "//button[contains(@class, 'Button pBEmc')]")
-                    close_button.click()
-                    logger.info("Popup closed.\n")
-                except Exception as err:
-                    logger.error(f"Popup not present or popup didn't close."
-                                 f"\nSee Error: {err}", exc_info=True)
-
-                driver.find_element("tag name", "body").send_keys(Keys.CONTROL, "r")
-                driver.execute_script("window.scrollTo(0,document.body.scrollHeight);")
-                time.sleep(2)
-                driver.execute_script("window.scrollTo(0, 0);")
-                time.sleep(2)
+    The page of a previous fixture is only opened when its ranks are in none of them.
+    """
+    prev_records_team_total = []
 
-                log_entries = driver.get_log("performance")
+    for record, individual_prev_team_record in selected:
+        logger.debug("%s was playing %s: %s against %s. League => %s matches %s.", team_name,
+                     individual_prev_team_record['A/H'], record.home.name, record.away.name, league, record.league)
 
-                prev_game_pregame_form_api_url = f"/api/v1/event/{record['id']}/pregame-form"
+        # Going to use this URL to get the ranking from the pregame_form API URL endpoint.
+        previous_game_url = build_previous_game_url(record, session.base_url)
+        prev_game_pregame_form_api_url = pregame_form_api(record.event_id)
 
-                for log in logs:
-                    api_path = log["params"].get('headers',{}).get(':path','')
-                    if prev_game_pregame_form_api_url == api_path:
-                        logger.debug(f"📍✅   Match {prev_game_pregame_form_api_url}:---> {api_path}\n")
-                        break
-                    else:
-                        logger.debug(f"❌ No match with API URL: {prev_game_pregame_form_api_url};\t{api_path}")
-
-
-                try:
-                    prev_matchup_event_json = json.loads(driver.execute_cdp_cmd('Network.getResponseBody',{'requestId': log['params']['requestId']})['body'])
-                    individual_prev_home_team_record['Team Ranking'] = prev_matchup_event_json["homeTeam"]["position"]
-                    individual_prev_home_team_record['Opponent Rank'] = prev_matchup_event_json["awayTeam"]["position"]
-                except Exception as err:
-                    logger.error(f"😫 Failed to get JSON from API URL: "
-                                 "{prev_game_pregame_form_api_url}."
-                                 "\nSee Error: {err}\n", exc_info=True)
-
-
-            elif match['Home Team'] == record["awayTeam"]["name"]:
-                logger.debug(f"\n{match['Home Team']} was playing away "
-                      f"{record['awayTeam']['name']} against {record['homeTeam']['name']}"
-                      f"{record['awayTeam']['name']}. League =>"
-                      f" {match['League']} matches {record['tournament']['name']}."
-                     )
-
-                individual_prev_home_team_record["A/H"] = "Away"
-                if record["winnerCode"] == 1:
-                    individual_prev_home_team_record['Result'] = "Loss"
-                elif record["winnerCode"] == 3:
-                    individual_prev_home_team_record['Result'] = "Draw"
-                elif record["winnerCode"] == 2:
-                    individual_prev_home_team_record['Result'] = "Win"
-
-                individual_prev_home_team_record["Conceded"] = record["homeScore"]["current"]
-                individual_prev_home_team_record["Scored"] = record["awayScore"]["current"]
-
-                previous_game_url = (previous_game_base_url + record["slug"] +
-                "/" + str(record["customId"]) + "#id:" + str(record["id"]) + ",tab:standings")
+        def load_pregame_form(event_id):
+            if prev_game_pregame_form_api_url in pregame_forms:
+                return pregame_forms[prev_game_pregame_form_api_url]
+            logger.info("🎯 Accessing URL: %s", previous_game_url)
+            logger.info("******************************************************************\n")
+            return session.open_page_and_wait(previous_game_url, prev_game_pregame_form_api_url)
 
-                try:
-                    driver.get(previous_game_url)
-                    logging.info(f"🎯 Accessing the URL: {previous_game_url}")
-                    logger.info("************************************************************************************\n")
-                except Exception as err:
-                    logger.error(f"😫 Failure getting rankings for a previous"
-                                 " match. See Error:\n{err}\n", exc_info=True)
+        try:
+            with metrics.span("fixture_lookup"):
+                positions = None
+                if standings is not None and fixture_memo.get(record.event_id) is None:
+                    positions = standings.positions(record)
+                if positions is None:
+                    fixture = fixture_memo.resolve(record, load_pregame_form)
+                    positions = fixture.home_position, fixture.away_position
+            apply_ranks(individual_prev_team_record, *positions)
+        except Exception as err:
+            logger.error("😫 Failed to get JSON from API URL: %s."
+                         "\nSee Error: %s\n", prev_game_pregame_form_api_url, err, exc_info=True)
+
+        prev_records_team_total.append(individual_prev_team_record)
+
+    logger.debug("\nPrevious Records [%s]: %s\n", team_name, prev_records_team_total)
+    return prev_records_team_total
+
+
+def prefetch_team_histories(session, tournament_games):
+    """{team ID: HistoricFixtures} of both teams of every match, requested at once from the current page."""
+    team_ids = {match[field] for match in tournament_games for field in ('Home Team ID', 'Away Team ID')
+                if match.get(field) is not None}
+    performance = session.fetch_all([team_performance_api(team_id) for team_id in team_ids],
+                                    parse=parse_performance)
+    logger.info("📥 Prefetched the histories of %d/%d teams", len(performance), len(team_ids))
+    return {team_id: performance[team_performance_api(team_id)] for team_id in team_ids
+            if team_performance_api(team_id) in performance}
+
+
+def scrape_dates(pool, dates, scrape, checkpoints=None, prefetch=None):
+    """Scrape the matchdays of `dates` one after the other on the warm sessions of `pool`.
+
+    Yields (date, tournament_games) as soon as every match of a date has gone
+    through `scrape(session, match)`, so its output can be saved before the
+    next date starts. Dates whose scheduled-events can't be loaded are skipped.
+    Matches completed by earlier runs are taken from `checkpoints` (a
+    CheckpointStore), and every match is checkpointed as soon as it is done.
+    `prefetch(session, matches)` runs once per date before the matches, e.g.
+    to load every team history at once.
+    """
+    for todays_date in dates:
+        [tournament_games] = pool.map(scrape_tournament_games, [todays_date])
+        if isinstance(tournament_games, Exception):
+            logger.error("😭 Skipping %s: could not load its scheduled events. Error: %s\n",
+                         todays_date, tournament_games)
+            continue
 
-                time.sleep(3)
-                driver.refresh()
+        todo = tournament_games if checkpoints is None else checkpoints.resume(todays_date, tournament_games)
 
-                try:
-                    close_button = driver.find_element(By.XPATH, "//button[contains(@class, 'Button pBEmc')]")
-                    close_button.click()
-                    logger.info("Popup was closed.\n")
+        if prefetch is not None and todo:
+            [result] = pool.map(prefetch, [todo])
+            if isinstance(result, Exception):
+                logger.error("😫 Prefetch for %s failed, the matches load their own data. Error: %s\n",
+                             todays_date, result)
 
-                except Exception as err:
-                    logger.error(f"Popup not present or popup didn't close."
-                                 f" See Error: {err}\n", exc_info=True)
+        def checkpointed_scrape(session, match):
+            result = scrape(session, match)
+            if checkpoints is not None:
+                checkpoints.checkpoint_match(todays_date, result)
+            return result
 
-                driver.find_element("tag name", "body").send_keys(Keys.CONTROL, "r")
-                driver.execute_script("window.scrollTo(0,document.body.scrollHeight);")
-                time.sleep(2)
-                driver.execute_script("window.scrollTo(0, 0);")
-                time.sleep(2)
+        # Iterate through the array above using the attrs to go through the individual web pages for the match-ups.
+        # The matches are filled in place.
+        for match, result in zip(todo, pool.map(checkpointed_scrape, todo)):
+            if isinstance(result, Exception):
+                logger.error("😫 Could not process match %s. Error: %s\n", match['MatchUp'], result)
 
-                prev_game_pregame_form_api_url = f"/api/v1/event/{record['id']}/pregame-form"
+        yield todays_date, tournament_games
 
-                log_entries = driver.get_log('performance')
 
-                for log in logs:
-                    api_path = log['params'].get('headers',{}).get(':path','')
-                    if prev_game_pregame_form_api_url == api_path:
-                        logger.debug(f"📍✅   Match {prev_game_pregame_form_api_url}:----> {api_path}\n")
-                        break
-                    else:
-                        logger.debug(f"❌ No match with API:{prev_game_pregame_form_api_url}.\t{api_path}")
+def run(dates, workers=1, headless=False, lean=False, cache=None, fixture_memo=None,
+        base_url=SOFASCORE_BASE_URL, save=None, archive=None, checkpoints=None, tabs=1, standings=None):
+    """Scrape `dates` on a pool of `workers` Chrome instances started once for the whole batch.
 
-                try:
-                    prev_matchup_event_json = json.loads(driver.execute_cdp_cmd('Network.getResponseBody',{'requestId': log['params']['requestId']})['body'])
-                    individual_prev_home_team_record["Team Ranking"] = prev_matchup_event_json["awayTeam"]["position"]
-                    individual_prev_home_team_record['Opponent Rank'] = prev_matchup_event_json["homeTeam"]["position"]
-                except Exception as e:
-                    logger.error(f"😫 Failed to get JSON from API"
-                                 " {prev_game_pregame_form_api_url}. "
-                                 "See error: {e}\n", exc_info=True)
+    With `tabs` > 1 every Chrome works on that many matches at once, one per
+    tab: while a page loads in one tab, the responses of another are parsed.
+    `save(date, tournament_games)` is called as soon as a date is done.
+    Returns {date: [Match]} of the dates that could be scraped.
+    """
+    if fixture_memo is None:
+        fixture_memo = FixtureMemo(path=None)
 
+    # Every worker owns a tab of a Chrome, started once and reused for all the dates.
+    chrome_tabs = ChromeTabs(tabs, headless=headless, lean=lean, cache=cache, base_url=base_url, archive=archive)
+    pool = BrowserWorkerPool(chrome_tabs.create_session, workers=workers * chrome_tabs.tabs)
 
-        prev_records_home_team_total.append(individual_prev_home_team_record)
-        logger.debug(f"\nPrevious Records [HT]:"
-                      " {prev_records_home_team_total}\n")
+    # Bytes the browser transferred per match, to compare the full and the lean profile.
+    match_bytes = []
 
+    # Histories of the teams of the current date, shared by all the workers.
+    team_histories = {}
 
-    counter+=1
+    def prefetch(session, matches):
+        team_histories.clear()
+        team_histories.update(prefetch_team_histories(session, matches))
 
-    # Get the Standings in the JSON output
-    # Store the standings in the same array of dictionaries above taking into account which match they belong to.
+    def scrape(session, match):
+        bytes_before = session.capture.bytes_received
+        with metrics.span("match"):
+            result = scrape_match(session, match, fixture_memo, standings, team_histories)
+        match_bytes.append(session.capture.bytes_received - bytes_before)
+        logger.info("📊 %s: %.0f kB transferred", match['MatchUp'], match_bytes[-1] / 1024)
+        return result
 
+    games_by_date = {}
+    try:
+        for todays_date, tournament_games in scrape_dates(pool, dates, scrape, checkpoints, prefetch):
+            if save is not None:
+                save(todays_date, tournament_games)
+            # Only the compact form of a saved date is kept for the rest of the batch.
+            games_by_date[todays_date] = [Match.from_record(match) for match in tournament_games]
+    finally:
+        pool.close()
+        chrome_tabs.close()
+
+    if match_bytes:
+        logger.warning("📊 %s profile: %.0f kB transferred per match (%d matches)",
+                       'Lean' if lean else 'Full', sum(match_bytes) / len(match_bytes) / 1024, len(match_bytes))
+    return games_by_date
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape SofaScore matchdays with Chrome.")
+    add_date_arguments(parser)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of Chrome instances processing matches in parallel.")
+    parser.add_argument("--tabs", type=int, default=1,
+                        help="Tabs per Chrome instance, each processing a match (pipelined page loads).")
+    parser.add_argument("--headless", action="store_true", help="Run Chrome headless.")
+    parser.add_argument("--lean", action="store_true",
+                        help="Headless and without images, media, fonts or trackers.")
+    parser.add_argument("--base-url", default=SOFASCORE_BASE_URL,
+                        help="Site to open the pages on, e.g. a local replay server.")
+    add_scraper_arguments(parser, no_cache_help="Always load the pages.")
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    dates = scraper_dates_from_args(parser, args)
+
+    setup_logging()
+    logger.info("Started!😄🙌😃 ")
+    logger.info("Matchdays: %s", ', '.join(dates))
+
+    stores = ScraperStores(args)
+    try:
+        with exported_metrics(args):
+            run(dates, workers=args.workers, headless=args.headless, lean=args.lean, cache=stores.cache,
+                fixture_memo=stores.fixture_memo, base_url=args.base_url, save=stores.save,
+                archive=stores.archive, checkpoints=stores.checkpoints, tabs=args.tabs, standings=stores.standings)
+    finally:
+        stores.close()
 
-driver.quit()
 
-# Force writing logs to the file
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,8 @@ import logging
 import os
 import glob
 
+from sofascore_response_cache import ResponseCache
+
 # Enables capturing network logs
 options = Options()
 options.headless = False  # Set to True if you want headless mode
@@ -112,42 +114,49 @@ logger.addHandler(console_handler)
 
 logger.info("Started!😄🙌😃 ")
 
-# Open the webpage
-
-main_webpage = f"https://www.sofascore.com/football/{todays_date}"
-logger.info(f"▶️   Visiting: {main_webpage}")
-
-
-try:
-    driver.get(main_webpage)
-    logger.info(f"🗿 Visiting the home page URL: {main_webpage}.")
-    logger.info("**************************************************************************************\n")
-except Exception as err:
-    logger.exception(f"😭 Failure visiting home page URL {err}.\n")
+# API responses already fetched by an earlier run are reused from the on-disk cache.
+cache = ResponseCache()
 
+scheduled_date_api = "/api/v1/sport/football/scheduled-events/" + todays_date
 
-log_entries = driver.get_log("performance")
-
-# Process logs to extract API JSON responses:
+data = cache.get_json(scheduled_date_api)
+if data is not None:
+    logger.info("📦 Using the cached response of %s", scheduled_date_api)
 
-scheduled_date_api = "/api/v1/sport/football/scheduled-events/" + todays_date
+# Open the webpage
 
-for request in driver.requests:
-    if request.response and scheduled_date_api in request.url:
-        logger.debug(f"\n[URL] {request.url}")
-        logger.debug(f"[Request Headers] {request.headers}")
-        logger.debug(f"[Response Headers] {request.response.headers}")
+main_webpage = f"https://www.sofascore.com/football/{todays_date}"
 
-        if 'application/json' in request.response.headers.get('Content-Type', ''):
-            try:
-                body = request.response.body.decode('utf-8')
-                data = json.loads(body)
-                logger.debug("[Parsed JSON]")
-                logger.debug(json.dumps(data, indent=2))
-            except Exception as err:
-                logger.exception(f"Failed to load JSON from API URL {scheduled_date_api}.\n")
+if data is None:
+    logger.info("▶️   Visiting: %s", main_webpage)
+    try:
+        driver.get(main_webpage)
+        logger.info("🗿 Visiting the home page URL: %s.", main_webpage)
+        logger.info("**************************************************************************************\n")
+    except Exception as err:
+        logger.exception("😭 Failure visiting home page URL %s.\n", err)
+
+# Process the intercepted requests to extract API JSON responses:
+
+if data is None:
+    for request in driver.requests:
+        if request.response and scheduled_date_api in request.url:
+            logger.debug("\n[URL] %s", request.url)
+            logger.debug("[Request Headers] %s", request.headers)
+            logger.debug("[Response Headers] %s", request.response.headers)
+
+            if 'application/json' in request.response.headers.get('Content-Type', ''):
+                try:
+                    body = request.response.body.decode('utf-8')
+                    data = json.loads(body)
+                    cache.put(scheduled_date_api, body, data)
+                    logger.debug("[Parsed JSON]")
+                    logger.debug(json.dumps(data, indent=2))
+                except Exception as err:
+                    logger.exception("Failed to load JSON from API URL %s.\n", scheduled_date_api)
 
 
 driver.quit()
+cache.close()
 
 # Force writing logs to the file
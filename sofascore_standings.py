@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+
+"""Ranks of previous fixtures from league standings instead of one pregame-form per fixture.
+
+The standings of every (tournament, season) in the team histories are fetched
+once per run. Each fetch is kept as a snapshot of the table after that many
+rounds, and snapshots accumulate in SQLite over the runs of a season. The
+positions of the two teams before a previous fixture of round `r` come from
+the snapshot after round `r - 1`, so a matchday needs one standings request
+per league instead of one page load per previous fixture. Fixtures without
+such a snapshot are left to their pregame-form: a table of another round
+would rank them with results from after (or long before) the fixture.
+
+    standings = StandingsResolver()
+    standings.load_seasons(records, session.fetch_all)
+    positions = standings.positions(record)  # (home position, away position) or None
+"""
+
+import logging
+import sqlite3
+import threading
+
+from sofascore_common import standings_api
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_STANDINGS_PATH = "sofascore_standings.sqlite3"
+
+# Rounds a snapshot may be off the round before a fixture and still rank it.
+ROUND_TOLERANCE = 0
+
+
+def season_key(record):
+    """(unique tournament ID, season ID) of a previous fixture (a HistoricFixture), or None."""
+    if record.unique_tournament_id is None or record.season_id is None:
+        return None
+    return record.unique_tournament_id, record.season_id
+
+
+def standings_table(standings_json):
+    """(rounds played, {team ID: position}) of a standings payload; groups are merged."""
+    positions, rounds_played = {}, 0
+    for standing in standings_json.get('standings', ()):
+        for row in standing.get('rows', ()):
+            positions[row['team']['id']] = row['position']
+            rounds_played = max(rounds_played, row.get('matches') or 0)
+    return rounds_played, positions
+
+
+class StandingsResolver:
+    """Standings snapshots by (tournament, season) and rounds played, in memory and in SQLite."""
+
+    def __init__(self, path=DEFAULT_STANDINGS_PATH, tolerance=ROUND_TOLERANCE):
+        self.path = path
+        self.tolerance = tolerance
+        self.hits = 0
+        self.misses = 0
+
+        self._snapshots = {}  # (tournament, season) -> {rounds played: {team ID: position}}
+        self._fetched = set()  # seasons whose standings were requested in this run
+        self._in_flight = {}   # season -> threading.Event set once it is loaded
+        self._lock = threading.Lock()
+
+        self._connection = None
+        if path is not None:
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS standings_snapshots (
+                    unique_tournament_id INTEGER NOT NULL,
+                    season_id INTEGER NOT NULL,
+                    rounds_played INTEGER NOT NULL,
+                    team_id INTEGER NOT NULL,
+                    position INTEGER NOT NULL,
+                    PRIMARY KEY (unique_tournament_id, season_id, rounds_played, team_id)
+                )
+            """)
+            self._connection.commit()
+
+            for unique_tournament_id, season_id, rounds_played, team_id, position in self._connection.execute(
+                    "SELECT * FROM standings_snapshots"):
+                season = self._snapshots.setdefault((unique_tournament_id, season_id), {})
+                season.setdefault(rounds_played, {})[team_id] = position
+
+    def fetched(self, key):
+        """Whether the standings of the season `key` were already requested in this run."""
+        with self._lock:
+            return key in self._fetched
+
+    def add_standings(self, key, standings_json):
+        """Keep the standings of the season `key`; None records that they couldn't be fetched."""
+        with self._lock:
+            self._fetched.add(key)
+            if standings_json is None:
+                return
+            rounds_played, positions = standings_table(standings_json)
+            if not positions:
+                return
+            self._snapshots.setdefault(key, {})[rounds_played] = positions
+            if self._connection is not None:
+                self._connection.execute(
+                    "DELETE FROM standings_snapshots WHERE unique_tournament_id = ? AND season_id = ? "
+                    "AND rounds_played = ?", (*key, rounds_played))
+                self._connection.executemany(
+                    "INSERT INTO standings_snapshots VALUES (?, ?, ?, ?, ?)",
+                    [(*key, rounds_played, team_id, position) for team_id, position in positions.items()])
+                self._connection.commit()
+
+    def load_seasons(self, records, fetch_standings):
+        """Fetch the standings of the seasons of `records` not requested yet in this run.
+
+        `fetch_standings(api_paths)` returns {api_path: standings JSON} of the
+        ones it got, e.g. BrowserSession.fetch_all. Seasons another thread is
+        already loading are waited for instead of being fetched twice.
+        """
+        keys = {season_key(record) for record in records} - {None}
+        with self._lock:
+            waiting = [self._in_flight[key] for key in keys if key in self._in_flight]
+            todo = [key for key in keys if key not in self._fetched and key not in self._in_flight]
+            for key in todo:
+                self._in_flight[key] = threading.Event()
+
+        if todo:
+            try:
+                results = fetch_standings([standings_api(*key) for key in todo])
+                for key in todo:
+                    self.add_standings(key, results.get(standings_api(*key)))
+            finally:
+                with self._lock:
+                    loaded = [self._in_flight.pop(key) for key in todo]
+                for in_flight in loaded:
+                    in_flight.set()
+
+        for in_flight in waiting:
+            in_flight.wait()
+
+    def positions(self, record):
+        """(home position, away position) before the previous fixture `record`, or None if unknown.
+
+        Only a snapshot within `tolerance` rounds of the round before the
+        fixture is used (the closest one, the earlier one on a tie). Fixtures
+        without round info aren't ranked from the standings.
+        """
+        key = season_key(record)
+        with self._lock:
+            snapshots = self._snapshots.get(key) if key is not None else None
+            if not snapshots or record.round is None:
+                self.misses += 1
+                return None
+
+            round_before = record.round - 1
+            rounds_played = min(snapshots, key=lambda rounds_played: (abs(rounds_played - round_before),
+                                                                      rounds_played))
+            if abs(rounds_played - round_before) > self.tolerance:
+                self.misses += 1
+                return None
+
+            table = snapshots[rounds_played]
+            home_position = table.get(record.home.id)
+            away_position = table.get(record.away.id)
+            if home_position is None or away_position is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return home_position, away_position
+
+    def stats(self):
+        with self._lock:
+            return {"seasons": len(self._snapshots),
+                    "snapshots": sum(len(snapshots) for snapshots in self._snapshots.values()),
+                    "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        if self._connection is not None:
+            with self._lock:
+                self._connection.close()
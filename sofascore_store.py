@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+
+"""Structured, indexed storage of the scraped matches, teams and previous-fixture records.
+
+Every saved matchday goes into SQLite, indexed by event ID, team ID, date and
+unique-tournament ID, so questions about form history are answered locally
+in milliseconds:
+
+    store = MatchStore()
+    store.save_date("2025-04-21", tournament_games)
+    store.last_games(team_id=42, tournament_id=17, venue="Home", limit=4)
+
+The tables can be exported to Parquet (with pyarrow installed) for bulk
+analytics. From the command line:
+
+    python3 sofascore_store.py import tournament_games_*.json
+    python3 sofascore_store.py last-games 42 --tournament 17 --venue Home
+    python3 sofascore_store.py export-parquet analytics/
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+# pyarrow is optional; it is only needed for the Parquet export.
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_STORE_PATH = "sofascore_matches.sqlite3"
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS teams (
+        team_id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL
+    );
+
+    -- The scraped tournament games.
+    CREATE TABLE IF NOT EXISTS matches (
+        event_id INTEGER PRIMARY KEY,
+        date TEXT NOT NULL,
+        league TEXT NOT NULL,
+        tournament_id INTEGER,
+        custom_id TEXT,
+        matchup TEXT,
+        home_team_id INTEGER,
+        away_team_id INTEGER,
+        home_team TEXT,
+        away_team TEXT,
+        home_rank INTEGER,
+        away_rank INTEGER,
+        saved_at REAL NOT NULL
+    );
+
+    -- A previous fixture seen from one team's side; shared by every match whose history contains it.
+    CREATE TABLE IF NOT EXISTS team_games (
+        team_id INTEGER NOT NULL,
+        event_id INTEGER NOT NULL,
+        date TEXT,
+        league TEXT NOT NULL,
+        tournament_id INTEGER,
+        venue TEXT NOT NULL,
+        opponent_id INTEGER,
+        opponent TEXT,
+        result TEXT,
+        scored INTEGER,
+        conceded INTEGER,
+        team_rank INTEGER,
+        opponent_rank INTEGER,
+        PRIMARY KEY (team_id, event_id)
+    );
+
+    -- Which previous fixtures make up the history of each match, in order.
+    CREATE TABLE IF NOT EXISTS match_history (
+        match_event_id INTEGER NOT NULL,
+        team_id INTEGER NOT NULL,
+        position INTEGER NOT NULL,
+        event_id INTEGER NOT NULL,
+        PRIMARY KEY (match_event_id, team_id, position)
+    );
+"""
+
+# Created once the tables have their tournament_id column (see MatchStore._add_tournament_ids).
+# League names collide across countries, so the leagues are indexed by their unique-tournament ID.
+INDEXES = """
+    DROP INDEX IF EXISTS matches_league_date;
+    DROP INDEX IF EXISTS team_games_league_date;
+    DROP INDEX IF EXISTS team_games_form;
+
+    CREATE INDEX IF NOT EXISTS matches_date ON matches (date);
+    CREATE INDEX IF NOT EXISTS matches_tournament_date ON matches (tournament_id, date);
+    CREATE INDEX IF NOT EXISTS matches_home_team ON matches (home_team_id, date);
+    CREATE INDEX IF NOT EXISTS matches_away_team ON matches (away_team_id, date);
+
+    CREATE INDEX IF NOT EXISTS team_games_tournament_form ON team_games (team_id, tournament_id, venue, date);
+    CREATE INDEX IF NOT EXISTS team_games_event ON team_games (event_id);
+    CREATE INDEX IF NOT EXISTS team_games_tournament_date ON team_games (tournament_id, date);
+"""
+
+# Tables that gained a tournament_id column; stores created before it get the column added.
+TOURNAMENT_ID_TABLES = ("matches", "team_games")
+
+# Team ID field and history field of each side of a tournament game.
+HISTORY_FIELDS = (("Home Team ID", "Home Team", "Home Team History"),
+                  ("Away Team ID", "Away Team", "Away Team History"))
+
+TABLES = ("teams", "matches", "team_games", "match_history")
+
+
+class MatchStore:
+    """SQLite store of tournament games and the previous-fixture records of their teams."""
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+        self._add_tournament_ids()
+        self._connection.executescript(INDEXES)
+        self._connection.commit()
+
+    def _add_tournament_ids(self):
+        """Add the tournament_id column to the tables of older stores (their rows keep a NULL one)."""
+        for table in TOURNAMENT_ID_TABLES:
+            columns = [row[1] for row in self._connection.execute(f"PRAGMA table_info({table})")]
+            if "tournament_id" not in columns:
+                self._connection.execute(f"ALTER TABLE {table} ADD COLUMN tournament_id INTEGER")
+
+    def save_date(self, todays_date, tournament_games):
+        """Store (or update) the tournament games of a matchday and their histories in one transaction."""
+        with self._lock, self._connection:
+            for match in tournament_games:
+                self._save_match(todays_date, match)
+
+    def last_games(self, team_id, tournament_id=None, venue=None, limit=4, before=None):
+        """The team's latest previous fixtures, newest first, as dicts.
+
+        Filter on the unique-tournament ID `tournament_id`, `venue` ("Home" or
+        "Away") and dates strictly `before` a YYYY-MM-DD date.
+        """
+        query = "SELECT * FROM team_games WHERE team_id = ?"
+        parameters = [int(team_id)]
+        for column, value, operator in (("tournament_id", tournament_id, "="), ("venue", venue, "="),
+                                        ("date", before, "<")):
+            if value is not None:
+                query += f" AND {column} {operator} ?"
+                parameters.append(value)
+        query += " ORDER BY date DESC LIMIT ?"
+        parameters.append(limit)
+
+        with self._lock:
+            cursor = self._connection.execute(query, parameters)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def matches(self, todays_date=None, tournament_id=None):
+        """Stored tournament games as dicts, optionally of one date and/or unique-tournament ID."""
+        query, parameters = "SELECT * FROM matches WHERE 1 = 1", []
+        if todays_date is not None:
+            query += " AND date = ?"
+            parameters.append(todays_date)
+        if tournament_id is not None:
+            query += " AND tournament_id = ?"
+            parameters.append(tournament_id)
+
+        with self._lock:
+            cursor = self._connection.execute(query + " ORDER BY date, event_id", parameters)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def export_parquet(self, directory):
+        """Write every table to `<directory>/<table>.parquet`; returns the file paths."""
+        if pyarrow is None:
+            raise RuntimeError("The Parquet export needs pyarrow: python3 -m pip install pyarrow")
+
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for table in TABLES:
+            with self._lock:
+                cursor = self._connection.execute(f"SELECT * FROM {table}")
+                columns = [column[0] for column in cursor.description]
+                rows = cursor.fetchall()
+
+            arrow_table = pyarrow.table({column: [row[position] for row in rows]
+                                         for position, column in enumerate(columns)})
+            path = os.path.join(directory, f"{table}.parquet")
+            pyarrow.parquet.write_table(arrow_table, path)
+            paths.append(path)
+        return paths
+
+    def stats(self):
+        with self._lock:
+            return {table: self._connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                    for table in TABLES}
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def _save_match(self, todays_date, match):
+        execute = self._connection.execute
+
+        for team_id_field, team_field, _ in HISTORY_FIELDS:
+            if match.get(team_id_field) is not None and match.get(team_field) is not None:
+                execute("INSERT OR REPLACE INTO teams VALUES (?, ?)", (match[team_id_field], match[team_field]))
+
+        # Columns named, as older stores have tournament_id last.
+        execute("INSERT OR REPLACE INTO matches (event_id, date, league, tournament_id, custom_id, matchup, "
+                "home_team_id, away_team_id, home_team, away_team, home_rank, away_rank, saved_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", (
+            match['ID'], match.get('Date', todays_date), match['League'], match.get('Tournament ID'),
+            match.get('Custom ID'),
+            match.get('MatchUp'), match.get('Home Team ID'), match.get('Away Team ID'),
+            match.get('Home Team'), match.get('Away Team'),
+            match.get('Home Team Rank'), match.get('Away Team Rank'), time.time(),
+        ))
+
+        for team_id_field, _, history_field in HISTORY_FIELDS:
+            team_id, history = match.get(team_id_field), match.get(history_field)
+            if team_id is None or history is None:
+                continue
+
+            execute("DELETE FROM match_history WHERE match_event_id = ? AND team_id = ?", (match['ID'], team_id))
+            for position, record in enumerate(history):
+                if record.get('Event ID') is None:
+                    continue  # Saved before the records carried their fixture.
+
+                if record.get('Opponent ID') is not None and record.get('Opponent') is not None:
+                    execute("INSERT OR REPLACE INTO teams VALUES (?, ?)", (record['Opponent ID'], record['Opponent']))
+                execute("INSERT OR REPLACE INTO team_games (team_id, event_id, date, league, tournament_id, venue, "
+                        "opponent_id, opponent, result, scored, conceded, team_rank, opponent_rank) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", (
+                    team_id, record['Event ID'], record.get('Date'), match['League'], match.get('Tournament ID'),
+                    record['A/H'],
+                    record.get('Opponent ID'), record.get('Opponent'), record['Result'],
+                    record['Scored'], record['Conceded'], record['Team Ranking'], record['Opponent Rank'],
+                ))
+                execute("INSERT INTO match_history VALUES (?, ?, ?, ?)",
+                        (match['ID'], team_id, position, record['Event ID']))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=DEFAULT_STORE_PATH, help="SQLite store.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_command = commands.add_parser("import", help="Store tournament_games_<date>.json output files.")
+    import_command.add_argument("files", nargs="+")
+
+    last_games_command = commands.add_parser("last-games", help="A team's latest previous fixtures.")
+    last_games_command.add_argument("team_id", type=int)
+    last_games_command.add_argument("--tournament", type=int, metavar="ID",
+                                    help="Only fixtures of this unique tournament (see sofascore_tournaments.json).")
+    last_games_command.add_argument("--venue", choices=("Home", "Away"))
+    last_games_command.add_argument("--limit", type=int, default=4)
+    last_games_command.add_argument("--before", metavar="DATE", help="Only fixtures before YYYY-MM-DD.")
+
+    export_command = commands.add_parser("export-parquet", help="Write every table as a Parquet file.")
+    export_command.add_argument("directory")
+
+    args = parser.parse_args()
+    store = MatchStore(args.db)
+
+    try:
+        if args.command == "import":
+            for path in args.files:
+                with open(path) as f:
+                    tournament_games = json.load(f)
+                # tournament_games_<date>.json
+                todays_date = os.path.splitext(os.path.basename(path))[0].rsplit("_", 1)[-1]
+                store.save_date(todays_date, tournament_games)
+            print(f"Imported {len(args.files)} files: {store.stats()}")
+
+        elif args.command == "last-games":
+            start = time.perf_counter()
+            games = store.last_games(args.team_id, args.tournament, args.venue, args.limit, args.before)
+            for game in games:
+                print(json.dumps(game, ensure_ascii=False))
+            print(f"{len(games)} games in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        else:
+            try:
+                paths = store.export_parquet(args.directory)
+            except RuntimeError as err:
+                parser.exit(1, f"{err}\n")
+            for path in paths:
+                print(f"Wrote {path}")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
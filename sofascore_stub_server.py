@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+"""Local stand-in for the SofaScore site replaying recorded JSON responses.
+
+A request for `/api/v1/event/13981715/pregame-form` is answered with the
+file `<fixtures-dir>/api/v1/event/13981715/pregame-form.json`.
+
+The matchday, match and team pages the Selenium scripts open are answered
+with a small page that requests the same API endpoints as the real web app,
+so the whole Chrome pipeline can run against recorded data. `--latency` and
+`--jitter` delay every response to mimic the live site.
+
+    python3 sofascore_stub_server.py --fixtures-dir recorded_api --port 8765
+    python3 sofascore_stub_server.py --fixtures-dir recorded_api --latency 150 --jitter 50
+"""
+
+import argparse
+import os
+import random
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Requests the API endpoints the real page would, from the page's own URL.
+PAGE_SHELL = b"""<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>SofaScore replay</title></head>
+<body>
+<script>
+const path = location.pathname;
+let apis = [];
+let m;
+if ((m = path.match(/^\\/football\\/(\\d{4}-\\d{2}-\\d{2})$/))) {
+    apis = [`/api/v1/sport/football/scheduled-events/${m[1]}`];
+} else if (path.startsWith("/football/match/") && (m = location.hash.match(/id:(\\d+)/))) {
+    apis = [`/api/v1/event/${m[1]}`, `/api/v1/event/${m[1]}/pregame-form`];
+} else if ((m = path.match(/^\\/team\\/football\\/[^\\/]+\\/(\\d+)$/))) {
+    apis = [`/api/v1/team/${m[1]}/performance`];
+}
+for (const api of apis) {
+    fetch(api).then(response => response.text()).then(text => {
+        const line = document.createElement("pre");
+        line.textContent = `${api}: ${text.length} bytes`;
+        document.body.appendChild(line);
+    });
+}
+</script>
+</body>
+</html>
+"""
+
+PAGE_PREFIXES = ("/football/", "/team/football/")
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    """Serve `<path>.json` from the server's fixtures directory, and page shells for the site pages."""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real API.
+
+    def do_GET(self):
+        path = self.path.split("?")[0].split("#")[0]
+
+        latency = self.server.latency + random.uniform(-self.server.jitter, self.server.jitter)
+        if latency > 0:
+            time.sleep(latency)
+
+        if path.startswith("/api/"):
+            self.send_fixture(path)
+        elif path.startswith(PAGE_PREFIXES):
+            self.send_body(PAGE_SHELL, "text/html; charset=utf-8")
+        else:
+            self.send_error(404, "Not a SofaScore page")
+
+    def send_fixture(self, api_path):
+        fixture = os.path.normpath(os.path.join(self.server.fixtures_dir, api_path.lstrip("/") + ".json"))
+
+        if not fixture.startswith(self.server.fixtures_dir) or not os.path.isfile(fixture):
+            self.send_error(404, "No recorded response")
+            return
+
+        with open(fixture, "rb") as f:
+            body = f.read()
+        self.send_body(body, "application/json")
+
+    def send_body(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with self.server.bytes_lock:
+            self.server.bytes_sent += len(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_stub_server(fixtures_dir, host="127.0.0.1", port=0, latency=0.0, jitter=0.0):
+    """Server replaying `fixtures_dir`, delaying responses by `latency` ± `jitter` seconds."""
+    server = ThreadingHTTPServer((host, port), FixtureRequestHandler)
+    server.fixtures_dir = os.path.abspath(fixtures_dir)
+    server.latency = latency
+    server.jitter = jitter
+    # Bodies served so far, to compare what each scraper transfers.
+    server.bytes_sent = 0
+    server.bytes_lock = threading.Lock()
+    server.daemon_threads = True
+    return server
+
+
+def start_stub_server(fixtures_dir, host="127.0.0.1", port=0, latency=0.0, jitter=0.0):
+    """Start the server in a daemon thread; returns it (`server.server_port` is the bound port)."""
+    server = create_stub_server(fixtures_dir, host, port, latency, jitter)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures-dir", required=True)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0, help="Delay of every response (ms).")
+    parser.add_argument("--jitter", type=float, default=0, help="Random +/- variation of the delay (ms).")
+    args = parser.parse_args()
+
+    server = create_stub_server(args.fixtures_dir, args.host, args.port,
+                                args.latency / 1000, args.jitter / 1000)
+    print(f"Serving {server.fixtures_dir} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+"""Selection of the tracked tournaments by SofaScore `uniqueTournament.id`.
+
+The tracked (country, league) pairs and their unique-tournament IDs live in
+`sofascore_tournaments.json`. They are compiled once into integer sets, so
+the scheduled-events filter and the history filter are a set lookup per
+event. Names are ambiguous ("Premiership", "Championship" and "Premier
+League" exist in several countries); IDs aren't.
+
+    selector = TournamentSelector.load("sofascore_tournaments.json")
+    selector.selects(event["tournament"])
+"""
+
+import json
+import os
+
+
+DEFAULT_TOURNAMENTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sofascore_tournaments.json")
+
+
+def unique_tournament_id(tournament):
+    """`uniqueTournament.id` of an event's `tournament`, or None."""
+    return (tournament.get("uniqueTournament") or {}).get("id")
+
+
+class TournamentSelector:
+    """The tracked tournaments, as a set of unique-tournament IDs."""
+
+    def __init__(self, tournaments):
+        """`tournaments` are dicts with "country", "league" and "unique_tournament_id"."""
+        tournaments = list(tournaments)
+        self.ids = frozenset(int(tournament["unique_tournament_id"]) for tournament in tournaments)
+        self.leagues = {int(tournament["unique_tournament_id"]): tournament["league"] for tournament in tournaments}
+        # Events without a uniqueTournament fall back to the exact (country, league) pair.
+        self.pairs = frozenset((tournament["country"], tournament["league"]) for tournament in tournaments)
+
+    @classmethod
+    def load(cls, path=DEFAULT_TOURNAMENTS_PATH):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["tournaments"])
+
+    def selects(self, tournament):
+        """Whether an event's `tournament` is one of the tracked ones."""
+        tournament_id = unique_tournament_id(tournament)
+        if tournament_id is not None:
+            return tournament_id in self.ids
+        try:
+            country = tournament["category"]["country"]["name"]
+        except KeyError:
+            return False
+        return (country, tournament["name"]) in self.pairs
+
+
+_selector = None
+
+
+def tournament_selector():
+    """The selector used by default, loaded from `sofascore_tournaments.json` on first use."""
+    global _selector
+    if _selector is None:
+        _selector = TournamentSelector.load()
+    return _selector
+
+
+def configure_tournaments(path):
+    """Use the tournaments of another config file from now on, e.g. from a `--tournaments` option."""
+    global _selector
+    _selector = TournamentSelector.load(path)
+    return _selector
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+"""Pool of independent browser sessions working through a list of jobs.
+
+Each worker thread owns one browser session (e.g. a headless Chrome with its
+CDP capture) and pulls jobs off a shared queue. A session only needs
+`is_alive()` and `quit()` methods. When a session dies mid-job the worker
+starts a fresh one and the job is queued again; the other workers and their
+results are unaffected.
+
+Sessions stay open between `map()` calls, so a batch of dates is processed on
+already warm browsers; `close()` quits them.
+"""
+
+import logging
+import queue
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserWorkerPool:
+    """Run `job(session, item)` for many items across `workers` browser sessions."""
+
+    def __init__(self, create_session, workers=4, max_attempts=2, sessions=()):
+        """`sessions` are already running sessions to use before creating new ones."""
+        self.create_session = create_session
+        self.workers = max(1, workers)
+        self.max_attempts = max_attempts
+        self._idle_sessions = list(sessions)
+        self._lock = threading.Lock()
+
+    def map(self, job, items):
+        """Return the results of `job(session, item)` in the order of `items`.
+
+        The result of an item that failed `max_attempts` times is its exception.
+        """
+        items = list(items)
+        results = [None] * len(items)
+
+        jobs = queue.Queue()
+        for index, item in enumerate(items):
+            jobs.put((index, item, 1))
+
+        threads = []
+        for worker_id in range(min(self.workers, len(items))):
+            with self._lock:
+                session = self._idle_sessions.pop() if self._idle_sessions else None
+            thread = threading.Thread(target=self._work, name=f"browser-worker-{worker_id}",
+                                      args=(worker_id, session, job, jobs, results))
+            thread.start()
+            threads.append(thread)
+
+        for thread in threads:
+            thread.join()
+
+        return results
+
+    def close(self):
+        """Quit every session of the pool."""
+        with self._lock:
+            sessions, self._idle_sessions = self._idle_sessions, []
+        for session in sessions:
+            self._quit(session)
+
+    def _work(self, worker_id, session, job, jobs, results):
+        while True:
+            try:
+                index, item, attempt = jobs.get_nowait()
+            except queue.Empty:
+                break
+
+            try:
+                if session is None:
+                    session = self.create_session()
+                results[index] = job(session, item)
+                if session.is_alive():
+                    continue
+                error = RuntimeError("Browser session died during the job")
+            except Exception as err:
+                if session is not None and session.is_alive():
+                    logger.error("😫 Worker %s: job %d failed. Error: %s", worker_id, index, err, exc_info=True)
+                    results[index] = err
+                    continue
+                error = err
+
+            # The browser crashed: restart this worker's session and retry the job.
+            logger.error("💥 Worker %s: browser session lost on job %d (attempt %d/%d). Error: %s",
+                         worker_id, index, attempt, self.max_attempts, error)
+            self._quit(session)
+            session = None
+
+            if attempt < self.max_attempts:
+                jobs.put((index, item, attempt + 1))
+            else:
+                results[index] = error
+
+        # Keep the warm session for the next map() call.
+        if session is not None:
+            with self._lock:
+                self._idle_sessions.append(session)
+
+    @staticmethod
+    def _quit(session):
+        try:
+            session.quit()
+        except Exception:
+            pass
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+# The scrapers are flat modules at the root of the repository.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sofascore_benchmark import generate_fixtures  # noqa: E402
+from sofascore_stub_server import start_stub_server  # noqa: E402
+
+
+# Matchday of the synthetic recording, and its size.
+STUB_DATE = "2025-04-21"
+STUB_MATCHES = 4
+STUB_HISTORY = 6
+
+
+@pytest.fixture(scope="session")
+def recording(tmp_path_factory):
+    """Directory of a synthetic recording of STUB_MATCHES matches on STUB_DATE (see sofascore_benchmark)."""
+    fixtures_dir = str(tmp_path_factory.mktemp("recording"))
+    generate_fixtures(fixtures_dir, [STUB_DATE], matches=STUB_MATCHES, history=STUB_HISTORY)
+    return fixtures_dir
+
+
+@pytest.fixture(scope="session")
+def stub_server(recording):
+    """Base URL of a local stub server replaying the recording."""
+    server = start_stub_server(recording)
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
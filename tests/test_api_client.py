@@ -0,0 +1,74 @@
+import asyncio
+import os
+import shutil
+
+from conftest import STUB_DATE, STUB_MATCHES
+from sofascore_api_client import SofascoreApiClient, run
+from sofascore_common import pregame_form_api, team_performance_api
+from sofascore_records import Match
+from sofascore_stub_server import start_stub_server
+
+
+def scrape(base_url, **kwargs):
+    saved = {}
+    games_by_date = asyncio.run(run([STUB_DATE], base_url, concurrency=4,
+                                    save=lambda todays_date, games: saved.setdefault(todays_date, games),
+                                    **kwargs))
+    return saved, games_by_date
+
+
+def test_scrapes_a_matchday_from_the_stub_server(stub_server):
+    saved, games_by_date = scrape(stub_server)
+
+    tournament_games = saved[STUB_DATE]
+    assert [match["ID"] for match in tournament_games] == [10_000_000 + number for number in range(STUB_MATCHES)]
+    for number, match in enumerate(tournament_games):
+        assert (match["League"], match["Tournament ID"]) == ("Premier League", 17)
+        # The pregame-form of the match ranks team 2n at n + 1 and team 2n + 1 at 2 * STUB_MATCHES - n.
+        assert (match["Home Team Rank"], match["Away Team Rank"]) == (number + 1, 2 * STUB_MATCHES - number)
+        assert match["Home Team History"] and match["Away Team History"]
+
+        for team_id, history, venue in ((match["Home Team ID"], match["Home Team History"], "Home"),
+                                        (match["Away Team ID"], match["Away Team History"], "Away")):
+            assert sum(record["A/H"] == venue for record in history) <= 4
+            for record in history:
+                # The recorded pregame-forms rank team n at n + 1.
+                assert record["Team Ranking"] == team_id - 1000 + 1
+                assert record["Opponent Rank"] == record["Opponent ID"] - 1000 + 1
+                assert record["Date"] < STUB_DATE
+
+    assert games_by_date[STUB_DATE] == [Match.from_record(match) for match in tournament_games]
+
+
+def test_get_json_of_the_stub_server(stub_server):
+    async def fetch():
+        async with SofascoreApiClient(base_url=stub_server) as client:
+            return await client.get_json(team_performance_api(1000))
+
+    events = asyncio.run(fetch())["events"]
+    assert events
+    assert all(event["status"]["type"] == "finished" for event in events)
+
+
+def test_missing_pregame_form_leaves_the_rank_empty(recording, tmp_path):
+    fixtures_dir = str(tmp_path / "recording")
+    shutil.copytree(recording, fixtures_dir)
+    missing = 10_000_000 + 100_000 + 5 * 2 * STUB_MATCHES + 0  # Last round, team 5 v team 0
+    os.remove(os.path.join(fixtures_dir, pregame_form_api(missing).lstrip("/") + ".json"))
+
+    server = start_stub_server(fixtures_dir)
+    try:
+        saved, _ = scrape(f"http://127.0.0.1:{server.server_port}")
+    finally:
+        server.shutdown()
+
+    records = [record for match in saved[STUB_DATE]
+               for record in match["Home Team History"] + match["Away Team History"]]
+    missing_ranks = [record["Team Ranking"] for record in records if record["Event ID"] == missing]
+    assert missing_ranks and set(missing_ranks) == {None}
+    assert all(record["Team Ranking"] is not None for record in records if record["Event ID"] != missing)
+
+
+def test_unreachable_server_skips_the_date():
+    saved, games_by_date = scrape("http://127.0.0.1:9")
+    assert saved == {} and games_by_date == {}
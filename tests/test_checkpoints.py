@@ -0,0 +1,108 @@
+import json
+import sqlite3
+
+from sofascore_checkpoints import CheckpointStore, is_complete
+from sofascore_records import Match
+
+
+def tournament_games():
+    return [{"ID": event_id, "League": "Premier League", "Home Team": f"Team {event_id}", "Away Team": "Team 0"}
+            for event_id in (1, 2, 3)]
+
+
+def history(team_ranking=4, opponent_rank=9):
+    return [{"A/H": "Home", "Result": "W", "Scored": 2, "Conceded": 0, "Team Ranking": team_ranking,
+             "Opponent Rank": opponent_rank, "Event ID": 100, "Date": "2025-04-12", "Opponent": "Team 9",
+             "Opponent ID": 9}]
+
+
+def completed(match, away_history=None):
+    return dict(match, **{"Home Team History": history(), "Away Team History": away_history or history()})
+
+
+def test_is_complete():
+    match = tournament_games()[0]
+    assert not is_complete(match)
+    assert is_complete(completed(match))
+    assert is_complete(dict(match, **{"Home Team History": [], "Away Team History": []}))
+    assert is_complete(Match.from_record(completed(match)))
+    assert not is_complete(Match.from_record(match))
+
+
+def test_a_history_with_a_missing_rank_is_not_complete():
+    match = tournament_games()[0]
+    for unranked in (history(team_ranking=None), history(opponent_rank=None)):
+        assert not is_complete(completed(match, unranked))
+        assert not is_complete(Match.from_record(completed(match, unranked)))
+
+    record = history()[0]
+    del record["Opponent Rank"]
+    assert not is_complete(completed(match, [record]))
+
+
+def test_resume_scrapes_only_the_remaining_matches(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite3")
+    checkpoints = CheckpointStore(path)
+    games = tournament_games()
+    checkpoints.checkpoint_match("2025-04-21", completed(games[1]))
+    checkpoints.checkpoint_match("2025-04-20", completed(games[2]))
+    checkpoints.close()
+
+    # A new run, after the first one died.
+    checkpoints = CheckpointStore(path)
+    games = tournament_games()
+    todo = checkpoints.resume("2025-04-21", games)
+    assert [match["ID"] for match in todo] == [1, 3]
+    assert games[1] == completed(tournament_games()[1])
+    assert todo[0] is games[0]
+    assert checkpoints.stats() == {"completed_matches": 2, "failed_matches": 0}
+    checkpoints.close()
+
+
+def test_match_with_an_unranked_fixture_is_scraped_again(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite3")
+    checkpoints = CheckpointStore(path)
+    games = tournament_games()
+    checkpoints.checkpoint_match("2025-04-21", completed(games[0]))
+    checkpoints.checkpoint_match("2025-04-21", completed(games[1], history(opponent_rank=None)))
+    assert checkpoints.stats() == {"completed_matches": 1, "failed_matches": 1}
+
+    games = tournament_games()
+    assert [match["ID"] for match in checkpoints.resume("2025-04-21", games)] == [2, 3]
+
+    # Its ranks are found this time.
+    checkpoints.checkpoint_match("2025-04-21", completed(games[1]))
+    assert checkpoints.stats() == {"completed_matches": 2, "failed_matches": 0}
+    assert [match["ID"] for match in checkpoints.resume("2025-04-21", tournament_games())] == [3]
+    checkpoints.close()
+
+
+def test_restart_ignores_the_checkpoints(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite3")
+    checkpoints = CheckpointStore(path)
+    checkpoints.checkpoint_match("2025-04-21", completed(tournament_games()[0]))
+    checkpoints.close()
+
+    checkpoints = CheckpointStore(path, resume=False)
+    games = tournament_games()
+    assert checkpoints.resume("2025-04-21", games) == tournament_games()
+    assert checkpoints.completed_matches("2025-04-21") == {1: completed(tournament_games()[0])}
+    checkpoints.close()
+
+
+def test_older_checkpoints_get_their_complete_flags(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite3")
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE completed_matches (date TEXT NOT NULL, match_id INTEGER NOT NULL, "
+                       "result TEXT NOT NULL, completed_at REAL NOT NULL, PRIMARY KEY (date, match_id))")
+    games = tournament_games()
+    for match in (completed(games[0]), completed(games[1], history(team_ranking=None))):
+        connection.execute("INSERT INTO completed_matches VALUES (?, ?, ?, ?)",
+                           ("2025-04-21", match["ID"], json.dumps(match), 0.0))
+    connection.commit()
+    connection.close()
+
+    checkpoints = CheckpointStore(path)
+    assert checkpoints.stats() == {"completed_matches": 1, "failed_matches": 1}
+    assert list(checkpoints.completed_matches("2025-04-21")) == [1]
+    checkpoints.close()
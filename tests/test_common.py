@@ -0,0 +1,180 @@
+import argparse
+import ast
+import glob
+import json
+import logging
+import os
+from datetime import datetime
+
+import pytest
+import pytz
+
+from sofascore_common import (
+    DEFAULT_DATE,
+    RateLimitFilter,
+    add_date_arguments,
+    dates_from_args,
+    convert_unix_to_time,
+    iter_scheduled_events,
+    local_date,
+    matchday_dates,
+    select_scheduled_games,
+)
+
+
+def test_matchday_dates():
+    assert matchday_dates(["2025-04-21"]) == ["2025-04-21"]
+    assert matchday_dates(["2025-04-21", "2025-04-19", "2025-04-21"]) == ["2025-04-19", "2025-04-21"]
+    assert matchday_dates(start="2025-04-19", end="2025-04-21") == ["2025-04-19", "2025-04-20", "2025-04-21"]
+    assert matchday_dates(["2025-04-25"], start="2025-04-30") == ["2025-04-25", "2025-04-30"]
+    with pytest.raises(ValueError):
+        matchday_dates(start="2025-04-21", end="2025-04-19")
+    with pytest.raises(ValueError):
+        matchday_dates(["21-04-2025"])
+
+
+def test_dates_from_args():
+    parser = argparse.ArgumentParser()
+    add_date_arguments(parser)
+    assert dates_from_args(parser, parser.parse_args([])) == [DEFAULT_DATE]
+    args = parser.parse_args(["--date", "2025-05-01", "--from", "2025-04-28", "--to", "2025-04-29"])
+    assert dates_from_args(parser, args) == ["2025-04-28", "2025-04-29", "2025-05-01"]
+    with pytest.raises(SystemExit):
+        dates_from_args(parser, parser.parse_args(["--from", "2025-04-21", "--to", "2025-04-19"]))
+
+
+EVENTS = [
+    {"id": 1, "tournament": {"name": "Premier League"}, "status": {"type": "finished"}},
+    {"id": 2, "tournament": {"name": "La Liga, \"Primera\" ]"}, "status": {"type": "notstarted"}},
+    {"id": 3, "homeTeam": {"name": "Team [3]"}},
+]
+
+
+@pytest.mark.parametrize("body", [
+    json.dumps({"events": EVENTS}),
+    json.dumps({"events": EVENTS}, indent=2),
+    json.dumps({"events": EVENTS}).encode("utf-8"),
+    # Not laid out as {"events": [...]}: decoded as a whole.
+    json.dumps({"hasMore": False, "events": EVENTS}),
+])
+def test_iter_scheduled_events(body):
+    assert list(iter_scheduled_events(body)) == EVENTS
+
+
+def test_iter_scheduled_events_is_lazy():
+    events = iter_scheduled_events('{"events": [{"id": 1}, {"id": 2}, not json')
+    assert next(events) == {"id": 1}
+    assert next(events) == {"id": 2}
+    with pytest.raises(ValueError):
+        next(events)
+
+
+@pytest.mark.parametrize("body", ['{"events": []}', '{"events": [ ]}', '{}'])
+def test_iter_scheduled_events_without_events(body):
+    assert list(iter_scheduled_events(body)) == []
+
+
+def scheduled_event(event_id, league, unique_tournament_id, country, start_timestamp, status="notstarted"):
+    return {"id": event_id, "customId": f"c{event_id}", "slug": f"match-{event_id}", "startTimestamp": start_timestamp,
+            "status": {"type": status},
+            "tournament": {"name": league, "uniqueTournament": {"id": unique_tournament_id},
+                           "category": {"name": country}},
+            "homeTeam": {"id": 2 * event_id, "name": f"Team {2 * event_id}"},
+            "awayTeam": {"id": 2 * event_id + 1, "name": f"Team {2 * event_id + 1}"}}
+
+
+def test_select_scheduled_games():
+    # 12:00 and 21:30 UTC on 2025-04-21; the second is 00:30 on 2025-04-22 in Nairobi.
+    events = [scheduled_event(1, "Premier League", 17, "England", 1745236800),
+              scheduled_event(2, "Premier League", 17, "England", 1745271000),
+              scheduled_event(3, "Some Cup", 99999, "Nowhere", 1745236800, status="finished"),
+              scheduled_event(4, "LaLiga", 8, "Spain", 1745236800, status="finished")]
+    finished = []
+    games = select_scheduled_games(json.dumps({"events": events}, indent=1), "2025-04-21", finished)
+
+    assert [(match["ID"], match["Tournament ID"], match["Home Team ID"]) for match in games] == [(1, 17, 2), (4, 8, 8)]
+    assert games[0]["MatchUp"] == "match-1" and games[0]["Date"] == "2025-04-21"
+    # Finished events are reported whatever their league.
+    assert finished == [3, 4]
+
+
+def test_local_date_at_midnight():
+    # Midnight of 2025-04-21 in Nairobi (UTC+3).
+    assert local_date(1745182800) == "2025-04-21"
+    assert local_date(1745182799) == "2025-04-20"
+
+
+def pytz_date(unix_timestamp, zone):
+    return datetime.fromtimestamp(unix_timestamp, pytz.timezone(zone)).date().isoformat()
+
+
+@pytest.mark.parametrize("zone", ["Africa/Nairobi", "Europe/London", "America/Sao_Paulo", "Asia/Kathmandu", "UTC"])
+def test_local_date_matches_the_timezone_database(zone):
+    # Odd steps across a year, to land on every time of day and around the daylight saving changes.
+    for unix_timestamp in range(1711843200, 1743379200, 899 * 7):
+        assert local_date(unix_timestamp, zone) == pytz_date(unix_timestamp, zone)
+
+
+@pytest.mark.parametrize("zone, transition", [
+    # Liberia moved from UTC-0:44:30 to UTC at 00:44:30 UTC, 1972-01-07.
+    ("Africa/Monrovia", datetime(1972, 1, 7, 0, 44, 30)),
+    # Labrador's changes were at 00:01 local time until 2011: 00:01 on 1990-10-28 fell back to 23:01 the day before.
+    ("America/Goose_Bay", datetime(1990, 10, 28, 3, 1)),
+    ("America/Goose_Bay", datetime(1990, 4, 1, 4, 1)),
+])
+def test_local_date_around_a_change_off_the_quarter_hour(zone, transition):
+    transition = int(pytz.utc.localize(transition).timestamp())
+    assert transition % 900
+    for unix_timestamp in range(transition - 4 * 3600, transition + 4 * 3600, 59):
+        assert local_date(unix_timestamp, zone) == pytz_date(unix_timestamp, zone)
+
+
+def test_local_date_matches_convert_unix_to_time():
+    for unix_timestamp in range(1745100000, 1745300000, 1799):
+        assert local_date(unix_timestamp) == convert_unix_to_time(unix_timestamp)[0]
+
+
+def log_record(message, created, level=logging.INFO, name="sofascore"):
+    record = logging.LogRecord(name, level, __file__, 0, message, ("value",), None)
+    record.created = created
+    return record
+
+
+def test_rate_limit_filter_per_template():
+    rate_limit = RateLimitFilter(burst=3, interval=1.0)
+    passed = [rate_limit.filter(log_record("Captured %s", 100.0 + n / 100)) for n in range(5)]
+    assert passed == [True, True, True, False, False]
+    # Another template, or another logger, has its own budget, and warnings always pass.
+    assert rate_limit.filter(log_record("Saved %s", 100.1))
+    assert rate_limit.filter(log_record("Captured %s", 100.1, name="sofascore.cache"))
+    assert rate_limit.filter(log_record("Captured %s", 100.1, level=logging.WARNING))
+
+
+def test_rate_limit_filter_reports_the_suppressed_records():
+    rate_limit = RateLimitFilter(burst=1, interval=1.0)
+    assert rate_limit.filter(log_record("Captured %s", 100.0))
+    assert not rate_limit.filter(log_record("Captured %s", 100.5))
+    assert not rate_limit.filter(log_record("Captured %s", 100.9))
+
+    record = log_record("Captured %s", 101.0)
+    assert rate_limit.filter(record)
+    assert record.suppressed == 2
+
+    record = log_record("Captured %s", 102.5)
+    assert rate_limit.filter(record)
+    assert not hasattr(record, "suppressed")
+
+
+def test_log_messages_are_templates():
+    """Log calls pass their values as arguments, so that filtered records are never formatted."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    eager = []
+    for path in glob.glob(os.path.join(root, "*.py")) + glob.glob(os.path.join(root, "mitmproxy_files", "*.py")):
+        with open(path, encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                    and isinstance(node.func.value, ast.Name) and node.func.value.id == "logger"
+                    and node.args and isinstance(node.args[0], ast.JoinedStr)):
+                eager.append(f"{os.path.relpath(path, root)}:{node.lineno}")
+    assert eager == []
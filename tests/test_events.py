@@ -0,0 +1,61 @@
+import json
+
+import numpy as np
+import pytest
+
+from sofascore_common import local_date, select_scheduled_games
+from sofascore_events import (
+    MISSING_ID,
+    day_number,
+    event_table,
+    local_days,
+    scheduled_tournament_games,
+    synthetic_day,
+)
+
+
+def test_event_table():
+    events = [
+        {"id": 1, "startTimestamp": 1745236800, "tournament": {"name": "Premier League",
+                                                               "uniqueTournament": {"id": 17},
+                                                               "category": {"country": {"name": "England"}}},
+         "homeTeam": {"id": 42, "name": "Arsenal"}, "awayTeam": {"id": 38, "name": "Chelsea"},
+         "homeScore": {"current": 2}, "awayScore": {"current": 1}, "winnerCode": 1, "slug": "arsenal-chelsea"},
+        # Not played yet, and without a uniqueTournament or teams.
+        {"id": 2, "startTimestamp": 1745240400, "tournament": {"name": "Cup"}, "homeScore": {}},
+    ]
+    table = event_table(iter(events))
+    assert table["event_id"].dtype == np.int64 and table["home_score"].dtype == np.float64
+    assert table["unique_tournament_id"].tolist() == [17, MISSING_ID]
+    assert table["home_team_id"].tolist() == [42, MISSING_ID]
+    assert table["winner_code"].tolist() == [1, 0]
+    assert table["home_score"][0] == 2 and np.isnan(table["home_score"][1])
+    assert table["country"].tolist() == ["England", None]
+    assert table["slug"].tolist() == ["arsenal-chelsea", None]
+
+    table = event_table(events, strings=("league",))
+    assert table["league"].tolist() == ["Premier League", "Cup"] and "slug" not in table
+
+
+@pytest.mark.parametrize("zone", ["Africa/Nairobi", "Europe/London", "America/Goose_Bay", "Africa/Monrovia", "UTC"])
+def test_local_days_match_local_date(zone):
+    # Odd steps over 1990 (with its off-the-quarter-hour changes in America/Goose_Bay), around Africa/Monrovia's
+    # change of 1972-01-07 and over 2025.
+    timestamps = np.concatenate((np.arange(631_152_000, 662_688_000, 1799),
+                                 np.arange(63_000_000, 64_000_000, 599),
+                                 np.arange(1_735_689_600, 1_767_225_600, 3599)))
+    days = local_days(timestamps, zone)
+    expected = [day_number(local_date(unix_timestamp, zone)) for unix_timestamp in timestamps.tolist()]
+    assert days.tolist() == expected
+
+
+def test_local_days_of_no_timestamps():
+    assert local_days([]).tolist() == []
+
+
+def test_columnar_selection_matches_the_scrapers():
+    body = synthetic_day(500, "2025-04-21", tracked=0.2)
+    games = scheduled_tournament_games(body, "2025-04-21")
+    assert games and games == select_scheduled_games(body, "2025-04-21")
+    assert len(games) < sum(event["tournament"]["uniqueTournament"]["id"] < 10_000
+                            for event in json.loads(body)["events"])
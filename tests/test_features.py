@@ -0,0 +1,99 @@
+import asyncio
+import csv
+
+import numpy as np
+
+from conftest import STUB_DATE, STUB_MATCHES
+from sofascore_api_client import run
+from sofascore_common import local_date
+from sofascore_features import FEATURE_COLUMNS, form_features, history_table, matchday_history, write_csv
+from sofascore_flow_archive import FlowArchive, FlowIndex
+
+
+def event(event_id, start_timestamp, home_id, away_id, home_score, away_score, tournament_id=17):
+    winner_code = 1 if home_score > away_score else 2 if away_score > home_score else 3
+    return {"id": event_id, "startTimestamp": start_timestamp,
+            "tournament": {"uniqueTournament": {"id": tournament_id}},
+            "homeTeam": {"id": home_id}, "awayTeam": {"id": away_id},
+            "homeScore": {"current": home_score}, "awayScore": {"current": away_score}, "winnerCode": winner_code}
+
+
+# Team 1 wins at home, draws away, loses at home, then wins a cup game away.
+PERFORMANCE = {
+    1: {"events": [event(10, 100, 1, 2, 2, 0), event(11, 200, 3, 1, 1, 1), event(12, 300, 1, 4, 0, 3),
+                   event(13, 400, 5, 1, 0, 1, tournament_id=8)]},
+    2: {"events": [event(10, 100, 1, 2, 2, 0), event(10, 100, 1, 2, 2, 0)]},
+}
+RANKS = {10: (3, 8), 11: (None, 5)}
+
+
+def test_history_table():
+    table = history_table(PERFORMANCE, RANKS)
+    assert table["team_id"].tolist() == [1, 1, 1, 1, 2]
+    assert table["event_id"].tolist() == [10, 11, 12, 13, 10]
+    assert table["is_home"].tolist() == [True, False, True, False, False]
+    np.testing.assert_array_equal(table["home_position"], [3, np.nan, np.nan, np.nan, 3])
+    np.testing.assert_array_equal(table["away_position"], [8, 5, np.nan, np.nan, 8])
+
+    assert history_table(PERFORMANCE, RANKS, tournament_id=8)["event_id"].tolist() == [13]
+
+
+def test_form_features():
+    features = form_features(history_table(PERFORMANCE, RANKS), window=2)
+    team_1 = features["team_id"] == 1
+    assert features["goals_for"][team_1].tolist() == [2, 1, 0, 1]
+    assert features["goals_against"][team_1].tolist() == [0, 1, 3, 0]
+    assert features["points"][team_1].tolist() == [3, 1, 0, 3]
+    assert (features["win"] + features["draw"] + features["loss"]).tolist() == [1] * 5
+    assert features["games_before"].tolist() == [0, 1, 2, 2, 0]
+    # The previous two games, not the game of the row.
+    assert features["form_points"].tolist() == [0, 3, 4, 1, 0]
+    assert features["form_goals_against"].tolist() == [0, 0, 1, 4, 0]
+
+    # Team 2 lost away to team 1, ranked 8th against 3rd.
+    team_2 = ~team_1
+    assert features["points"][team_2].tolist() == [0]
+    assert (features["team_rank"][team_2], features["opponent_rank"][team_2]) == (8, 3)
+    assert features["rank_diff"][team_2].tolist() == [-5]
+
+
+def test_form_features_of_an_empty_table():
+    features = form_features(history_table({}))
+    assert all(len(values) == 0 for values in features.values())
+
+
+def test_write_csv(tmp_path):
+    table = history_table(PERFORMANCE, RANKS)
+    # 20:59:59 and 21:00 UTC, either side of midnight in Nairobi.
+    table["start_timestamp"] = np.array([1745182799, 1745182800, 1745182800, 1745182800, 1745182799])
+    path = str(tmp_path / "features.csv")
+    write_csv(path, form_features(table))
+
+    with open(path, newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["date", *FEATURE_COLUMNS]
+    assert [(row[0], row[2]) for row in rows[1:]] == [("2025-04-20", "10"), ("2025-04-21", "11"), ("2025-04-21", "12"),
+                                                      ("2025-04-21", "13"), ("2025-04-20", "10")]
+    assert rows[1][0] == local_date(int(rows[1][3]))
+
+
+def test_matchday_history_of_an_archive(stub_server, tmp_path):
+    path = str(tmp_path / "flows.flows.gz")
+    with FlowArchive(path) as archive:
+        asyncio.run(run([STUB_DATE], stub_server, concurrency=4, archive=archive))
+
+    with FlowIndex.load([path]) as index:
+        performance_by_team, ranks = matchday_history(index, STUB_DATE)
+        assert matchday_history(index, "2025-04-22") == ({}, {})
+
+    assert sorted(performance_by_team) == [1000 + team for team in range(2 * STUB_MATCHES)]
+    # The recorded pregame-forms rank team n at n % 20 + 1.
+    for performance_json in performance_by_team.values():
+        for fixture in performance_json["events"]:
+            assert ranks[fixture["id"]] == (fixture["homeTeam"]["id"] - 1000 + 1,
+                                            fixture["awayTeam"]["id"] - 1000 + 1)
+
+    features = form_features(history_table(performance_by_team, ranks))
+    assert len(features["team_id"]) == sum(len(performance_json["events"])
+                                           for performance_json in performance_by_team.values())
+    assert not np.isnan(features["rank_diff"]).any()
@@ -0,0 +1,85 @@
+import sqlite3
+
+from sofascore_fixture_memo import FixtureMemo, historic_fixture
+from sofascore_records import HistoricFixture, TeamRef
+
+
+RECORD = HistoricFixture(12436870, home=TeamRef(42, "Arsenal"), away=TeamRef(38, "Chelsea"),
+                         home_score=2, away_score=1, winner_code=1)
+PREGAME_FORM = {"homeTeam": {"position": 2}, "awayTeam": {"position": 4}}
+
+
+def loader(*payloads):
+    """load_pregame_form returning `payloads` in turn, counting its calls."""
+    calls = []
+
+    def load_pregame_form(event_id):
+        calls.append(event_id)
+        return payloads[len(calls) - 1]
+    return load_pregame_form, calls
+
+
+def test_historic_fixture():
+    fixture = historic_fixture(RECORD, PREGAME_FORM)
+    assert (fixture.home_position, fixture.away_position) == (2, 4)
+    assert historic_fixture(RECORD, {"homeTeam": {}}).home_position is None
+    assert historic_fixture(RECORD, None).away_position is None
+
+
+def test_resolved_once():
+    memo = FixtureMemo(path=None)
+    load_pregame_form, calls = loader(PREGAME_FORM)
+    assert memo.resolve(RECORD, load_pregame_form) == memo.resolve(RECORD, load_pregame_form)
+    assert calls == [RECORD.event_id]
+    assert memo.stats() == {"fixtures": 1, "hits": 1, "misses": 1}
+
+
+def test_unranked_fixture_is_looked_up_again(tmp_path):
+    path = str(tmp_path / "fixtures.sqlite3")
+    memo = FixtureMemo(path)
+    load_pregame_form, calls = loader({"homeTeam": {"position": 2}}, PREGAME_FORM)
+
+    assert memo.resolve(RECORD, load_pregame_form).away_position is None
+    memo.put(RECORD.event_id, historic_fixture(RECORD, None))
+    assert memo.get(RECORD.event_id) is None
+
+    assert memo.resolve(RECORD, load_pregame_form).away_position == 4
+    assert len(calls) == 2
+    memo.close()
+
+    (rows,) = sqlite3.connect(path).execute("SELECT COUNT(*) FROM historic_fixtures").fetchone()
+    assert rows == 1
+
+
+def test_fixtures_persist(tmp_path):
+    path = str(tmp_path / "fixtures.sqlite3")
+    memo = FixtureMemo(path)
+    memo.resolve(RECORD, loader(PREGAME_FORM)[0])
+    memo.close()
+
+    memo = FixtureMemo(path)
+    fixture = memo.get(RECORD.event_id)
+    assert (fixture.home_position, fixture.away_position, fixture.home_score, fixture.winner_code) == (2, 4, 2, 1)
+    memo.close()
+
+
+def test_unranked_rows_of_older_stores_are_ignored(tmp_path):
+    path = str(tmp_path / "fixtures.sqlite3")
+    FixtureMemo(path).close()
+    connection = sqlite3.connect(path)
+    connection.execute("INSERT INTO historic_fixtures VALUES (1, NULL, 3, 0, 0, 3)")
+    connection.commit()
+    connection.close()
+
+    memo = FixtureMemo(path)
+    assert memo.get(1) is None
+    memo.close()
+
+
+def test_lookup_counts_the_hits_and_the_caller_its_misses():
+    memo = FixtureMemo(path=None)
+    assert memo.lookup(RECORD.event_id) is None
+    memo.record_miss()
+    memo.put(RECORD.event_id, historic_fixture(RECORD, PREGAME_FORM))
+    assert memo.lookup(RECORD.event_id).away_position == 4
+    assert memo.stats() == {"fixtures": 1, "hits": 1, "misses": 1}
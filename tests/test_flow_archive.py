@@ -0,0 +1,78 @@
+import asyncio
+import gzip
+
+from conftest import STUB_DATE
+from sofascore_api_client import run
+from sofascore_common import scheduled_events_api
+from sofascore_flow_archive import FlowArchive, FlowIndex, read_flows
+from sofascore_replay import replay
+
+
+BASE_URL = "https://api.sofascore.com"
+
+
+def test_flows_round_trip(tmp_path):
+    path = str(tmp_path / "flows.flows.gz")
+    bodies = [b'{"events": []}', b"not json\n\nat all", "Ünïcode".encode("utf-8"), b""]
+    with FlowArchive(path) as archive:
+        for number, body in enumerate(bodies):
+            archive.write(f"{BASE_URL}/api/v1/event/{number}", 200, {"content-type": "application/json"}, body)
+    # A second session appends its own gzip member.
+    with FlowArchive(path) as archive:
+        archive.write(f"{BASE_URL}/api/v1/event/9", 404, None, "missing")
+
+    flows = list(read_flows(path))
+    assert [flow.body for flow in flows] == bodies + [b"missing"]
+    assert [flow.status for flow in flows] == [200] * 4 + [404]
+    assert flows[0].headers == {"content-type": "application/json"}
+    assert flows[0].time <= flows[-1].time
+
+
+def test_truncated_archive_keeps_the_complete_flows(tmp_path):
+    path = str(tmp_path / "flows.flows.gz")
+    with FlowArchive(path) as archive:
+        archive.write(f"{BASE_URL}/api/v1/event/1", 200, {}, b"x" * 1000)
+        archive.write(f"{BASE_URL}/api/v1/event/2", 200, {}, b"y" * 1000)
+    with gzip.open(path, "rb") as archive_file:
+        data = archive_file.read()
+    with gzip.open(path, "wb") as archive_file:
+        archive_file.write(data[:-500])
+
+    assert [flow.url for flow in read_flows(path)] == [f"{BASE_URL}/api/v1/event/1"]
+
+
+def test_index_groups_the_flows_by_matchday(tmp_path):
+    path = str(tmp_path / "flows.flows.gz")
+    with FlowArchive(path) as archive:
+        archive.write(f"{BASE_URL}/api/v1/team/1/performance", 200, {}, b"before")
+        archive.write(BASE_URL + scheduled_events_api("2025-04-20"), 200, {}, b"{}")
+        archive.write(f"{BASE_URL}/api/v1/team/1/performance", 200, {}, b"first")
+        archive.write(BASE_URL + scheduled_events_api("2025-04-21"), 200, {}, b"{}")
+        archive.write(f"{BASE_URL}/api/v1/team/1/performance?x=1", 200, {}, b"second")
+        archive.write(f"{BASE_URL}/api/v1/team/2/performance", 429, {}, b"rate limited")
+
+    with FlowIndex.load([path]) as index:
+        assert index.dates() == ["2025-04-20", "2025-04-21"]
+        assert index.flows == 5
+        assert index.body("2025-04-20", "/api/v1/team/1/performance") == b"first"
+        assert index.body("2025-04-21", "/api/v1/team/1/performance") == b"second"
+        # Dates without their own recording get the latest one.
+        assert index.body("2025-04-22", "/api/v1/team/1/performance") == b"second"
+        assert index.body("2025-04-21", "/api/v1/team/2/performance") is None
+
+
+def test_replay_rebuilds_the_scraped_matchday(stub_server, tmp_path):
+    path = str(tmp_path / "flows.flows.gz")
+    scraped = {}
+    with FlowArchive(path) as archive:
+        asyncio.run(run([STUB_DATE], stub_server, concurrency=4, archive=archive,
+                        save=lambda todays_date, games: scraped.setdefault(todays_date, games)))
+
+    replayed = {}
+    with FlowIndex.load([path]) as index:
+        assert index.dates() == [STUB_DATE]
+        games_by_date = asyncio.run(replay(index, [STUB_DATE, "2025-04-22"],
+                                           save=lambda todays_date, games: replayed.setdefault(todays_date, games)))
+
+    assert replayed == scraped
+    assert list(games_by_date) == [STUB_DATE]
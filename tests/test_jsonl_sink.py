@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from sofascore_jsonl_sink import JsonlSink, raw_jsonl_line, read_index, read_record_at, read_records
+
+
+def test_records_round_trip(tmp_path):
+    path = str(tmp_path / "captured.jsonl")
+    with JsonlSink(path) as sink:
+        sink.write({"url": "https://x/api/v1/event/1", "data": {"id": 1, "name": "Ünïcode"}})
+        # Already serialized lines are written as they are.
+        sink.write(b'{"url":"https://x/api/v1/event/2","data":[1,2]}', url="https://x/api/v1/event/2")
+        sink.write({"url": "https://x/api/v1/event/1", "data": {"id": 1, "again": True}})
+    assert sink.records_written == 3
+
+    records = list(read_records(path))
+    assert [record["data"] for record in records] == [{"id": 1, "name": "Ünïcode"}, [1, 2],
+                                                      {"id": 1, "again": True}]
+
+    index = read_index(path + ".idx")
+    assert len(index["https://x/api/v1/event/1"]) == 2
+    offset, length = index["https://x/api/v1/event/2"][0]
+    assert read_record_at(path, offset, length)["data"] == [1, 2]
+    assert list(read_records(path, offset)) == records[1:]
+
+
+def test_sessions_append(tmp_path):
+    path = str(tmp_path / "captured.jsonl")
+    for number in range(2):
+        with JsonlSink(path) as sink:
+            sink.write({"url": f"u{number}", "data": number})
+
+    index = read_index(path + ".idx")
+    assert [read_record_at(path, *index[f"u{number}"][0])["data"] for number in range(2)] == [0, 1]
+
+
+def test_invalid_lines_are_skipped(tmp_path):
+    path = tmp_path / "captured.jsonl"
+    path.write_bytes(b'{"url": "a", "data": 1}\n{"url": "b", "da\n\n{"url": "c", "data": 3}\n')
+    assert [record["url"] for record in read_records(str(path))] == ["a", "c"]
+
+
+def test_unserializable_record_is_dropped(tmp_path):
+    path = str(tmp_path / "captured.jsonl")
+    with JsonlSink(path) as sink:
+        sink.write({"url": "a", "data": object()})
+        sink.write({"url": "b", "data": 2})
+    assert [record["url"] for record in read_records(path)] == ["b"]
+
+
+def test_closed_sink_drops_records(tmp_path):
+    path = str(tmp_path / "captured.jsonl")
+    sink = JsonlSink(path).start()
+    sink.close()
+    sink.write({"url": "late", "data": 1})
+    assert list(read_records(path)) == []
+
+
+def test_failed_writer_is_reported_to_the_producer(tmp_path):
+    # The data file can't be opened: the writer thread stops right away.
+    sink = JsonlSink(str(tmp_path), max_queue=1).start()
+    sink._thread.join()
+
+    with pytest.raises(RuntimeError) as raised:
+        for _ in range(3):
+            sink.write({"url": "a", "data": 1})
+    assert isinstance(raised.value.__cause__, OSError)
+    with pytest.raises(RuntimeError):
+        sink.close()
+
+
+URL = "https://api.sofascore.com/api/v1/event/1"
+
+
+def test_raw_body_is_spliced_into_one_line():
+    line = raw_jsonl_line(URL, "GET", 200, b'  {"event":\n {"id": 1}}\r\n')
+    assert line.count(b"\n") == 1 and line.endswith(b"\n")
+    assert json.loads(line) == {"url": URL, "method": "GET", "status_code": 200, "data": {"event": {"id": 1}}}
+    assert json.loads(raw_jsonl_line(URL, "GET", 200, b"[1, 2]"))["data"] == [1, 2]
+
+
+@pytest.mark.parametrize("content", [b"", b"<html>Too Many Requests</html>", b"{not json}", b'{"a": [}',
+                                     b'{"a": 1}{"b": 2}', b'{"a": "\xff"}'])
+def test_non_json_body_is_stored_as_a_string(content):
+    record = json.loads(raw_jsonl_line(URL, "GET", 429, content))
+    assert record["data"] == content.decode("utf-8", errors="replace")
+
+
+def test_caller_validated_body_is_not_checked_again():
+    assert json.loads(raw_jsonl_line(URL, "GET", 200, b"[1]", valid=True))["data"] == [1]
+    assert json.loads(raw_jsonl_line(URL, "GET", 200, b"[1]", valid=False))["data"] == "[1]"
@@ -0,0 +1,101 @@
+import pickle
+
+import pytest
+
+from sofascore_records import HistoricFixture, Match, TeamRef, performance_fixtures
+
+
+EVENT = {
+    "id": 12436870,
+    "customId": "Lsab",
+    "slug": "arsenal-chelsea",
+    "startTimestamp": 1745164800,
+    "tournament": {"name": "Premier League", "uniqueTournament": {"id": 17}},
+    "season": {"id": 61627},
+    "roundInfo": {"round": 33},
+    "homeTeam": {"id": 42, "name": "Arsenal", "slug": "arsenal"},
+    "awayTeam": {"id": 38, "name": "Chelsea", "slug": "chelsea"},
+    "homeScore": {"current": 2},
+    "awayScore": {"current": 1},
+    "winnerCode": 1,
+    "status": {"type": "finished"},
+}
+
+HISTORY = [
+    {"A/H": "Home", "Result": "Win", "Scored": 2, "Conceded": 1, "Team Ranking": 2, "Opponent Rank": 4,
+     "Event ID": 12436870, "Date": "2025-04-20", "Opponent": "Chelsea", "Opponent ID": 38},
+    # Saved before the records carried their fixture.
+    {"A/H": "Home", "Result": "Draw", "Scored": 0, "Conceded": 0, "Team Ranking": 2, "Opponent Rank": 9},
+]
+
+TOURNAMENT_GAME = {
+    "League": "Premier League",
+    "Tournament ID": 17,
+    "Custom ID": "Lsab",
+    "Home Team": "Arsenal",
+    "Away Team": "Chelsea",
+    "ID": 12436870,
+    "MatchUp": "arsenal-chelsea",
+    "Date": "2025-04-20",
+    "Home Team ID": 42,
+    "Away Team ID": 38,
+    "Home Team Rank": 2,
+    "Away Team Rank": 4,
+    "Home Team History": HISTORY,
+    "Away Team History": [],
+}
+
+
+def test_fixture_from_event():
+    fixture = HistoricFixture.from_event(EVENT)
+    assert (fixture.event_id, fixture.league, fixture.unique_tournament_id, fixture.season_id, fixture.round) == \
+        (12436870, "Premier League", 17, 61627, 33)
+    assert fixture.home == TeamRef(42, "Arsenal", "arsenal")
+    assert (fixture.home_score, fixture.away_score, fixture.winner_code) == (2, 1, 1)
+    assert fixture.home_position is None
+    assert performance_fixtures({"events": [EVENT]}) == [fixture]
+
+
+def test_fixture_with_positions_is_a_copy():
+    fixture = HistoricFixture.from_event(EVENT)
+    ranked = fixture.with_positions(2, 4)
+    assert (ranked.home_position, ranked.away_position) == (2, 4)
+    assert fixture.home_position is None
+    assert ranked != fixture
+
+
+@pytest.mark.parametrize("record", [
+    TeamRef(42, "Arsenal", "arsenal"),
+    HistoricFixture.from_event(EVENT).with_positions(2, 4),
+    HistoricFixture(12436870, home_score=2, away_score=1, winner_code=1),
+    Match.from_record(TOURNAMENT_GAME),
+])
+def test_tuple_and_pickle_round_trips(record):
+    assert type(record).from_tuple(record.to_tuple()) == record
+    copy = pickle.loads(pickle.dumps(record))
+    assert copy == record
+    assert hash(copy) == hash(record)
+    assert len({record, copy}) == 1
+
+
+def test_match_round_trips_the_output_dict():
+    match = Match.from_record(TOURNAMENT_GAME)
+    assert match.to_record() == TOURNAMENT_GAME
+    assert list(match.to_record()) == list(TOURNAMENT_GAME)
+    assert match.is_complete()
+
+
+def test_match_round_trips_output_saved_before_the_tournament_ids():
+    old = {key: value for key, value in TOURNAMENT_GAME.items()
+           if key not in ("Tournament ID", "Home Team Rank", "Away Team History")}
+    match = Match.from_record(old)
+    assert match.to_record() == old
+    assert not match.is_complete()
+
+
+def test_match_keeps_unknown_history_keys():
+    game = dict(TOURNAMENT_GAME, **{"Away Team History": [{"Result": "Win", "Note": "Walkover"}]})
+    match = Match.from_record(game)
+    assert match.to_record() == game
+    assert pickle.loads(pickle.dumps(match)) == match
+    assert hash(match) == hash(Match.from_record(game))
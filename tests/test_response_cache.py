@@ -0,0 +1,139 @@
+import json
+
+import pytest
+
+import sofascore_response_cache
+from sofascore_common import finished_event_ids
+from sofascore_response_cache import (
+    ResponseCache,
+    SCHEDULED_EVENTS_TTL,
+    TEAM_PERFORMANCE_TTL,
+    UNFINISHED_EVENT_TTL,
+)
+
+
+class Clock:
+    """Stands in for the `time` module of the cache."""
+
+    def __init__(self, now=1_745_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(sofascore_response_cache, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    yield cache
+    cache.close()
+
+
+def body(data):
+    return json.dumps(data).encode("utf-8")
+
+
+FINISHED = {"id": 1, "status": {"type": "finished"}}
+NOT_STARTED = {"id": 2, "status": {"type": "notstarted"}}
+
+
+def test_finished_event_ids():
+    assert finished_event_ids({"events": [FINISHED, NOT_STARTED]}) == [1]
+    assert finished_event_ids({"event": FINISHED}) == [1]
+    assert finished_event_ids({"event": NOT_STARTED}) == []
+    assert finished_event_ids([FINISHED]) == []
+
+
+@pytest.mark.parametrize("api_path, ttl", [
+    ("/api/v1/sport/football/scheduled-events/2025-04-21", SCHEDULED_EVENTS_TTL),
+    ("/api/v1/team/42/performance", TEAM_PERFORMANCE_TTL),
+    ("/api/v1/event/2/pregame-form", UNFINISHED_EVENT_TTL),
+])
+def test_changing_responses_expire(cache, clock, api_path, ttl):
+    cache.put(api_path, body({"events": [NOT_STARTED]}))
+    clock.now += ttl - 1
+    assert cache.get(api_path) is not None
+    clock.now += 2
+    assert cache.get(api_path) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_pregame_form_of_a_finished_event_never_expires(cache, clock):
+    # The team history tells that event 1 is over.
+    cache.put("/api/v1/team/42/performance", body({"events": [FINISHED, NOT_STARTED]}))
+    cache.put("/api/v1/event/1/pregame-form", body({"homeTeam": {"position": 3}}))
+    cache.put("/api/v1/event/2/pregame-form", body({"homeTeam": {"position": 4}}))
+    assert cache.is_finished(1) and not cache.is_finished(2)
+
+    clock.now += 365 * 24 * 3600
+    assert json.loads(cache.get("/api/v1/event/1/pregame-form")) == {"homeTeam": {"position": 3}}
+    assert cache.get("/api/v1/event/2/pregame-form") is None
+
+
+def test_event_payload_marks_itself_finished(cache, clock):
+    cache.put("/api/v1/event/1", body({"event": FINISHED}))
+    clock.now += 365 * 24 * 3600
+    assert cache.get_json("/api/v1/event/1") == {"event": FINISHED}
+
+
+def test_scheduled_events_are_streamed_for_finished_events(cache):
+    cache.put("/api/v1/sport/football/scheduled-events/2025-04-21",
+              json.dumps({"events": [NOT_STARTED, FINISHED]}, indent=2))
+    assert cache.is_finished(1)
+
+
+def test_given_finished_ids_skip_the_decoding(cache):
+    cache.put("/api/v1/team/42/performance", b"not decoded", finished=[7])
+    assert cache.get("/api/v1/team/42/performance") == b"not decoded"
+    assert cache.is_finished(7)
+
+
+def test_invalid_json_is_not_cached(cache):
+    cache.put("/api/v1/team/42/performance", b"<html>rate limited</html>")
+    assert cache.get("/api/v1/team/42/performance") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_responses_are_evicted(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), max_bytes=250)
+    payload = body({"events": [], "padding": "x" * 71})  # 100 bytes
+    assert len(payload) == 100
+
+    for team_id in (1, 2):
+        clock.now += 1
+        cache.put(f"/api/v1/team/{team_id}/performance", payload)
+    clock.now += 1
+    assert cache.get("/api/v1/team/1/performance") is not None
+
+    clock.now += 1
+    cache.put("/api/v1/team/3/performance", payload)
+    assert cache.get("/api/v1/team/2/performance") is None
+    assert cache.get("/api/v1/team/1/performance") is not None
+    assert cache.get("/api/v1/team/3/performance") is not None
+    assert cache.stats()["bytes"] == 200
+
+    # Replacing a response counts its new size only.
+    clock.now += 1
+    cache.put("/api/v1/team/3/performance", payload)
+    assert cache.stats() == {"entries": 2, "bytes": 200, "hits": 3, "misses": 1}
+    cache.close()
+
+
+def test_responses_persist(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResponseCache(path)
+    cache.put("/api/v1/event/1", body({"event": FINISHED}))
+    assert cache.get("/api/v1/event/1") is not None
+    cache.close()
+
+    cache = ResponseCache(path)
+    assert cache.get_json("/api/v1/event/1") == {"event": FINISHED}
+    assert cache.stats()["bytes"] == len(body({"event": FINISHED}))
+    cache.close()
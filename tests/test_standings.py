@@ -0,0 +1,108 @@
+from sofascore_records import HistoricFixture, TeamRef
+from sofascore_standings import StandingsResolver, season_key, standings_table
+
+
+SEASON = (17, 61627)
+HOME, AWAY, OTHER = 1000, 1001, 1002
+
+
+def standings_json(rounds_played, positions):
+    """A standings payload of teams at `positions` ({team ID: position}) after `rounds_played` rounds."""
+    rows = [{"team": {"id": team_id}, "position": position, "matches": rounds_played}
+            for team_id, position in positions.items()]
+    return {"standings": [{"rows": rows}]}
+
+
+def fixture(round, season=SEASON):
+    return HistoricFixture(10_000 + round, unique_tournament_id=season[0], season_id=season[1], round=round,
+                           home=TeamRef(HOME, "Home"), away=TeamRef(AWAY, "Away"))
+
+
+def resolver(tolerance=0, path=None):
+    standings = StandingsResolver(path=path, tolerance=tolerance)
+    # The table really changes from one round to the next.
+    standings.add_standings(SEASON, standings_json(5, {HOME: 1, AWAY: 2, OTHER: 3}))
+    standings.add_standings(SEASON, standings_json(6, {HOME: 3, AWAY: 1, OTHER: 2}))
+    standings.add_standings(SEASON, standings_json(10, {HOME: 2, AWAY: 3, OTHER: 1}))
+    return standings
+
+
+def test_standings_table_merges_groups():
+    payload = {"standings": [standings_json(4, {HOME: 1})["standings"][0],
+                             standings_json(5, {AWAY: 1})["standings"][0]]}
+    assert standings_table(payload) == (5, {HOME: 1, AWAY: 1})
+
+
+def test_season_key():
+    assert season_key(fixture(3)) == SEASON
+    assert season_key(HistoricFixture(1, unique_tournament_id=17)) is None
+
+
+def test_fixture_ranked_from_the_round_before_it():
+    standings = resolver()
+    assert standings.positions(fixture(6)) == (1, 2)
+    assert standings.positions(fixture(7)) == (3, 1)
+    assert standings.positions(fixture(11)) == (2, 3)
+
+
+def test_no_snapshot_of_the_round_before():
+    standings = resolver()
+    assert standings.positions(fixture(9)) is None
+    assert standings.positions(fixture(2)) is None
+    assert standings.stats()["misses"] == 2
+
+
+def test_tolerance_takes_the_closest_snapshot():
+    standings = resolver(tolerance=2)
+    # Round 8 follows round 7: round 6 is one round off, round 10 three.
+    assert standings.positions(fixture(8)) == (3, 1)
+    # Round 9 follows round 8: rounds 6 and 10 are both two off, the earlier one wins.
+    assert standings.positions(fixture(9)) == (3, 1)
+    assert standings.positions(fixture(14)) is None
+
+
+def test_unranked_fixtures():
+    standings = resolver()
+    no_round = fixture(6)
+    no_round.round = None
+    assert standings.positions(no_round) is None
+    assert standings.positions(fixture(6, season=(17, 1))) is None
+
+    unknown_team = fixture(6)
+    unknown_team.away = TeamRef(9999)
+    assert standings.positions(unknown_team) is None
+
+
+def test_failed_fetch_is_remembered():
+    standings = StandingsResolver(path=None)
+    assert not standings.fetched(SEASON)
+    standings.add_standings(SEASON, None)
+    assert standings.fetched(SEASON)
+    assert standings.positions(fixture(6)) is None
+
+
+def test_snapshots_persist(tmp_path):
+    path = str(tmp_path / "standings.sqlite3")
+    resolver(path=path).close()
+
+    standings = StandingsResolver(path=path)
+    assert standings.stats()["snapshots"] == 3
+    assert standings.positions(fixture(7)) == (3, 1)
+    # Persisted snapshots don't count as fetched in this run.
+    assert not standings.fetched(SEASON)
+    standings.close()
+
+
+def test_load_seasons_fetches_each_season_once():
+    requested = []
+
+    def fetch_standings(api_paths):
+        requested.extend(api_paths)
+        return {api_path: standings_json(5, {HOME: 4, AWAY: 7}) for api_path in api_paths}
+
+    standings = StandingsResolver(path=None)
+    standings.load_seasons([fixture(6), fixture(7), HistoricFixture(1)], fetch_standings)
+    standings.load_seasons([fixture(8)], fetch_standings)
+
+    assert requested == ["/api/v1/unique-tournament/17/season/61627/standings/total"]
+    assert standings.positions(fixture(6)) == (4, 7)
@@ -0,0 +1,80 @@
+import sqlite3
+
+from sofascore_store import MatchStore
+
+
+def record(event_id, date, venue, opponent_id, team_ranking=3):
+    return {"A/H": venue, "Result": "W", "Scored": 2, "Conceded": 1, "Team Ranking": team_ranking,
+            "Opponent Rank": 7, "Event ID": event_id, "Date": date, "Opponent": f"Team {opponent_id}",
+            "Opponent ID": opponent_id}
+
+
+def match(event_id, tournament_id=17, league="Premier League"):
+    return {"League": league, "Tournament ID": tournament_id, "Custom ID": "abc", "Home Team": "Team 1",
+            "Away Team": "Team 2", "ID": event_id, "MatchUp": "team-1-team-2", "Date": "2025-04-21",
+            "Home Team ID": 1, "Away Team ID": 2, "Home Team Rank": 4, "Away Team Rank": 9,
+            "Home Team History": [record(101, "2025-04-12", "Home", 3), record(102, "2025-04-05", "Away", 4),
+                                  record(103, "2025-03-29", "Home", 5)],
+            "Away Team History": [record(201, "2025-04-13", "Away", 6)]}
+
+
+def test_saved_matches_and_last_games(tmp_path):
+    store = MatchStore(str(tmp_path / "matches.sqlite3"))
+    store.save_date("2025-04-21", [match(1)])
+    # Saving again updates the rows instead of adding more.
+    store.save_date("2025-04-21", [match(1), match(2, tournament_id=8, league="LaLiga")])
+    assert store.stats() == {"teams": 6, "matches": 2, "team_games": 4, "match_history": 8}
+
+    assert [row["event_id"] for row in store.matches("2025-04-21")] == [1, 2]
+    assert [row["event_id"] for row in store.matches(tournament_id=8)] == [2]
+    assert store.matches("2025-04-22") == []
+
+    assert [game["event_id"] for game in store.last_games(1)] == [101, 102, 103]
+    assert [game["event_id"] for game in store.last_games(1, venue="Home", limit=1)] == [101]
+    assert [game["event_id"] for game in store.last_games(1, before="2025-04-12")] == [102, 103]
+    assert store.last_games(1, tournament_id=35) == []
+    assert store.last_games(2)[0]["opponent"] == "Team 6"
+    store.close()
+
+
+def test_last_games_use_the_form_index(tmp_path):
+    store = MatchStore(str(tmp_path / "matches.sqlite3"))
+    store.close()
+    connection = sqlite3.connect(str(tmp_path / "matches.sqlite3"))
+    plan = connection.execute("EXPLAIN QUERY PLAN SELECT * FROM team_games WHERE team_id = 1 "
+                              "AND tournament_id = 17 AND venue = 'Home' ORDER BY date DESC LIMIT 4").fetchall()
+    assert "team_games_tournament_form" in str(plan)
+    connection.close()
+
+
+def test_older_stores_get_the_tournament_ids(tmp_path):
+    path = str(tmp_path / "matches.sqlite3")
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        CREATE TABLE matches (event_id INTEGER PRIMARY KEY, date TEXT NOT NULL, league TEXT NOT NULL,
+                              custom_id TEXT, matchup TEXT, home_team_id INTEGER, away_team_id INTEGER,
+                              home_team TEXT, away_team TEXT, home_rank INTEGER, away_rank INTEGER,
+                              saved_at REAL NOT NULL);
+        CREATE TABLE team_games (team_id INTEGER NOT NULL, event_id INTEGER NOT NULL, date TEXT,
+                                 league TEXT NOT NULL, venue TEXT NOT NULL, opponent_id INTEGER, opponent TEXT,
+                                 result TEXT, scored INTEGER, conceded INTEGER, team_rank INTEGER,
+                                 opponent_rank INTEGER, PRIMARY KEY (team_id, event_id));
+        CREATE INDEX matches_league_date ON matches (league, date);
+        CREATE INDEX team_games_league_date ON team_games (league, date);
+        INSERT INTO matches VALUES (9, '2025-04-20', 'Premier League', NULL, NULL, 1, 2, 'Team 1', 'Team 2',
+                                    NULL, NULL, 0);
+    """)
+    connection.commit()
+    connection.close()
+
+    store = MatchStore(path)
+    store.save_date("2025-04-21", [match(1)])
+    assert [(row["event_id"], row["tournament_id"]) for row in store.matches()] == [(9, None), (1, 17)]
+    assert [game["event_id"] for game in store.last_games(1, tournament_id=17)] == [101, 102, 103]
+    store.close()
+
+    connection = sqlite3.connect(path)
+    indexes = {name for (name,) in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert "matches_league_date" not in indexes and "team_games_league_date" not in indexes
+    assert {"matches_tournament_date", "team_games_tournament_form"} <= indexes
+    connection.close()
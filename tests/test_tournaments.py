@@ -0,0 +1,52 @@
+import json
+
+import sofascore_tournaments
+from sofascore_tournaments import TournamentSelector, configure_tournaments, tournament_selector, unique_tournament_id
+
+
+TOURNAMENTS = [
+    {"country": "England", "league": "Championship", "unique_tournament_id": 18},
+    {"country": "Spain", "league": "LaLiga", "unique_tournament_id": "8"},
+]
+
+
+def tournament(name, country, unique_tournament_id=None):
+    tournament = {"name": name, "category": {"name": country, "country": {"name": country}}}
+    if unique_tournament_id is not None:
+        tournament["uniqueTournament"] = {"id": unique_tournament_id}
+    return tournament
+
+
+def test_selects_by_unique_tournament_id():
+    selector = TournamentSelector(TOURNAMENTS)
+    assert selector.ids == {18, 8}
+    assert selector.leagues == {18: "Championship", 8: "LaLiga"}
+    assert selector.selects(tournament("Championship", "England", 18))
+    assert selector.selects(tournament("LaLiga EA Sports", "Spain", 8))
+    # Same name, another country's league.
+    assert not selector.selects(tournament("Championship", "Scotland", 206))
+
+
+def test_falls_back_to_the_country_and_league():
+    selector = TournamentSelector(TOURNAMENTS)
+    assert selector.selects(tournament("Championship", "England"))
+    assert not selector.selects(tournament("Championship", "Scotland"))
+    assert not selector.selects({"name": "Championship"})
+
+
+def test_unique_tournament_id():
+    assert unique_tournament_id(tournament("LaLiga", "Spain", 8)) == 8
+    assert unique_tournament_id({"name": "LaLiga", "uniqueTournament": None}) is None
+
+
+def test_default_and_configured_tournaments(tmp_path, monkeypatch):
+    monkeypatch.setattr(sofascore_tournaments, "_selector", None)
+    selector = tournament_selector()
+    assert {17, 8} <= selector.ids
+    assert selector.leagues[17] == "Premier League"
+    assert tournament_selector() is selector
+
+    path = tmp_path / "tournaments.json"
+    path.write_text(json.dumps({"tournaments": TOURNAMENTS}), encoding="utf-8")
+    configure_tournaments(str(path))
+    assert tournament_selector().ids == {18, 8}